@@ -1,6 +1,6 @@
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -10,6 +10,10 @@ class Settings(BaseSettings):
     # CORS
     cors_allow_origins: List[str] = Field(default_factory=lambda: ["*"])
 
+    # Startup: "eager" warms Whisper and client libraries in the background
+    # at boot, "lazy" defers them to first use or POST /api/warmup
+    startup_mode: Literal["eager", "lazy"] = Field(default="eager", alias="STARTUP_MODE")
+
     # Whisper
     whisper_model: str = Field(default="distil-small.en", alias="WHISPER_MODEL")
     whisper_device: str = Field(default="auto", alias="WHISPER_DEVICE")
@@ -18,6 +22,40 @@ class Settings(BaseSettings):
     whisper_chunk_length: int = Field(default=30, alias="WHISPER_CHUNK_LENGTH")  # seconds
     whisper_beam_size: int = Field(default=1, alias="WHISPER_BEAM_SIZE")
     whisper_language: Optional[str] = Field(default=None, alias="WHISPER_LANGUAGE")
+    # Decoding profiles (draft / balanced / final); models default to the active one
+    whisper_default_profile: str = Field(default="balanced", alias="WHISPER_DEFAULT_PROFILE")
+    whisper_draft_model: Optional[str] = Field(default=None, alias="WHISPER_DRAFT_MODEL")
+    whisper_final_model: Optional[str] = Field(default=None, alias="WHISPER_FINAL_MODEL")
+    whisper_language_probe_seconds: float = Field(default=30.0, alias="WHISPER_LANGUAGE_PROBE_SECONDS")
+    # Micro-batching of concurrent short clips (0 seconds disables)
+    whisper_clip_max_seconds: float = Field(default=45.0, alias="WHISPER_CLIP_MAX_SECONDS")
+    whisper_clip_batch_window_ms: float = Field(default=50.0, alias="WHISPER_CLIP_BATCH_WINDOW_MS")
+    whisper_clip_batch_max: int = Field(default=8, alias="WHISPER_CLIP_BATCH_MAX")
+    # Pinned models (python -m backend.app.services.model_registry pin <name>)
+    whisper_models_dir: str = Field(default="models/whisper", alias="WHISPER_MODELS_DIR")
+    whisper_allow_download: bool = Field(default=True, alias="WHISPER_ALLOW_DOWNLOAD")
+    whisper_verify_on_load: bool = Field(default=False, alias="WHISPER_VERIFY_ON_LOAD")
+    whisper_max_loaded: int = Field(default=1, alias="WHISPER_MAX_LOADED")
+    # Shared model process (set by gunicorn.conf.py; unset = load Whisper in-process)
+    model_server_address: Optional[str] = Field(default=None, alias="MODEL_SERVER_ADDRESS")
+    model_server_authkey: Optional[str] = Field(default=None, alias="MODEL_SERVER_AUTHKEY")
+    model_server_concurrency: int = Field(default=1, alias="MODEL_SERVER_CONCURRENCY")  # also Whisper num_workers
+
+    # Document extraction
+    doc_extract_workers: int = Field(default=0, alias="DOC_EXTRACT_WORKERS")  # 0 = min(4, cpus)
+    doc_max_pages: int = Field(default=500, alias="DOC_MAX_PAGES")
+    doc_extract_timeout: float = Field(default=120.0, alias="DOC_EXTRACT_TIMEOUT")  # seconds per document
+    doc_pages_per_task: int = Field(default=16, alias="DOC_PAGES_PER_TASK")
+    text_detect_sample_bytes: int = Field(default=64 * 1024, alias="TEXT_DETECT_SAMPLE_BYTES")
+    text_read_chunk_bytes: int = Field(default=1024 * 1024, alias="TEXT_READ_CHUNK_BYTES")
+    extraction_cache_enabled: bool = Field(default=True, alias="EXTRACTION_CACHE_ENABLED")
+    extraction_cache_dir: str = Field(default="data/cache/extraction", alias="EXTRACTION_CACHE_DIR")
+    extraction_cache_max_mb: int = Field(default=256, alias="EXTRACTION_CACHE_MAX_MB")
+
+    # Uploads
+    upload_max_document_mb: int = Field(default=50, alias="UPLOAD_MAX_DOCUMENT_MB")
+    upload_max_media_mb: int = Field(default=2048, alias="UPLOAD_MAX_MEDIA_MB")
+    upload_sniff_magic: bool = Field(default=True, alias="UPLOAD_SNIFF_MAGIC")
 
     # Google / Gemini API keys
     google_api_key: Optional[str] = Field(default=None, alias="GOOGLE_API_KEY")
@@ -21,5 +21,8 @@ class TranscriptResponse(BaseModel):
     segments: List[TranscriptSegment]
     language: Optional[str] = None
     duration: Optional[float] = None
+    profile: Optional[str] = None
 
 
+class ModelSwitchRequest(BaseModel):
+    name: str
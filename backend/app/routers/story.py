@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from backend.app.models import StoryRequest
 from backend.app.services.llm import generate_story_with_gemini, generate_chat_response
+from backend.utils.executors import NETWORK, run_blocking
 
 
 router = APIRouter(tags=["story"])
@@ -9,7 +10,9 @@ router = APIRouter(tags=["story"])
 @router.post("/story/generate")
 async def generate_story(req: StoryRequest):
     try:
-        story = generate_story_with_gemini(
+        story = await run_blocking(
+            NETWORK,
+            generate_story_with_gemini,
             transcript=req.text,
             story_format=req.format,
             use_custom_prompt=req.useCustomPrompt,
@@ -38,7 +41,7 @@ async def chat(payload: dict):
     if not message:
         return {"reply": "Please provide a message."}
     hint = str(payload.get("hint", "")).strip() or None
-    reply = generate_chat_response(message, hint)
+    reply = await run_blocking(NETWORK, generate_chat_response, message, hint)
     return {"reply": reply}
 
 
@@ -1,24 +1,52 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import StreamingResponse
 
-from backend.app.models import TranscriptResponse, TranscriptSegment
+from backend.app.models import ModelSwitchRequest, TranscriptResponse, TranscriptSegment
 from backend.app.services.transcription import (
-    save_upload_to_temp,
     detect_mime_type,
     is_document_file,
     extract_document_text,
+    iter_document_text,
+    media_transcript,
+    submit_clip,
     transcribe_media,
+    switch_whisper_model,
+    warm_transcriber,
+    whisper_models,
 )
-from backend.app.services.whisper import get_whisper_model
+from backend.app.services.extraction_cache import extraction_cache
+from backend.app.services.upload_ingest import DOCUMENT, MEDIA, SpooledUpload, spool_upload
+from backend.app.services.transcription_profiles import get_profile
+from backend.app.services.subtitles import is_subtitle_file, iter_subtitle_segments
+from backend.utils.executors import CPU, DISK, run_blocking
 
+from typing import Optional, Tuple
+import asyncio
+import json
 import os
 
 
 router = APIRouter(tags=["transcript"])
+
+
+def _spool_transcript_upload(file: UploadFile) -> Tuple[SpooledUpload, str, str, bool]:
+    """Spool the upload once and decide between the document and media paths.
+
+    Returns (spooled, mime, name_lower, is_document). Magic bytes that map to
+    a supported extractor override what the filename and content type suggest.
+    """
+    name_lower = (file.filename or "").lower()
+    mime = file.content_type or detect_mime_type(name_lower, file.filename)
+    guess = DOCUMENT if is_document_file(name_lower, mime) else MEDIA
+    spooled = spool_upload(file, kind=guess)
+    return spooled, spooled.mime or mime, name_lower, spooled.kind == DOCUMENT
+
+
 @router.get("/health")
 async def transcript_health():
     """Verify Whisper is available and can be initialized."""
     try:
-        _ = get_whisper_model()
+        await run_blocking(CPU, warm_transcriber)
         return {"ok": True, "message": "Whisper model initialized"}
     except HTTPException as e:
         return {"ok": False, "message": e.detail}
@@ -26,50 +54,137 @@ async def transcript_health():
         return {"ok": False, "message": str(e)}
 
 
+@router.get("/models")
+async def transcript_models():
+    """Active, loaded and pinned Whisper models."""
+    return await run_blocking(DISK, whisper_models)
+
+
+@router.post("/models/active")
+async def transcript_switch_model(req: ModelSwitchRequest):
+    """Switch the Whisper model used for new transcriptions (loads it first)."""
+    return await run_blocking(CPU, switch_whisper_model, req.name)
+
+
+@router.get("/cache/stats")
+async def transcript_cache_stats():
+    """Hit/miss counters and size of the document extraction cache."""
+    return await run_blocking(DISK, extraction_cache.stats)
+
+
+def _discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except Exception:
+        pass
+
+
+def _transcribe_spooled(spooled: SpooledUpload, mime: str, name_lower: str, is_document: bool,
+                        profile: str) -> TranscriptResponse:
+    """Blocking part of /upload: subtitle parsing, document extraction or Whisper."""
+    temp_path = spooled.path
+    if is_document and is_subtitle_file(name_lower, mime):
+        segments = list(iter_subtitle_segments(temp_path))
+        if segments:
+            return TranscriptResponse(
+                kind="document",
+                transcript=" ".join(seg.text for seg in segments),
+                segments=segments,
+                duration=segments[-1].end,
+            )
+        # No timed cues: treat as plain text below
+
+    if is_document:
+        text = extract_document_text(temp_path, name_lower, mime, digest=spooled.sha256)
+        if not text.strip():
+            raise HTTPException(status_code=422, detail="No extractable text found in the document")
+        paragraphs = [p.strip() for p in text.splitlines() if p.strip()]
+        segments = [TranscriptSegment(text=p) for p in paragraphs]
+        return TranscriptResponse(kind="document", transcript=text.strip(), segments=segments)
+
+    try:
+        result = transcribe_media(temp_path, profile)
+    except Exception as e:
+        raise _media_error(e)
+    return _media_response(result, profile)
+
+
+def _media_error(e: Exception) -> HTTPException:
+    if isinstance(e, HTTPException):
+        # Provide actionable guidance for common setup issues
+        hint = (
+            "Ensure faster-whisper is installed and ffmpeg is available on PATH. "
+            "On Windows, install ffmpeg and restart the server."
+        )
+        return HTTPException(status_code=e.status_code, detail=f"{e.detail}. {hint}")
+    return HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}. Ensure ffmpeg is installed and restart the server.")
+
+
+def _media_response(result, profile: str) -> TranscriptResponse:
+    transcript_text, segments, language, duration = result
+    if not transcript_text:
+        raise HTTPException(status_code=422, detail="Transcription produced no text")
+    return TranscriptResponse(
+        kind="media",
+        transcript=transcript_text,
+        segments=segments,
+        language=language,
+        duration=duration,
+        profile=profile,
+    )
+
 
 @router.post("/upload", response_model=TranscriptResponse)
-async def transcript_file(file: UploadFile = File(...)):
+async def transcript_file(file: UploadFile = File(...), profile: Optional[str] = Form(default=None)):
+    """Transcribe media (``profile``: draft, balanced or final) or extract document text."""
     if not file.filename:
         raise HTTPException(status_code=400, detail="Filename is required")
+    profile_name = get_profile(profile).name
 
-    temp_path = save_upload_to_temp(file)
+    spooled, mime, name_lower, is_document = await run_blocking(DISK, _spool_transcript_upload, file)
     try:
-        mime = file.content_type or detect_mime_type(temp_path, file.filename)
-        name_lower = (file.filename or "").lower()
+        if not is_document:
+            # Short clips are decoded on the CPU pool, then wait for their batch
+            # here on the loop rather than holding a CPU thread
+            try:
+                pending = await run_blocking(CPU, submit_clip, spooled.path, profile_name)
+                raw = await asyncio.wrap_future(pending) if pending is not None else None
+            except Exception as e:
+                raise _media_error(e)
+            if raw is not None:
+                return _media_response(media_transcript(*raw), profile_name)
+        return await run_blocking(CPU, _transcribe_spooled, spooled, mime, name_lower, is_document, profile_name)
+    finally:
+        await run_blocking(DISK, _discard, spooled.path)
 
-        if is_document_file(name_lower, mime):
-            text = extract_document_text(temp_path, name_lower, mime)
-            if not text.strip():
-                raise HTTPException(status_code=422, detail="No extractable text found in the document")
-            paragraphs = [p.strip() for p in text.splitlines() if p.strip()]
-            segments = [TranscriptSegment(text=p) for p in paragraphs]
-            return TranscriptResponse(kind="document", transcript=text.strip(), segments=segments)
 
+@router.post("/upload/stream")
+async def transcript_file_stream(file: UploadFile = File(...)):
+    """Stream document text as NDJSON, one line per page as soon as it is extracted."""
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="Filename is required")
+
+    spooled, mime, name_lower, is_document = await run_blocking(DISK, _spool_transcript_upload, file)
+    temp_path = spooled.path
+    if not is_document:
+        await run_blocking(DISK, _discard, temp_path)
+        raise HTTPException(status_code=415, detail="Streaming is only available for documents")
+
+    def _events():
+        pages = 0
         try:
-            transcript_text, segments, language, duration = transcribe_media(temp_path)
+            for idx, text in iter_document_text(temp_path, name_lower, mime):
+                pages += 1
+                yield json.dumps({"page": idx + 1, "text": text}, ensure_ascii=False) + "\n"
+            yield json.dumps({"done": True, "pages": pages}) + "\n"
         except HTTPException as e:
-            # Provide actionable guidance for common setup issues
-            hint = (
-                "Ensure faster-whisper is installed and ffmpeg is available on PATH. "
-                "On Windows, install ffmpeg and restart the server."
-            )
-            raise HTTPException(status_code=e.status_code, detail=f"{e.detail}. {hint}")
+            yield json.dumps({"done": True, "pages": pages, "error": e.detail}) + "\n"
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}. Ensure ffmpeg is installed and restart the server.")
-        if not transcript_text:
-            raise HTTPException(status_code=422, detail="Transcription produced no text")
-        return TranscriptResponse(
-            kind="media",
-            transcript=transcript_text,
-            segments=segments,
-            language=language,
-            duration=duration,
-        )
-    finally:
-        try:
-            os.remove(temp_path)
-        except Exception:
-            pass
+            yield json.dumps({"done": True, "pages": pages, "error": str(e)}) + "\n"
+        finally:
+            _discard(temp_path)
+
+    return StreamingResponse(_events(), media_type="application/x-ndjson")
 
 
 @router.post("/manual", response_model=TranscriptResponse)
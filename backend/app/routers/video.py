@@ -4,6 +4,8 @@ from typing import List, Dict
 
 from backend.app.services.video_trim import save_video_to_dated_folder, trim_clips
 from backend.app.services.llm import generate_caption_and_title
+from backend.services.video_index import video_index
+from backend.utils.executors import DISK, NETWORK, SUBPROCESS, run_blocking
 import os
 import shutil
 
@@ -25,18 +27,26 @@ class TrimRequest(BaseModel):
 async def upload_video(file: UploadFile = File(...)):
     if not file.filename:
         raise HTTPException(status_code=400, detail="Filename required")
-    dest_path, base_dir = save_video_to_dated_folder(file)
+    dest_path, base_dir = await run_blocking(DISK, save_video_to_dated_folder, file)
+    video_index.invalidate_path(dest_path)
     return {"ok": True, "source_path": dest_path, "base_dir": base_dir}
 
 
 @router.post("/video/trim")
 async def video_trim(req: TrimRequest):
-    created = trim_clips(req.source_path, [(c.start, c.end) for c in req.clips], base_dir=req.source_path.rsplit("original", 1)[0].rstrip("/\\"))
+    created = await run_blocking(
+        SUBPROCESS,
+        trim_clips,
+        req.source_path,
+        [(c.start, c.end) for c in req.clips],
+        base_dir=req.source_path.rsplit("original", 1)[0].rstrip("/\\"),
+    )
+    for path in created:
+        video_index.invalidate_path(path)
     return {"ok": True, "clips": created}
 
 
-@router.get("/video/clips-by-date")
-async def clips_by_date() -> Dict[str, List[str]]:
+def _group_clips_by_date() -> Dict[str, List[str]]:
     base_storage = os.path.join("storage")
     grouped: Dict[str, List[str]] = {}
     if not os.path.isdir(base_storage):
@@ -59,10 +69,23 @@ async def clips_by_date() -> Dict[str, List[str]]:
     return grouped
 
 
+@router.get("/video/clips-by-date")
+async def clips_by_date() -> Dict[str, List[str]]:
+    return await run_blocking(DISK, _group_clips_by_date)
+
+
 class DeleteRequest(BaseModel):
     path: str
 
 
+def _remove_file(abs_path: str) -> bool:
+    """Delete ``abs_path``; False when it was already missing."""
+    if not os.path.exists(abs_path):
+        return False
+    os.remove(abs_path)
+    return True
+
+
 @router.post("/video/delete")
 async def delete_clip(req: DeleteRequest):
     # Only allow deletions under storage directory
@@ -94,12 +117,13 @@ async def delete_clip(req: DeleteRequest):
     abs_path = os.path.abspath(os.path.join(storage_root, raw_path))
     if not abs_path.startswith(storage_root):
         raise HTTPException(status_code=400, detail="Invalid path")
-    if not os.path.exists(abs_path):
-        return {"ok": True, "deleted": req.path, "note": "already missing"}
     try:
-        os.remove(abs_path)
+        removed = await run_blocking(DISK, _remove_file, abs_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Delete failed: {e}")
+    video_index.invalidate_path(abs_path)
+    if not removed:
+        return {"ok": True, "deleted": req.path, "note": "already missing"}
     return {"ok": True, "deleted": req.path}
 
 
@@ -112,7 +136,7 @@ class CaptionRequest(BaseModel):
 @router.post("/video/caption")
 async def video_caption(req: CaptionRequest):
     name = os.path.basename(req.path)
-    data = generate_caption_and_title(filename=name, transcript=req.transcript, seed=req.seed)
+    data = await run_blocking(NETWORK, generate_caption_and_title, filename=name, transcript=req.transcript, seed=req.seed)
     return {"ok": True, **data}
 
 
@@ -0,0 +1,247 @@
+"""
+Micro-batched transcription of short clips
+
+Trimmed clips are 10-45 seconds, so a separate ``model.transcribe`` per clip
+is dominated by per-call overhead (feature extraction setup, VAD, one
+encoder pass per call). ``ClipBatcher`` holds concurrent short-clip requests
+for up to ``WHISPER_CLIP_BATCH_WINDOW_MS``, concatenates their audio and runs
+one ``BatchedInferencePipeline`` pass with each clip's speech (found by the
+profile's own VAD settings, in pieces of at most 30 s) as its own
+``clip_timestamps`` chunks. Segment times come back in the concatenated
+timeline and are mapped back to each request by offset.
+
+Only profiles the batched pass decodes identically are batched: a single
+temperature (no fallback) and no conditioning on previous text, so the final
+profile always takes the per-file path. Clips are decoded on the caller's
+thread and ``submit`` returns a future, which async callers await on the
+event loop instead of parking an executor thread; only inference is
+serialized on the batcher thread. Longer media, or anything the batcher
+cannot handle (including audio whose language cannot be decided), yields
+None and takes the regular per-file path.
+"""
+
+from bisect import bisect_right
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import queue
+import threading
+import time
+
+from backend.app.config import settings
+from backend.app.services.transcription_profiles import TranscriptionProfile, detect_audio_language, get_profile
+from backend.app.services.whisper import get_whisper_model
+from backend.utils.metrics import QUEUE_DEPTH, registry, stage_timer
+
+SAMPLE_RATE = 16000
+RawResult = Tuple[List[Tuple[float, float, str]], Optional[str], Optional[float]]
+
+
+@dataclass
+class _ClipRequest:
+    profile: TranscriptionProfile
+    audio: object  # float32 numpy array at SAMPLE_RATE
+    future: Future = field(default_factory=Future)
+    language: Optional[str] = None
+
+
+def media_duration(file_path: str) -> Optional[float]:
+    """Container duration in seconds without decoding, or None if unknown"""
+    try:
+        import av
+
+        with av.open(file_path) as container:
+            if container.duration:
+                return container.duration / 1_000_000
+    except Exception:
+        pass
+    return None
+
+
+def batchable(profile: TranscriptionProfile) -> bool:
+    """Whether one batched pass decodes ``profile`` the way model.transcribe would"""
+    return len(profile.temperature) == 1 and not profile.condition_on_previous_text
+
+
+def speech_pieces(audio, profile: TranscriptionProfile, max_samples: int) -> List[Tuple[int, int]]:
+    """(start, end) sample ranges covering the speech ``profile``'s VAD finds,
+    merged into pieces of at most ``max_samples``"""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    vad = VadOptions(threshold=profile.vad_threshold, min_silence_duration_ms=profile.vad_min_silence_ms)
+    pieces: List[Tuple[int, int]] = []
+    for speech in get_speech_timestamps(audio, vad, sampling_rate=SAMPLE_RATE):
+        start, end = speech["start"], speech["end"]
+        if pieces and end - pieces[-1][0] <= max_samples:
+            pieces[-1] = (pieces[-1][0], end)
+        elif end - start > max_samples:
+            pieces.extend((start + a, start + b) for a, b in split_pieces(audio[start:end], max_samples))
+        else:
+            pieces.append((start, end))
+    return pieces
+
+
+def split_pieces(audio, max_samples: int) -> List[Tuple[int, int]]:
+    """(start, end) sample ranges of at most ``max_samples``, cut at the
+    quietest 100 ms in the last 5 s before each limit so words are not split"""
+    import numpy as np
+
+    pieces: List[Tuple[int, int]] = []
+    start, total = 0, len(audio)
+    frame = SAMPLE_RATE // 10
+    search = min(5 * SAMPLE_RATE, max_samples // 2)
+    while total - start > max_samples:
+        window_start = start + max_samples - search
+        window = audio[window_start:start + max_samples]
+        frames = len(window) // frame
+        energy = np.square(window[:frames * frame].reshape(frames, frame)).mean(axis=1)
+        cut = window_start + int(energy.argmin()) * frame + frame // 2
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, total))
+    return pieces
+
+
+class ClipBatcher:
+    def __init__(self, window_ms: float, max_batch: int, max_clip_seconds: float):
+        self.window = window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.max_clip_seconds = max_clip_seconds
+        self.batches = 0
+        self.clips = 0
+        self._queue: "queue.Queue[_ClipRequest]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, file_path: str, profile: Optional[str] = None) -> Optional[Future]:
+        """Decode a short clip and queue it for the next batch.
+
+        Returns None when the file is not a short clip or the profile cannot be
+        batched. The future resolves to the raw result, or to None when the
+        clip has to take the per-file path after all.
+        """
+        chosen = get_profile(profile)
+        if self.max_clip_seconds <= 0 or not batchable(chosen):
+            return None
+        duration = media_duration(file_path)
+        if duration is None or duration > self.max_clip_seconds:
+            return None
+        from faster_whisper.audio import decode_audio
+
+        request = _ClipRequest(profile=chosen, audio=decode_audio(file_path, sampling_rate=SAMPLE_RATE))
+        self._ensure_thread()
+        self._queue.put(request)
+        return request.future
+
+    def transcribe(self, file_path: str, profile: Optional[str] = None) -> Optional[RawResult]:
+        """Blocking ``submit``, for callers on their own thread (the model server's connection threads)"""
+        future = self.submit(file_path, profile)
+        return future.result() if future is not None else None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "batches": self.batches,
+            "clips": self.clips,
+            "mean_batch": round(self.clips / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="clip-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # One pipeline pass per (profile, language); the decoder takes a single language
+            groups: Dict[Tuple[str, Optional[str]], List[_ClipRequest]] = {}
+            for request in batch:
+                try:
+                    model = get_whisper_model(request.profile.model)
+                    request.language = detect_audio_language(model, request.audio)
+                    if request.language is None:
+                        # The batched pass needs one language; let the per-file path detect it
+                        request.future.set_result(None)
+                        continue
+                    groups.setdefault((request.profile.name, request.language), []).append(request)
+                except Exception as e:
+                    request.future.set_exception(e)
+            for requests in groups.values():
+                try:
+                    self._transcribe_group(requests)
+                except Exception as e:
+                    for request in requests:
+                        if not request.future.done():
+                            request.future.set_exception(e)
+
+    @stage_timer("whisper_clip_batch")
+    def _transcribe_group(self, requests: List[_ClipRequest]) -> None:
+        import numpy as np
+        from faster_whisper import BatchedInferencePipeline
+
+        profile = requests[0].profile
+        model = get_whisper_model(profile.model)
+        max_samples = model.feature_extractor.chunk_length * SAMPLE_RATE
+
+        # Concatenate every piece; remember where each one came from
+        buffers = []
+        clip_timestamps: List[Dict[str, int]] = []
+        owners: List[Tuple[int, int]] = []  # (request index, piece start within its clip)
+        offset = 0
+        for index, request in enumerate(requests):
+            for start, end in speech_pieces(request.audio, profile, max_samples):
+                buffers.append(request.audio[start:end])
+                clip_timestamps.append({"start": offset, "end": offset + end - start})
+                owners.append((index, start))
+                offset += end - start
+        if not buffers:
+            for request in requests:
+                request.future.set_result(([], request.language, 0.0))
+            return
+        piece_starts = [ts["start"] for ts in clip_timestamps]
+
+        options = profile.decode_options()
+        # VAD already picked the pieces above; clip_timestamps replace it in the pipeline
+        for key in ("vad_filter", "vad_parameters", "chunk_length", "batch_size"):
+            options.pop(key, None)
+        segments_iter, _ = BatchedInferencePipeline(model=model).transcribe(
+            np.concatenate(buffers),
+            language=requests[0].language,
+            clip_timestamps=clip_timestamps,
+            batch_size=max(1, min(len(clip_timestamps), self.max_batch)),
+            without_timestamps=False,
+            **options,
+        )
+
+        raw: List[List[Tuple[float, float, str]]] = [[] for _ in requests]
+        for seg in segments_iter:
+            piece = max(0, bisect_right(piece_starts, round(seg.start * SAMPLE_RATE)) - 1)
+            index, clip_start = owners[piece]
+            piece_end = clip_timestamps[piece]["end"]
+            shift = (clip_start - piece_starts[piece]) / SAMPLE_RATE
+            end = min(seg.end, piece_end / SAMPLE_RATE)
+            raw[index].append((round(seg.start + shift, 3), round(end + shift, 3), (seg.text or "").strip()))
+
+        self.batches += 1
+        self.clips += len(requests)
+        for index, request in enumerate(requests):
+            request.future.set_result((raw[index], request.language, len(request.audio) / SAMPLE_RATE))
+
+
+clip_batcher = ClipBatcher(
+    settings.whisper_clip_batch_window_ms,
+    settings.whisper_clip_batch_max,
+    settings.whisper_clip_max_seconds,
+)
+registry.register_collector(lambda: QUEUE_DEPTH.set(clip_batcher._queue.qsize(), queue="clip_batcher"))
@@ -0,0 +1,173 @@
+"""Parallel page-level text extraction for paged documents (PDF, PPTX).
+
+Pages are split into contiguous ranges and fanned out across a process pool so a
+large document does not pin the request worker. Results are yielded in page
+order as soon as every earlier page is ready, which lets callers stream text
+back while the rest of the document is still being processed.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+import os
+import threading
+import time
+
+from fastapi import HTTPException
+
+from backend.app.config import settings
+
+
+PDF = "pdf"
+PPTX = "pptx"
+
+
+class _Pool:
+    """The shared process pool plus the number of extractions using it."""
+
+    def __init__(self, workers: int):
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.users = 0
+        self.retired = False
+
+
+_pool: Optional[_Pool] = None
+_pool_lock = threading.Lock()
+
+
+def _acquire_pool() -> _Pool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = settings.doc_extract_workers or min(4, os.cpu_count() or 1)
+            _pool = _Pool(max(1, workers))
+        _pool.users += 1
+        return _pool
+
+
+def _release_pool(pool: _Pool, timed_out: bool = False) -> None:
+    """Drop a user of ``pool``; a timed-out extraction retires it.
+
+    A retired pool takes no new work (the next extraction starts a fresh one)
+    and its worker processes are killed once the last extraction still
+    waiting on it has finished, so a runaway page range cannot keep a CPU busy.
+    """
+    global _pool
+    with _pool_lock:
+        pool.users -= 1
+        if timed_out and _pool is pool:
+            _pool = None
+            pool.retired = True
+        terminate = pool.retired and pool.users == 0
+    if terminate:
+        processes = list((getattr(pool.executor, "_processes", None) or {}).values())
+        pool.executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+
+def paged_kind(name_lower: str, mime: str) -> Optional[str]:
+    """Return the paged document kind handled by this engine, if any."""
+    if name_lower.endswith(".pdf") or mime.startswith("application/pdf"):
+        return PDF
+    if name_lower.endswith(".pptx") or mime == "application/vnd.openxmlformats-officedocument.presentationml.presentation":
+        return PPTX
+    return None
+
+
+def count_pages(kind: str, file_path: str) -> int:
+    if kind == PDF:
+        from pypdf import PdfReader
+        return len(PdfReader(file_path).pages)
+    from pptx import Presentation
+    return len(Presentation(file_path).slides)
+
+
+def _extract_page_range(kind: str, file_path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """Worker entry point: open the document once and extract pages [start, stop)."""
+    out: List[Tuple[int, str]] = []
+    if kind == PDF:
+        from pypdf import PdfReader
+        reader = PdfReader(file_path)
+        for idx in range(start, stop):
+            try:
+                out.append((idx, reader.pages[idx].extract_text() or ""))
+            except Exception:
+                out.append((idx, ""))
+        return out
+    from pptx import Presentation
+    slides = Presentation(file_path).slides
+    for idx in range(start, stop):
+        texts: List[str] = []
+        try:
+            for shape in slides[idx].shapes:
+                if hasattr(shape, "text") and shape.text:
+                    texts.append(shape.text.strip())
+        except Exception:
+            pass
+        out.append((idx, "\n\n".join([t for t in texts if t])))
+    return out
+
+
+def iter_document_pages(
+    file_path: str,
+    kind: str,
+    max_pages: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[Tuple[int, str]]:
+    """Yield (page_index, text) in page order, extracting page ranges in parallel.
+
+    Pages beyond ``max_pages`` are skipped. Raises HTTPException(504) when the
+    workers have not finished the document within ``timeout`` seconds; time the
+    caller spends consuming yielded pages does not count.
+    """
+    max_pages = settings.doc_max_pages if max_pages is None else max_pages
+    timeout = settings.doc_extract_timeout if timeout is None else timeout
+    total = count_pages(kind, file_path)
+    if max_pages and max_pages > 0:
+        total = min(total, max_pages)
+    if total <= 0:
+        return
+
+    chunk = max(1, settings.doc_pages_per_task)
+    if total <= chunk:
+        # Not worth the pool round-trip for small documents
+        for item in _extract_page_range(kind, file_path, 0, total):
+            yield item
+        return
+
+    deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+    pool = _acquire_pool()
+    timed_out = False
+    pending: Dict[Future, int] = {
+        pool.executor.submit(_extract_page_range, kind, file_path, start, min(start + chunk, total)): start
+        for start in range(0, total, chunk)
+    }
+    ready: Dict[int, str] = {}
+    next_idx = 0
+    try:
+        while pending:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                timed_out = True
+                raise HTTPException(status_code=504, detail=f"Document extraction timed out after {timeout:.0f}s")
+            done, _ = wait(list(pending), timeout=remaining, return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.pop(fut)
+                for idx, text in fut.result():
+                    ready[idx] = text
+            while next_idx in ready:
+                suspended = time.monotonic()
+                yield next_idx, ready.pop(next_idx)
+                next_idx += 1
+                if deadline is not None:
+                    # A slow consumer must not eat into the workers' budget
+                    deadline += time.monotonic() - suspended
+    finally:
+        for fut in pending:
+            fut.cancel()
+        _release_pool(pool, timed_out)
+
+
+def extract_paged_text(file_path: str, kind: str) -> str:
+    texts = [text.strip() for _, text in iter_document_pages(file_path, kind)]
+    return "\n\n".join([t for t in texts if t])
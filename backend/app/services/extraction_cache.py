@@ -0,0 +1,151 @@
+"""On-disk cache of document extraction results keyed by content digest.
+
+Entries are plain UTF-8 files named ``<sha256>-<params>-<kind>.txt``, where
+``params`` covers everything besides the content that shapes the output (the
+extractor version and ``DOC_MAX_PAGES``), so changing either never serves text
+extracted under the old settings.
+Reads bump the file mtime, and eviction removes the least recently used
+entries once the directory grows past ``EXTRACTION_CACHE_MAX_MB``.
+"""
+
+from typing import Dict, Optional
+import hashlib
+import os
+import tempfile
+import threading
+
+from backend.app.config import settings
+
+
+# Bump whenever an extractor changes its output so stale entries are ignored
+EXTRACTOR_VERSION = 1
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def extraction_params() -> str:
+    """Cache-key fragment for the settings the extracted text depends on."""
+    return f"v{EXTRACTOR_VERSION}-p{settings.doc_max_pages}"
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str, kind: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}-{extraction_params()}-{kind}.txt")
+
+    def get(self, digest: str, kind: str) -> Optional[str]:
+        path = self._path(digest, kind)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def put(self, digest: str, kind: str, text: str) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data = text.encode("utf-8")
+        path = self._path(digest, kind)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        except OSError:
+            self._discard(tmp_path)
+            return
+        with self._lock:
+            # Replacing an entry (a re-put, or two concurrent misses) only adds the difference
+            try:
+                replaced = os.stat(path).st_size
+            except OSError:
+                replaced = 0
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                self._discard(tmp_path)
+                return
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    @staticmethod
+    def _discard(tmp_path: str) -> None:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    def _entries(self):
+        try:
+            with os.scandir(self.cache_dir) as it:
+                return [e for e in it if e.is_file() and e.name.endswith(".txt")]
+        except OSError:
+            return []
+
+    def _scan_size(self) -> int:
+        return sum(e.stat().st_size for e in self._entries())
+
+    def _evict(self) -> None:
+        """Drop least recently used entries down to 90% of the budget."""
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        size = sum(e.stat().st_size for e in entries)
+        target = int(self.max_bytes * 0.9)
+        for entry in entries:
+            if size <= target:
+                break
+            try:
+                entry_size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            size -= entry_size
+            self.evictions += 1
+        self._size = size
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            lookups = self.hits + self.misses
+            return {
+                "enabled": settings.extraction_cache_enabled,
+                "extractor_version": EXTRACTOR_VERSION,
+                "params": extraction_params(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries()),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+extraction_cache = ExtractionCache(
+    settings.extraction_cache_dir,
+    settings.extraction_cache_max_mb * 1024 * 1024,
+)
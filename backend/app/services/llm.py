@@ -1,31 +1,36 @@
 from typing import Optional
-import google.generativeai as genai
 from fastapi import HTTPException
 from typing import Literal
 from backend.app.config import settings
+from backend.utils.metrics import stage_timer
+from backend.utils.topics import filename_buckets
 
-_configured = False
+_genai = None
 
 
-def _ensure_configured() -> None:
-    global _configured
-    if _configured:
-        return
-    api_key: Optional[str] = settings.gemini_api_key or settings.google_api_key
-    if not api_key:
-        raise HTTPException(status_code=500, detail="GEMINI_API_KEY is not set")
-    genai.configure(api_key=api_key)
-    _configured = True
+def _gemini_model():
+    """Configured Gemini model. google.generativeai (and its grpc/protobuf
+    stack) is imported on first use to keep it out of cold start."""
+    global _genai
+    if _genai is None:
+        api_key: Optional[str] = settings.gemini_api_key or settings.google_api_key
+        if not api_key:
+            raise HTTPException(status_code=500, detail="GEMINI_API_KEY is not set")
+        import google.generativeai as genai
 
+        genai.configure(api_key=api_key)
+        _genai = genai
+    return _genai.GenerativeModel(settings.gemini_model)
 
+
+@stage_timer("gemini_story")
 def generate_story_with_gemini(
     transcript: str,
     story_format: Optional[Literal["lucy", "narrative", "business", "motivational"]] = None,
     use_custom_prompt: Optional[bool] = None,
     custom_prompt: Optional[str] = None,
 ) -> str:
-    _ensure_configured()
-    model = genai.GenerativeModel(settings.gemini_model)
+    model = _gemini_model()
     framing, story = _extract_framing_and_story(transcript)
     prompt = _build_prompt(framing, story, story_format, use_custom_prompt, custom_prompt)
     resp = model.generate_content(prompt)
@@ -39,10 +44,10 @@ def generate_story_with_gemini(
     return _clean_output(text)
 
 
+@stage_timer("gemini_chat")
 def generate_chat_response(message: str, system_hint: Optional[str] = None) -> str:
     """General-purpose chat completion via Gemini."""
-    _ensure_configured()
-    model = genai.GenerativeModel(settings.gemini_model)
+    model = _gemini_model()
     prompt = message if not system_hint else f"System: {system_hint}\n\nUser: {message}"
     resp = model.generate_content(prompt)
     text = getattr(resp, "text", None)
@@ -148,9 +153,9 @@ Task: Create a professional 4-part voiceover script with clean formatting and pr
 """
 
 
+@stage_timer("gemini_caption")
 def generate_caption_and_title(filename: str, transcript: Optional[str] = None, seed: Optional[int] = None) -> dict:
-    _ensure_configured()
-    model = genai.GenerativeModel(settings.gemini_model)
+    model = _gemini_model()
     context_keywords = _extract_keywords_from_filename(filename)
     prompt = f"""
 You are a social media content assistant.
@@ -230,21 +235,4 @@ Rules:
 
 
 def _extract_keywords_from_filename(name: str) -> list[str]:
-    n = name.lower()
-    buckets = {
-        "tutorial": ["tutorial","howto","guide","learn","education","teaching"],
-        "story": ["story","narrative","journey","experience"],
-        "funny": ["funny","humor","comedy","laugh","joke","hilarious"],
-        "inspiration": ["inspiration","motivation","success","achievement","goal"],
-        "review": ["review","analysis","opinion","thoughts","feedback"],
-        "tech": ["tech","technology","gadget","app","software"],
-        "business": ["business","entrepreneur","startup","money"],
-        "fitness": ["fitness","workout","exercise","health","training"],
-    }
-    out: list[str] = []
-    for label, kws in buckets.items():
-        if any(k in n for k in kws):
-            out.append(label)
-    return out[:5]
-
-
+    return list(filename_buckets(name))
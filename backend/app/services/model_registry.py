@@ -0,0 +1,224 @@
+"""
+Pinned Whisper models and the runtime model registry
+
+Models are downloaded once into ``WHISPER_MODELS_DIR`` (at image build time,
+see the Dockerfile) and recorded in ``manifest.json`` with a sha256 per file.
+A later ``pin`` of the same model must reproduce those checksums, so a
+committed manifest makes the build fail on a changed or corrupted download
+(without one the image build pins unlocked).
+At runtime a pinned model is loaded from its directory and never fetched;
+with ``WHISPER_ALLOW_DOWNLOAD=false`` unpinned models are refused.
+
+CTranslate2 copies weights into its own buffers, so they cannot be mmap-shared
+across processes. Instead one process owns the model (the model server under
+gunicorn) and runs ``MODEL_SERVER_CONCURRENCY`` transcriptions in parallel on
+that single copy (``num_workers``). ``ModelRegistry`` switches the active
+model at runtime, keeping at most ``WHISPER_MAX_LOADED`` models resident.
+
+    python -m backend.app.services.model_registry pin distil-small.en
+    python -m backend.app.services.model_registry pin --locked distil-small.en
+    python -m backend.app.services.model_registry verify
+    python -m backend.app.services.model_registry list
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+
+from backend.app.config import settings
+
+MANIFEST_NAME = "manifest.json"
+
+
+class ModelIntegrityError(RuntimeError):
+    """A pinned model is missing, unpinned, or does not match its checksums."""
+
+
+def _manifest_path(models_dir: str) -> str:
+    return os.path.join(models_dir, MANIFEST_NAME)
+
+
+def load_manifest(models_dir: Optional[str] = None) -> Dict[str, Dict]:
+    path = _manifest_path(models_dir or settings.whisper_models_dir)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _save_manifest(models_dir: str, manifest: Dict[str, Dict]) -> None:
+    os.makedirs(models_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=models_dir, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, _manifest_path(models_dir))
+
+
+def pinned_path(name: str, models_dir: Optional[str] = None) -> str:
+    return os.path.join(models_dir or settings.whisper_models_dir, name.replace("/", "--"))
+
+
+def _hash_tree(root: str) -> Dict[str, str]:
+    """sha256 per file under ``root``, skipping hidden download metadata"""
+    checksums: Dict[str, str] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for filename in sorted(filenames):
+            if filename.startswith("."):
+                continue
+            path = os.path.join(dirpath, filename)
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+            checksums[os.path.relpath(path, root).replace(os.sep, "/")] = digest.hexdigest()
+    return checksums
+
+
+def _diff(expected: Dict[str, str], actual: Dict[str, str]) -> List[str]:
+    problems = [f"missing {f}" for f in sorted(set(expected) - set(actual))]
+    problems += [f"unexpected {f}" for f in sorted(set(actual) - set(expected))]
+    problems += [f"checksum mismatch {f}" for f in sorted(set(expected) & set(actual)) if expected[f] != actual[f]]
+    return problems
+
+
+def pin_model(name: str, models_dir: Optional[str] = None, update: bool = False,
+              locked: bool = False) -> Dict[str, str]:
+    """Download ``name`` into the models directory and record (or check) its checksums
+
+    With ``locked`` the manifest must already list ``name``, so an image build
+    can never record fresh checksums for whatever the hub serves that day.
+    """
+    models_dir = models_dir or settings.whisper_models_dir
+    if locked and not load_manifest(models_dir).get(name, {}).get("files"):
+        raise ModelIntegrityError(
+            f"{name} has no checksums in {_manifest_path(models_dir)}; pin it locally and commit the manifest"
+        )
+    from faster_whisper.utils import download_model
+
+    path = download_model(name, output_dir=pinned_path(name, models_dir))
+    checksums = _hash_tree(path)
+    manifest = load_manifest(models_dir)
+    expected = manifest.get(name, {}).get("files")
+    if expected and not update:
+        problems = _diff(expected, checksums)
+        if problems:
+            raise ModelIntegrityError(f"{name} does not match {MANIFEST_NAME}: " + "; ".join(problems))
+    pinned_at = manifest.get(name, {}).get("pinned_at") if expected and not update else None
+    manifest[name] = {
+        "path": os.path.relpath(path, models_dir).replace(os.sep, "/"),
+        "files": checksums,
+        "pinned_at": pinned_at or datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    _save_manifest(models_dir, manifest)
+    return checksums
+
+
+def verify_model(name: str, models_dir: Optional[str] = None) -> None:
+    models_dir = models_dir or settings.whisper_models_dir
+    entry = load_manifest(models_dir).get(name)
+    if entry is None:
+        raise ModelIntegrityError(f"{name} is not pinned in {models_dir}")
+    problems = _diff(entry["files"], _hash_tree(os.path.join(models_dir, entry["path"])))
+    if problems:
+        raise ModelIntegrityError(f"{name}: " + "; ".join(problems))
+
+
+def resolve_model(name: str) -> str:
+    """Local directory for a pinned model, else the hub name when downloads are allowed"""
+    entry = load_manifest().get(name)
+    if entry is not None:
+        path = os.path.join(settings.whisper_models_dir, entry["path"])
+        if os.path.isdir(path):
+            if settings.whisper_verify_on_load:
+                verify_model(name)
+            return path
+    if settings.whisper_allow_download:
+        return name
+    raise ModelIntegrityError(f"{name} is not pinned in {settings.whisper_models_dir} and downloads are disabled")
+
+
+class ModelRegistry:
+    """Loaded models by name plus the active one, switchable without a restart.
+
+    When ``max_loaded`` is reached the least recently loaded model is dropped
+    before the next one loads, so a switch on a small VM never holds two
+    models at once; transcriptions already running keep their reference and
+    finish on the old model.
+    """
+
+    def __init__(self, default: str, loader: Callable[[str], object], max_loaded: int = 1):
+        self.active = default
+        self.max_loaded = max(1, max_loaded)
+        self._loader = loader
+        self._loaded: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: Optional[str] = None):
+        model = self._loaded.get(name or self.active)
+        if model is not None:
+            return model
+        with self._lock:
+            # Re-read the active name: a switch may have completed meanwhile
+            return self._load_locked(name or self.active)
+
+    def switch(self, name: str) -> None:
+        """Load ``name`` (if needed) and make it the model used for new requests"""
+        with self._lock:
+            self._load_locked(name)
+            self.active = name
+
+    def _load_locked(self, name: str):
+        model = self._loaded.get(name)
+        if model is None:
+            while len(self._loaded) >= self.max_loaded:
+                self._loaded.popitem(last=False)
+            model = self._loader(name)
+            self._loaded[name] = model
+        return model
+
+    def status(self) -> Dict[str, object]:
+        manifest = load_manifest()
+        return {
+            "active": self.active,
+            "loaded": list(self._loaded),
+            "pinned": sorted(manifest),
+            "allow_download": settings.whisper_allow_download,
+        }
+
+
+def main(argv: List[str]) -> int:
+    command, names = (argv[0], argv[1:]) if argv else ("list", [])
+    manifest = load_manifest()
+    try:
+        if command == "pin":
+            update, locked = "--update" in names, "--locked" in names
+            for name in [n for n in names if n not in ("--update", "--locked")] or [settings.whisper_model]:
+                files = pin_model(name, update=update, locked=locked)
+                print(f"pinned {name}: {len(files)} files")
+        elif command == "verify":
+            for name in names or sorted(manifest):
+                verify_model(name)
+                print(f"ok {name}")
+        elif command == "list":
+            for name, entry in sorted(manifest.items()):
+                print(f"{name}\t{entry['path']}\t{len(entry['files'])} files\tpinned {entry.get('pinned_at')}")
+        else:
+            print(f"Unknown command {command!r}; use pin, verify or list")
+            return 2
+    except ModelIntegrityError as e:
+        print(f"ERROR: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,163 @@
+"""
+Out-of-process Whisper host shared by all web workers
+
+Under gunicorn every web worker would otherwise load its own copy of the
+model (and the startup warm-up would load it N times). Instead gunicorn's
+on_starting hook calls start_model_server(), which forks one manager process
+that owns the model and loads it lazily on first use. Web workers reach it
+through a BaseManager proxy and only send file paths: uploads are spooled to
+the same filesystem, so no audio crosses the socket.
+
+When MODEL_SERVER_ADDRESS is unset (plain ``uvicorn backend.main:app``)
+transcription stays in-process.
+"""
+
+import os
+import secrets
+import threading
+from contextlib import contextmanager
+from multiprocessing.managers import BaseManager
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from backend.app.config import settings
+
+RawSegments = List[Tuple[float, float, str]]
+
+ADDRESS_ENV = "MODEL_SERVER_ADDRESS"
+AUTHKEY_ENV = "MODEL_SERVER_AUTHKEY"
+
+
+class ModelHostError(Exception):
+    """An HTTPException raised inside the model server, in a form that pickles.
+
+    HTTPException is built from keyword arguments only, so its ``args`` are
+    empty and unpickling it in the web worker fails.
+    """
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@contextmanager
+def _host_errors():
+    """Turn HTTPExceptions raised in the model server into ModelHostError."""
+    try:
+        yield
+    except HTTPException as e:
+        raise ModelHostError(e.status_code, e.detail) from None
+
+
+class ModelHost:
+    """Lives in the model server process; one instance serves every worker."""
+
+    def __init__(self, concurrency: int):
+        # Bounds concurrent inference; the manager runs one thread per connection
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+        self._served = 0
+
+    def transcribe(self, file_path: str, profile: Optional[str] = None,
+                   traceparent: Optional[str] = None) -> Tuple[RawSegments, Optional[str], Optional[float]]:
+        from backend.app.services.clip_batcher import clip_batcher
+        from backend.app.services.transcription import whisper_transcribe
+        from backend.utils.tracing import continue_trace
+
+        # Spans recorded here join the calling request's trace
+        with _host_errors(), continue_trace(traceparent, "model_server.transcribe"):
+            # Short clips bypass the slots: the batcher serializes its own passes,
+            # and concurrent clips must reach it together to be batched
+            result = clip_batcher.transcribe(file_path, profile)
+            if result is None:
+                with self._slots:
+                    result = whisper_transcribe(file_path, profile)
+        self._served += 1
+        return result
+
+    def warm(self) -> None:
+        from backend.app.services.whisper import get_whisper_model
+
+        with _host_errors():
+            get_whisper_model()
+
+    def models(self) -> Dict[str, object]:
+        from backend.app.services.whisper import model_registry
+
+        from backend.app.services.clip_batcher import clip_batcher
+
+        return {"pid": os.getpid(), "served": self._served, "clip_batching": clip_batcher.stats(), **model_registry.status()}
+
+    def switch(self, name: str) -> Dict[str, object]:
+        from backend.app.services.whisper import model_registry
+
+        with _host_errors():
+            model_registry.switch(name)
+        return self.models()
+
+
+_host: Optional[ModelHost] = None
+
+
+def _get_host() -> ModelHost:
+    global _host
+    if _host is None:
+        from backend.utils.metrics import registry
+
+        _host = ModelHost(settings.model_server_concurrency)
+        # Whisper stage timings recorded here reach /metrics through METRICS_DIR
+        registry.start_flusher()
+    return _host
+
+
+class _ModelManager(BaseManager):
+    pass
+
+
+_ModelManager.register("host", callable=_get_host)
+
+
+def _parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def start_model_server(address: str) -> BaseManager:
+    """Start the model process (from the gunicorn master) and export its
+    address and auth key to the environment inherited by forked workers."""
+    authkey = os.environ.get(AUTHKEY_ENV) or secrets.token_hex(16)
+    manager = _ModelManager(address=_parse_address(address), authkey=authkey.encode())
+    manager.start()
+    os.environ[ADDRESS_ENV] = address
+    os.environ[AUTHKEY_ENV] = authkey
+    return manager
+
+
+_client_lock = threading.Lock()
+_client_host = None
+
+
+def get_model_host():
+    """Proxy to the shared ModelHost, connected once per web worker."""
+    global _client_host
+    with _client_lock:
+        if _client_host is None:
+            authkey = (os.environ.get(AUTHKEY_ENV) or settings.model_server_authkey or "").encode()
+            manager = _ModelManager(address=_parse_address(settings.model_server_address), authkey=authkey)
+            manager.connect()
+            _client_host = manager.host()
+        return _client_host
+
+
+@contextmanager
+def model_host_errors():
+    """Re-raise a ModelHostError from a get_model_host() call as HTTPException."""
+    try:
+        yield
+    except ModelHostError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail) from None
+
+
+def model_server_enabled() -> bool:
+    return bool(settings.model_server_address)
@@ -0,0 +1,99 @@
+"""Streaming SRT / WebVTT parser producing timed TranscriptSegments."""
+
+from typing import Iterator, List, Optional
+import html
+import re
+
+from backend.app.models import TranscriptSegment
+from backend.app.services.text_ingest import iter_text_lines
+
+
+SUBTITLE_EXTS = (".srt", ".vtt")
+SUBTITLE_MIMES = ("text/vtt", "application/x-subrip")
+
+_TIMESTAMP = r"(?:\d+:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?"
+_TIMING_RE = re.compile(rf"^\s*({_TIMESTAMP})\s*-->\s*({_TIMESTAMP})")
+# VTT voice/class/karaoke tags, SRT <i>/<font>, ASS-style {\an8} overrides
+_MARKUP_RE = re.compile(r"<[^>]*>|\{\\[^}]*\}")
+# Metadata blocks in WebVTT that never contain cues
+_VTT_BLOCKS = ("WEBVTT", "NOTE", "STYLE", "REGION")
+
+
+def is_subtitle_file(name_lower: str, mime: str) -> bool:
+    return name_lower.endswith(SUBTITLE_EXTS) or mime in SUBTITLE_MIMES
+
+
+def parse_timestamp(value: str) -> float:
+    """'01:02:03,450' / '02:03.450' -> seconds."""
+    seconds = 0.0
+    for part in value.replace(",", ".").split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def _clean_cue_text(lines: List[str]) -> str:
+    parts = [html.unescape(_MARKUP_RE.sub("", line)).strip() for line in lines]
+    return " ".join([p for p in parts if p])
+
+
+def _iter_cues(file_path: str) -> Iterator[TranscriptSegment]:
+    start = end = None
+    text_lines: List[str] = []
+    skipping = False
+    for raw in iter_text_lines(file_path):
+        line = raw.rstrip("\r\n").lstrip("\ufeff")
+        if not line.strip():
+            text = _clean_cue_text(text_lines)
+            if start is not None and text:
+                yield TranscriptSegment(start=start, end=end, text=text)
+            start = end = None
+            text_lines = []
+            skipping = False
+            continue
+        if skipping:
+            continue
+        if start is None:
+            match = _TIMING_RE.match(line)
+            if match:
+                start, end = parse_timestamp(match.group(1)), parse_timestamp(match.group(2))
+            elif line.split(" ", 1)[0] in _VTT_BLOCKS:
+                skipping = True
+            # anything else before the timing line is a cue identifier
+            continue
+        match = _TIMING_RE.match(line)
+        if match:
+            # Next cue without a blank separator; a bare number before it is its index
+            if text_lines and text_lines[-1].strip().isdigit():
+                text_lines.pop()
+            text = _clean_cue_text(text_lines)
+            if text:
+                yield TranscriptSegment(start=start, end=end, text=text)
+            start, end = parse_timestamp(match.group(1)), parse_timestamp(match.group(2))
+            text_lines = []
+            continue
+        text_lines.append(line)
+    text = _clean_cue_text(text_lines)
+    if start is not None and text:
+        yield TranscriptSegment(start=start, end=end, text=text)
+
+
+def iter_subtitle_segments(file_path: str) -> Iterator[TranscriptSegment]:
+    """Yield one segment per cue, with multi-line cue text merged.
+
+    Consecutive cues repeating the same text back to back (rolling captions)
+    are folded into a single segment spanning both.
+    """
+    prev: Optional[TranscriptSegment] = None
+    for seg in _iter_cues(file_path):
+        if prev is not None and seg.text == prev.text and (seg.start or 0) <= (prev.end or 0) + 0.05:
+            prev.end = max(prev.end or 0, seg.end or 0)
+            continue
+        if prev is not None:
+            yield prev
+        prev = seg
+    if prev is not None:
+        yield prev
+
+
+def extract_subtitle_text(file_path: str) -> str:
+    return "\n".join(seg.text for seg in iter_subtitle_segments(file_path))
@@ -0,0 +1,107 @@
+"""Streaming text ingestion with cheap encoding detection.
+
+Detection order: byte-order mark, then a UTF-8 validity check on a bounded
+prefix, and only then chardet on that same prefix. The file is decoded
+incrementally, so multi-megabyte transcripts are never held as raw bytes and
+chardet never sees more than ``TEXT_DETECT_SAMPLE_BYTES``.
+"""
+
+from typing import Iterator
+import codecs
+import io
+
+from backend.app.config import settings
+
+
+# Longest BOMs first: the UTF-32-LE BOM starts with the UTF-16-LE one
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _is_utf8(sample: bytes) -> bool:
+    try:
+        # final=False tolerates a multi-byte sequence cut off at the end of the sample
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _chardet_encoding(sample: bytes, default: str) -> str:
+    import chardet  # only needed for non-UTF-8 input
+
+    encoding = chardet.detect(sample[: settings.text_detect_sample_bytes]).get("encoding") or default
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return default
+    return encoding
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Pick a codec name for ``sample`` (the first bytes of a file)."""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    if _is_utf8(sample):
+        return "utf-8"
+    return _chardet_encoding(sample, "utf-8")
+
+
+def iter_text_chunks(file_path: str) -> Iterator[str]:
+    """Decode ``file_path`` incrementally, yielding text chunks.
+
+    If a file that looked like UTF-8 turns out to contain invalid bytes past
+    the sampled prefix, the valid part is kept and the remainder is re-detected.
+    """
+    chunk_size = settings.text_read_chunk_bytes
+    with open(file_path, "rb") as f:
+        data = f.read(settings.text_detect_sample_bytes)
+        encoding = detect_encoding(data)
+        strict = encoding == "utf-8"
+        decoder = codecs.getincrementaldecoder(encoding)(errors="strict" if strict else "replace")
+        while data:
+            if strict:
+                pending = decoder.getstate()[0]
+                try:
+                    text = decoder.decode(data)
+                except UnicodeDecodeError as exc:
+                    combined = pending + data
+                    text = combined[: exc.start].decode("utf-8")
+                    rest = combined[exc.start:]
+                    decoder = codecs.getincrementaldecoder(_chardet_encoding(rest, "latin-1"))(errors="replace")
+                    strict = False
+                    text += decoder.decode(rest)
+            else:
+                text = decoder.decode(data)
+            if text:
+                yield text
+            data = f.read(chunk_size)
+        try:
+            tail = decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            tail = decoder.getstate()[0].decode("utf-8", errors="replace")
+        if tail:
+            yield tail
+
+
+def iter_text_lines(file_path: str) -> Iterator[str]:
+    """Yield lines with their original endings (``\\n``, ``\\r\\n`` or ``\\r``)."""
+    carry = ""
+    for chunk in iter_text_chunks(file_path):
+        lines = io.StringIO(carry + chunk, newline="").readlines()
+        # A trailing "\r" may be the first half of a "\r\n" split across chunks
+        carry = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+        for line in lines:
+            yield line
+    if carry:
+        yield carry
+
+
+def read_text(file_path: str) -> str:
+    return "".join(iter_text_chunks(file_path))
@@ -1,35 +1,29 @@
-from typing import List, Optional, Tuple
+from concurrent.futures import Future
+from typing import Iterator, List, Optional, Tuple
 import os
-import tempfile
-import shutil
 import mimetypes
-import chardet
 import csv
 
-from pypdf import PdfReader
-from docx import Document as DocxDocument
-from bs4 import BeautifulSoup
-from markdown_it import MarkdownIt
-from pptx import Presentation
-
-try:
-    import pypandoc  # optional
-except Exception:
-    pypandoc = None  # type: ignore
-
 from fastapi import UploadFile, HTTPException
 
-from backend.app.services.whisper import get_whisper_model
+from backend.app.config import settings
+from backend.app.services.whisper import get_whisper_model, model_registry
+from backend.app.services.model_registry import ModelIntegrityError, resolve_model
+from backend.app.services.transcription_profiles import get_profile, probe_language
+from backend.app.services.clip_batcher import clip_batcher
+from backend.app.services.model_server import RawSegments, get_model_host, model_host_errors, model_server_enabled
+from backend.app.services.upload_ingest import spool_upload
+from backend.app.services.extraction_cache import extraction_cache, file_sha256
+from backend.app.services.text_ingest import iter_text_lines, read_text
+from backend.app.services.subtitles import extract_subtitle_text, is_subtitle_file
+from backend.app.services.extraction import PDF, PPTX, extract_paged_text, iter_document_pages, paged_kind
 from backend.app.models import TranscriptSegment
+from backend.utils.metrics import stage_timer
+from backend.utils.tracing import current_traceparent, run_subprocess
 
 
 def save_upload_to_temp(upload: UploadFile) -> str:
-    suffix = os.path.splitext(upload.filename or "uploaded")[1]
-    tmp_fd, tmp_path = tempfile.mkstemp(suffix=suffix)
-    os.close(tmp_fd)
-    with open(tmp_path, "wb") as out_f:
-        shutil.copyfileobj(upload.file, out_f)
-    return tmp_path
+    return spool_upload(upload).path
 
 
 def detect_mime_type(file_path: str, fallback_name: Optional[str]) -> str:
@@ -38,40 +32,37 @@ def detect_mime_type(file_path: str, fallback_name: Optional[str]) -> str:
 
 
 def extract_text_from_pdf(file_path: str) -> str:
-    reader = PdfReader(file_path)
-    pages_text: List[str] = []
-    for page in reader.pages:
-        try:
-            pages_text.append(page.extract_text() or "")
-        except Exception:
-            pages_text.append("")
-    return "\n\n".join([t.strip() for t in pages_text if t and t.strip()])
+    return extract_paged_text(file_path, PDF)
+
+
+# Parser libraries (python-docx, BeautifulSoup, markdown-it, pypandoc) are
+# imported by the extractor that needs them, keeping them out of cold start
 
 
 def extract_text_from_docx(file_path: str) -> str:
+    from docx import Document as DocxDocument
+
     doc = DocxDocument(file_path)
     paragraphs = [p.text.strip() for p in doc.paragraphs if p.text and p.text.strip()]
     return "\n\n".join(paragraphs)
 
 
 def extract_text_from_txt(file_path: str) -> str:
-    with open(file_path, "rb") as f:
-        raw = f.read()
-    detected = chardet.detect(raw)
-    encoding = (detected.get("encoding") or "utf-8")
-    try:
-        return raw.decode(encoding, errors="replace")
-    except Exception:
-        return raw.decode("utf-8", errors="replace")
+    return read_text(file_path)
 
 
 def extract_text_from_html(file_path: str) -> str:
+    from bs4 import BeautifulSoup
+
     html_text = extract_text_from_txt(file_path)
     soup = BeautifulSoup(html_text, "html.parser")
     return soup.get_text("\n", strip=True)
 
 
 def extract_text_from_markdown(file_path: str) -> str:
+    from bs4 import BeautifulSoup
+    from markdown_it import MarkdownIt
+
     md_src = extract_text_from_txt(file_path)
     try:
         html = MarkdownIt().render(md_src)
@@ -82,88 +73,114 @@ def extract_text_from_markdown(file_path: str) -> str:
 
 
 def extract_text_from_rtf(file_path: str) -> str:
-    if pypandoc is not None:
-        try:
-            return pypandoc.convert_file(file_path, "plain")
-        except Exception:
-            pass
+    try:
+        import pypandoc  # optional
+
+        return pypandoc.convert_file(file_path, "plain")
+    except Exception:
+        pass
     return extract_text_from_txt(file_path)
 
 
 def extract_text_from_pptx(file_path: str) -> str:
-    prs = Presentation(file_path)
-    texts: List[str] = []
-    for slide in prs.slides:
-        for shape in slide.shapes:
-            if hasattr(shape, "text") and shape.text:
-                texts.append(shape.text)
-    return "\n\n".join([t.strip() for t in texts if t and t.strip()])
+    return extract_paged_text(file_path, PPTX)
 
 
 def extract_text_from_csv(file_path: str) -> str:
-    with open(file_path, "rb") as f:
-        raw = f.read()
-    detected = chardet.detect(raw)
-    encoding = (detected.get("encoding") or "utf-8")
     lines: List[str] = []
     try:
-        with open(file_path, newline="", encoding=encoding, errors="replace") as csvfile:
-            reader = csv.reader(csvfile)
-            for row in reader:
-                lines.append(", ".join([col.strip() for col in row]))
+        for row in csv.reader(iter_text_lines(file_path)):
+            lines.append(", ".join([col.strip() for col in row]))
     except Exception:
         return extract_text_from_txt(file_path)
     return "\n".join(lines)
 
 
-def transcribe_media(file_path: str):
-    model = get_whisper_model()
+@stage_timer("whisper")
+def whisper_transcribe(file_path: str, profile: Optional[str] = None) -> Tuple[RawSegments, Optional[str], Optional[float]]:
+    """Run the local Whisper model; plain tuples so results can cross the model server socket."""
+    chosen = get_profile(profile)
+    model = get_whisper_model(chosen.model)
+    # Decide the language once from the first seconds; when that fails Whisper
+    # detects it itself rather than forcing English onto non-English audio
+    language = probe_language(model, file_path)
+    options = chosen.decode_options()
+    if chosen.batch_size > 1:
+        from faster_whisper import BatchedInferencePipeline
+
+        segments_iter, info = BatchedInferencePipeline(model=model).transcribe(file_path, language=language, **options)
+    else:
+        segments_iter, info = model.transcribe(file_path, language=language, **options)
+    raw = [(seg.start, seg.end, (seg.text or "").strip()) for seg in segments_iter]
+    return raw, getattr(info, "language", None), getattr(info, "duration", None)
+
+
+def submit_clip(file_path: str, profile: Optional[str] = None) -> Optional[Future]:
+    """Queue a short clip on this process's batcher; None when it takes ``transcribe_media``.
+
+    The future resolves to raw results for ``media_transcript`` (or None: use
+    ``transcribe_media`` after all). Await it off the executors, so waiting for
+    the batch does not hold a CPU thread.
+    """
+    if model_server_enabled():
+        return None  # the model server batches clips itself
+    return clip_batcher.submit(file_path, profile)
+
+
+def media_transcript(raw: RawSegments, language: Optional[str], duration: Optional[float]):
+    segments = [TranscriptSegment(start=start, end=end, text=text) for start, end, text in raw]
+    full_text = " ".join(text for _, _, text in raw if text).strip()
+    return full_text, segments, language, duration
+
+
+@stage_timer("transcribe")
+def transcribe_media(file_path: str, profile: Optional[str] = None):
+    get_profile(profile)  # reject unknown names before any decoding
     _verify_media_readable(file_path)
+    if model_server_enabled():
+        with model_host_errors():
+            raw, language, duration = get_model_host().transcribe(os.path.abspath(file_path), profile, current_traceparent())
+    else:
+        raw, language, duration = whisper_transcribe(file_path, profile)
+    return media_transcript(raw, language, duration)
+
+
+def warm_transcriber() -> None:
+    """Load Whisper where transcription will run (model server or this process)."""
+    if model_server_enabled():
+        with model_host_errors():
+            get_model_host().warm()
+    else:
+        get_whisper_model()
+
+
+def whisper_models() -> dict:
+    """Active, loaded and pinned Whisper models where transcription runs."""
+    if model_server_enabled():
+        with model_host_errors():
+            return get_model_host().models()
+    return {"clip_batching": clip_batcher.stats(), **model_registry.status()}
+
+
+def switch_whisper_model(name: str) -> dict:
+    """Make ``name`` the model for new transcriptions, without a restart."""
     try:
-        # Faster defaults + configurable knobs from settings
-        from backend.app.config import settings
-        segments_iter, info = model.transcribe(
-            file_path,
-            beam_size=getattr(settings, 'whisper_beam_size', 1),
-            vad_filter=True,
-            vad_parameters={"min_silence_duration_ms": 250},
-            word_timestamps=False,
-            condition_on_previous_text=False,
-            chunk_length=getattr(settings, 'whisper_chunk_length', 30),
-            language=getattr(settings, 'whisper_language', None) or None,
-            task="transcribe",
-            temperature=0.0,
-        )
-    except ValueError:
-        # Fallback if language auto-detection fails on some inputs
-        segments_iter, info = model.transcribe(
-            file_path,
-            beam_size=getattr(settings, 'whisper_beam_size', 1),
-            vad_filter=True,
-            vad_parameters={"min_silence_duration_ms": 250},
-            language=getattr(settings, 'whisper_language', 'en') or 'en',
-            word_timestamps=False,
-            condition_on_previous_text=False,
-            chunk_length=getattr(settings, 'whisper_chunk_length', 30),
-            task="transcribe",
-            temperature=0.0,
-        )
-    segments: List[TranscriptSegment] = []
-    texts: List[str] = []
-    for seg in segments_iter:
-        text_clean = (seg.text or "").strip()
-        segments.append(TranscriptSegment(start=seg.start, end=seg.end, text=text_clean))
-        if text_clean:
-            texts.append(text_clean)
-    full_text = " ".join(texts).strip()
-    return full_text, segments, getattr(info, "language", None), getattr(info, "duration", None)
+        # Refuse unknown/unpinned names before anything is evicted
+        resolve_model(name)
+    except ModelIntegrityError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if model_server_enabled():
+        with model_host_errors():
+            return get_model_host().switch(name)
+    model_registry.switch(name)
+    return model_registry.status()
 
 def _verify_media_readable(src_path: str) -> None:
     """Lightweight check that ffmpeg/ffprobe can read the file without creating new artifacts."""
     try:
         import subprocess, shlex
         cmd = f"ffprobe -v error -show_format -show_streams -of json {shlex.quote(src_path)}"
-        subprocess.run(cmd, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        run_subprocess(cmd, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
     except Exception:
         # Don't block; whisper will attempt decode. This avoids creating extra files per user's request.
         pass
@@ -194,22 +211,65 @@ def is_document_file(name_lower: str, mime: str) -> bool:
     )
 
 
-def extract_document_text(temp_path: str, name_lower: str, mime: str) -> str:
+def iter_document_text(temp_path: str, name_lower: str, mime: str) -> Iterator[Tuple[int, str]]:
+    """Yield (page_index, text) as pages become ready; non-paged documents yield once."""
+    kind = paged_kind(name_lower, mime)
+    if kind is not None:
+        for idx, text in iter_document_pages(temp_path, kind):
+            if text.strip():
+                yield idx, text.strip()
+        return
+    yield 0, extract_document_text(temp_path, name_lower, mime)
+
+
+def document_kind(name_lower: str, mime: str) -> str:
+    """Name of the extractor that handles this document."""
     if name_lower.endswith(".pdf") or mime.startswith("application/pdf"):
-        return extract_text_from_pdf(temp_path)
+        return "pdf"
     if name_lower.endswith(".docx") or "officedocument.wordprocessingml.document" in mime:
-        return extract_text_from_docx(temp_path)
+        return "docx"
     if name_lower.endswith(".rtf") or mime in ("application/rtf", "text/rtf"):
-        return extract_text_from_rtf(temp_path)
+        return "rtf"
     if name_lower.endswith(".html") or name_lower.endswith(".htm") or mime == "text/html":
-        return extract_text_from_html(temp_path)
+        return "html"
     if name_lower.endswith(".md") or name_lower.endswith(".markdown") or mime == "text/markdown":
-        return extract_text_from_markdown(temp_path)
+        return "markdown"
     if name_lower.endswith(".pptx") or mime == "application/vnd.openxmlformats-officedocument.presentationml.presentation":
-        return extract_text_from_pptx(temp_path)
+        return "pptx"
     if name_lower.endswith(".csv") or mime in ("text/csv", "application/csv"):
-        return extract_text_from_csv(temp_path)
-    # subtitles and any other text-like
-    return extract_text_from_txt(temp_path)
-
-
+        return "csv"
+    if is_subtitle_file(name_lower, mime):
+        return "subtitle"
+    # any other text-like
+    return "txt"
+
+
+def extract_text_from_subtitle(file_path: str) -> str:
+    return extract_subtitle_text(file_path) or extract_text_from_txt(file_path)
+
+
+_EXTRACTORS = {
+    "pdf": extract_text_from_pdf,
+    "docx": extract_text_from_docx,
+    "rtf": extract_text_from_rtf,
+    "html": extract_text_from_html,
+    "markdown": extract_text_from_markdown,
+    "pptx": extract_text_from_pptx,
+    "csv": extract_text_from_csv,
+    "subtitle": extract_text_from_subtitle,
+    "txt": extract_text_from_txt,
+}
+
+
+def extract_document_text(temp_path: str, name_lower: str, mime: str, digest: Optional[str] = None) -> str:
+    """Extract document text, served from the on-disk cache when the same content was seen before."""
+    kind = document_kind(name_lower, mime)
+    if not settings.extraction_cache_enabled:
+        return _EXTRACTORS[kind](temp_path)
+    digest = digest or file_sha256(temp_path)
+    cached = extraction_cache.get(digest, kind)
+    if cached is not None:
+        return cached
+    text = _EXTRACTORS[kind](temp_path)
+    extraction_cache.put(digest, kind, text)
+    return text
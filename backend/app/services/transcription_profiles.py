@@ -0,0 +1,176 @@
+"""
+Named Whisper decoding profiles and the one-shot language probe
+
+A profile trades speed for accuracy per request: ``draft`` for previews
+(batched decoding, greedy search, aggressive VAD that skips more silence),
+``balanced`` for the previous defaults from Settings, ``final`` for exports
+(beam search, temperature fallback, conservative VAD). Each may name its own
+model; with different models per profile set WHISPER_MAX_LOADED=2 so the
+registry does not reload on every switch.
+
+The language is decided once, from the first ``WHISPER_LANGUAGE_PROBE_SECONDS``
+of audio, and then passed to the decoder, instead of letting Whisper detect it
+inside the full transcription and retrying from scratch when that fails.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import subprocess
+
+from fastapi import HTTPException
+
+from backend.app.config import settings
+from backend.utils.tracing import run_subprocess
+
+DRAFT = "draft"
+BALANCED = "balanced"
+FINAL = "final"
+
+
+@dataclass(frozen=True)
+class TranscriptionProfile:
+    name: str
+    model: Optional[str]  # None = the registry's active model
+    beam_size: int
+    best_of: int
+    patience: float
+    temperature: Tuple[float, ...]
+    condition_on_previous_text: bool
+    vad_threshold: float  # speech probability; higher = more audio skipped
+    vad_min_silence_ms: int
+    chunk_length: int
+    batch_size: int  # > 1 decodes VAD chunks in parallel (BatchedInferencePipeline)
+
+    def decode_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {
+            "beam_size": self.beam_size,
+            "best_of": self.best_of,
+            "patience": self.patience,
+            "temperature": list(self.temperature) if len(self.temperature) > 1 else self.temperature[0],
+            "condition_on_previous_text": self.condition_on_previous_text,
+            "vad_filter": True,
+            "vad_parameters": {"threshold": self.vad_threshold, "min_silence_duration_ms": self.vad_min_silence_ms},
+            "chunk_length": self.chunk_length,
+            "word_timestamps": False,
+            "task": "transcribe",
+        }
+        if self.batch_size > 1:
+            options["batch_size"] = self.batch_size
+        return options
+
+
+def _profiles() -> Dict[str, TranscriptionProfile]:
+    return {
+        DRAFT: TranscriptionProfile(
+            name=DRAFT,
+            model=settings.whisper_draft_model,
+            beam_size=1,
+            best_of=1,
+            patience=1.0,
+            temperature=(0.0,),
+            condition_on_previous_text=False,
+            vad_threshold=0.6,
+            vad_min_silence_ms=500,
+            chunk_length=30,
+            batch_size=8,
+        ),
+        BALANCED: TranscriptionProfile(
+            name=BALANCED,
+            model=None,
+            beam_size=settings.whisper_beam_size,
+            best_of=1,
+            patience=1.0,
+            temperature=(0.0,),
+            condition_on_previous_text=False,
+            vad_threshold=0.5,
+            vad_min_silence_ms=250,
+            chunk_length=settings.whisper_chunk_length,
+            batch_size=1,
+        ),
+        FINAL: TranscriptionProfile(
+            name=FINAL,
+            model=settings.whisper_final_model,
+            beam_size=5,
+            best_of=5,
+            patience=1.0,
+            temperature=(0.0, 0.2, 0.4, 0.6, 0.8),
+            condition_on_previous_text=True,
+            vad_threshold=0.35,
+            vad_min_silence_ms=250,
+            chunk_length=30,
+            batch_size=1,
+        ),
+    }
+
+
+PROFILES = _profiles()
+
+
+def get_profile(name: Optional[str] = None) -> TranscriptionProfile:
+    name = (name or settings.whisper_default_profile).lower()
+    profile = PROFILES.get(name)
+    if profile is None:
+        raise HTTPException(status_code=400, detail=f"Unknown transcription profile '{name}'. Use one of: {', '.join(PROFILES)}")
+    return profile
+
+
+def _decode_head(file_path: str, seconds: float):
+    """First ``seconds`` of audio as 16 kHz mono float32"""
+    import numpy as np
+
+    try:
+        proc = run_subprocess(
+            ["ffmpeg", "-nostdin", "-v", "error", "-t", str(seconds), "-i", file_path,
+             "-f", "s16le", "-ac", "1", "-ar", "16000", "-"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=60,
+        )
+        if proc.returncode == 0 and proc.stdout:
+            return np.frombuffer(proc.stdout, np.int16).astype(np.float32) / 32768.0
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+    # No ffmpeg on PATH: decode with PyAV (bundled with faster-whisper), stopping
+    # after the first ``seconds`` instead of decoding the whole file
+    import av
+
+    needed = int(seconds * 16000)
+    resampler = av.audio.resampler.AudioResampler(format="s16", layout="mono", rate=16000)
+    chunks = []
+    got = 0
+    with av.open(file_path) as container:
+        for frame in container.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                chunk = resampled.to_ndarray().reshape(-1)
+                chunks.append(chunk)
+                got += len(chunk)
+            if got >= needed:
+                break
+    if not chunks:
+        return np.zeros(0, np.float32)
+    return np.concatenate(chunks)[:needed].astype(np.float32) / 32768.0
+
+
+def detect_audio_language(model, audio) -> Optional[str]:
+    """Language of already-decoded audio (its first seconds), or None when undecided"""
+    if settings.whisper_language:
+        return settings.whisper_language
+    if not model.model.is_multilingual:
+        return "en"
+    head = audio[: int(settings.whisper_language_probe_seconds * 16000)]
+    if not len(head):
+        return None
+    try:
+        language, _probability, _ = model.detect_language(head, vad_filter=True)
+        return language
+    except Exception:
+        return None
+
+
+def probe_language(model, file_path: str) -> Optional[str]:
+    """Language of the first seconds of speech, or None when it cannot be decided"""
+    if settings.whisper_language or not model.model.is_multilingual:
+        return detect_audio_language(model, [])
+    try:
+        audio = _decode_head(file_path, settings.whisper_language_probe_seconds)
+    except Exception:
+        return None
+    return detect_audio_language(model, audio)
@@ -0,0 +1,137 @@
+"""Single-pass upload ingestion: spool to disk, hash and size-check in one read.
+
+Every upload route goes through ``spool_upload`` so the body is copied once,
+its SHA-256 is known without a second read (used by the extraction cache), and
+oversized files are rejected as soon as they cross the limit for their kind.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import hashlib
+import os
+import tempfile
+
+from fastapi import HTTPException, UploadFile
+
+from backend.app.config import settings
+from backend.utils.metrics import stage_timer
+
+
+DOCUMENT = "document"
+MEDIA = "media"
+
+_CHUNK = 1024 * 1024
+
+# (offset, signature, kind, content type). Checked in order; first match wins.
+# The content type names the document extractor the signature implies; None
+# for zip containers, which could be docx, pptx or anything else. Every media
+# signature decodes through ffmpeg, so media entries need none.
+_MAGIC = (
+    (0, b"%PDF-", DOCUMENT, "application/pdf"),
+    (0, b"PK\x03\x04", DOCUMENT, None),  # docx / pptx (zip containers)
+    (0, b"{\\rtf", DOCUMENT, "application/rtf"),
+    (0, b"WEBVTT", DOCUMENT, "text/vtt"),
+    (4, b"ftyp", MEDIA, None),  # mp4 / mov / m4a / 3gp
+    (0, b"\x1a\x45\xdf\xa3", MEDIA, None),  # mkv / webm
+    (0, b"\x30\x26\xb2\x75", MEDIA, None),  # asf / wmv / wma
+    (0, b"FLV", MEDIA, None),
+    (0, b"OggS", MEDIA, None),
+    (0, b"fLaC", MEDIA, None),
+    (0, b"ID3", MEDIA, None),
+    (0, b"\xff\xfb", MEDIA, None),  # mp3 frame sync
+    (0, b"\xff\xf1", MEDIA, None),  # aac adts
+    (0, b"\xff\xf9", MEDIA, None),
+)
+
+
+@dataclass
+class SpooledUpload:
+    path: str
+    size: int
+    sha256: str
+    kind: str
+    sniffed: Optional[str] = None
+    # Content type implied by the magic bytes, when they pin down a document extractor
+    mime: Optional[str] = None
+
+
+def sniff_type(head: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """Classify the first bytes of a file as (kind, document content type), if recognisable."""
+    if head[:4] == b"RIFF" and head[8:12] in (b"AVI ", b"WAVE"):
+        return MEDIA, None
+    for offset, signature, kind, mime in _MAGIC:
+        if head[offset:offset + len(signature)] == signature:
+            return kind, mime
+    return None, None
+
+
+def _handled(kind: str, mime: Optional[str]) -> bool:
+    """Whether a sniffed type maps to a concrete extractor (ffmpeg for all media)."""
+    return kind == MEDIA or mime is not None
+
+
+def max_upload_bytes(kind: str) -> int:
+    limit_mb = settings.upload_max_document_mb if kind == DOCUMENT else settings.upload_max_media_mb
+    return limit_mb * 1024 * 1024
+
+
+def _too_large(kind: str) -> HTTPException:
+    limit_mb = settings.upload_max_document_mb if kind == DOCUMENT else settings.upload_max_media_mb
+    return HTTPException(status_code=413, detail=f"Upload exceeds the {limit_mb} MB limit for {kind} files")
+
+
+@stage_timer("upload_spool")
+def spool_upload(upload: UploadFile, kind: str = MEDIA, dest_path: Optional[str] = None,
+                 media_only: bool = False) -> SpooledUpload:
+    """Copy ``upload`` to ``dest_path`` (or a temp file) while hashing it.
+
+    ``kind`` is the caller's guess from the filename / content type. When magic
+    sniffing is enabled and the first bytes map to a supported extractor, the
+    sniffed kind wins; an ambiguous signature (a zip that could be anything)
+    keeps the declared kind.
+    With ``media_only`` (uploads into the video library) content that sniffs
+    as a document is rejected with 415 instead.
+    The file is written next to its destination and renamed into place only
+    once complete, so a rejected upload never leaves a partial file behind.
+    """
+    declared = getattr(upload, "size", None)
+    if declared is not None and declared > max(max_upload_bytes(DOCUMENT), max_upload_bytes(MEDIA)):
+        raise _too_large(kind)
+
+    suffix = os.path.splitext(upload.filename or "uploaded")[1]
+    tmp_dir = os.path.dirname(dest_path) if dest_path else None
+    tmp_fd, tmp_path = tempfile.mkstemp(suffix=suffix if not dest_path else ".part", dir=tmp_dir)
+    digest = hashlib.sha256()
+    size = 0
+    sniffed: Optional[str] = None
+    sniffed_mime: Optional[str] = None
+    limit = max_upload_bytes(kind)
+    try:
+        with os.fdopen(tmp_fd, "wb") as out_f:
+            first = True
+            for block in iter(lambda: upload.file.read(_CHUNK), b""):
+                if first:
+                    first = False
+                    if settings.upload_sniff_magic:
+                        sniffed, sniffed_mime = sniff_type(block[:16])
+                        if sniffed is not None and _handled(sniffed, sniffed_mime):
+                            kind = sniffed
+                            limit = max_upload_bytes(kind)
+                    if media_only and kind != MEDIA:
+                        raise HTTPException(status_code=415, detail="The uploaded file is a document, not a video")
+                size += len(block)
+                if size > limit:
+                    raise _too_large(kind)
+                digest.update(block)
+                out_f.write(block)
+        if dest_path:
+            os.replace(tmp_path, dest_path)
+            tmp_path = dest_path
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return SpooledUpload(path=tmp_path, size=size, sha256=digest.hexdigest(), kind=kind, sniffed=sniffed,
+                         mime=sniffed_mime if kind == DOCUMENT else None)
@@ -1,15 +1,17 @@
 import os
-import shutil
-import subprocess
 from datetime import datetime
 from typing import List, Tuple
 
 from fastapi import UploadFile, HTTPException
 
+from backend.app.services.upload_ingest import MEDIA, spool_upload
+from backend.utils.metrics import stage_timer
+from backend.utils.tracing import run_subprocess
+
 
 def ensure_ffmpeg_available() -> None:
     try:
-        subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
+        run_subprocess(["ffmpeg", "-version"], capture_output=True, check=True)
     except Exception:
         raise HTTPException(status_code=500, detail="FFmpeg is not available on the server PATH")
 
@@ -28,12 +30,24 @@ def save_video_to_dated_folder(file: UploadFile) -> Tuple[str, str]:
         name, ext = os.path.splitext(safe_name)
         dest_path = os.path.join(original_dir, f"{name}_{now.strftime('%H%M%S')}{ext}")
 
-    with open(dest_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-
+    spool_upload(file, kind=MEDIA, dest_path=dest_path, media_only=True)
     return dest_path, base_dir
 
 
+def trim_command(source_path: str, start_s: float, end_s: float, out_path: str, copy: bool = True) -> List[str]:
+    """ffmpeg command for one clip: keyframe-aligned stream copy, or an exact re-encode"""
+    if copy:
+        return [
+            "ffmpeg", "-ss", str(start_s), "-to", str(end_s), "-i", source_path,
+            "-c", "copy", "-movflags", "+faststart", "-avoid_negative_ts", "1", "-y", out_path
+        ]
+    return [
+        "ffmpeg", "-i", source_path, "-ss", str(start_s), "-t", str(end_s - start_s),
+        "-c:v", "libx264", "-c:a", "aac", "-y", out_path
+    ]
+
+
+@stage_timer("ffmpeg_trim")
 def trim_clips(source_path: str, clips: List[Tuple[float, float]], base_dir: str) -> List[str]:
     ensure_ffmpeg_available()
     clips_dir = os.path.join(base_dir, "clips")
@@ -48,18 +62,10 @@ def trim_clips(source_path: str, clips: List[Tuple[float, float]], base_dir: str
         out_path = os.path.join(clips_dir, out_name)
 
         # Try fast stream copy when possible
-        copy_cmd = [
-            "ffmpeg", "-ss", str(start_s), "-to", str(end_s), "-i", source_path,
-            "-c", "copy", "-movflags", "+faststart", "-avoid_negative_ts", "1", "-y", out_path
-        ]
-        result = subprocess.run(copy_cmd, capture_output=True, text=True)
+        result = run_subprocess(trim_command(source_path, start_s, end_s, out_path, copy=True), capture_output=True, text=True)
         if result.returncode != 0 or (not os.path.exists(out_path)):
             # Fallback to re-encode
-            cmd = [
-                "ffmpeg", "-i", source_path, "-ss", str(start_s), "-t", str(end_s - start_s),
-                "-c:v", "libx264", "-c:a", "aac", "-y", out_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = run_subprocess(trim_command(source_path, start_s, end_s, out_path, copy=False), capture_output=True, text=True)
             if result.returncode != 0:
                 raise HTTPException(status_code=500, detail=f"FFmpeg failed for clip {idx+1}: {result.stderr[:200]}")
         created.append(out_path)
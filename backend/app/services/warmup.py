@@ -0,0 +1,54 @@
+"""
+Explicit warm-up for lazily loaded dependencies
+
+Heavy client libraries and the Whisper model are imported/loaded on first
+use so cold starts stay fast (STARTUP_MODE=lazy). ``warm_up`` pays those
+costs up front, either from the startup hook (STARTUP_MODE=eager) or on
+demand via ``POST /api/warmup`` (e.g. from a deploy hook before traffic).
+"""
+
+from typing import Callable, Dict, Iterable, Optional
+import importlib
+import time
+
+from backend.app.services.transcription import warm_transcriber
+
+# Component -> modules imported to warm it
+HEAVY_MODULES: Dict[str, tuple] = {
+    "documents": ("pypdf", "docx", "pptx", "bs4", "markdown_it", "chardet"),
+    "gemini": ("google.generativeai",),
+    "youtube": ("googleapiclient.discovery", "google_auth_oauthlib.flow", "google.oauth2.credentials"),
+}
+
+# Components that need more than imports. Whisper is loaded where
+# transcription runs (the shared model server under gunicorn).
+_LOADERS: Dict[str, Callable[[], None]] = {
+    "whisper": warm_transcriber,
+}
+
+COMPONENTS = tuple(_LOADERS) + tuple(HEAVY_MODULES)
+
+
+def _import_all(modules: Iterable[str]) -> None:
+    for name in modules:
+        importlib.import_module(name)
+
+
+def warm_up(components: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, object]]:
+    """Load the given components (all by default); per-component timing and errors."""
+    results: Dict[str, Dict[str, object]] = {}
+    for component in components or COMPONENTS:
+        if component not in COMPONENTS:
+            results[component] = {"ok": False, "error": "unknown component"}
+            continue
+        started = time.perf_counter()
+        try:
+            if component in _LOADERS:
+                _LOADERS[component]()
+            else:
+                _import_all(HEAVY_MODULES[component])
+            results[component] = {"ok": True}
+        except Exception as e:
+            results[component] = {"ok": False, "error": getattr(e, "detail", None) or str(e)}
+        results[component]["seconds"] = round(time.perf_counter() - started, 3)
+    return results
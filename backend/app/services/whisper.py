@@ -1,43 +1,56 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from fastapi import HTTPException
 import os
 
-try:
+from backend.app.config import settings
+from backend.app.services.model_registry import ModelIntegrityError, ModelRegistry, resolve_model
+
+if TYPE_CHECKING:
     from faster_whisper import WhisperModel
-except Exception:
-    WhisperModel = None  # type: ignore
 
-from backend.app.config import settings
+# faster_whisper (ctranslate2, onnxruntime, av) is imported with the first
+# model load, not at startup
 
 
-_whisper_model: Optional[WhisperModel] = None
+def get_whisper_model(name: Optional[str] = None) -> "WhisperModel":
+    """The active model (or ``name``), loaded once per process; concurrent
+    first requests wait on the registry lock instead of loading twice."""
+    return model_registry.get(name)
 
 
-def get_whisper_model() -> WhisperModel:
-    global _whisper_model
-    if WhisperModel is None:
+def _load_model(name: str) -> "WhisperModel":
+    try:
+        from faster_whisper import WhisperModel
+    except Exception:
         raise HTTPException(status_code=500, detail="faster-whisper is not installed on the server")
-    if _whisper_model is None:
-        # Auto-optimize defaults for speed if not explicitly set
-        device = settings.whisper_device or "auto"
-        compute_type = settings.whisper_compute_type or "auto"
-        # Prefer GPU when available
-        if device == "auto":
-            # ctranslate2 uses "cuda" for NVIDIA GPUs
-            device = "cuda" if os.environ.get("CUDA_VISIBLE_DEVICES", "") != "" else "cpu"
-        # Use int8 quantization on CPU for speed; float16 on GPU
-        if compute_type == "auto":
-            compute_type = "float16" if device == "cuda" else "int8"
-        extra: dict = {}
-        # Allow threading tuning for CPU
-        if settings.whisper_cpu_threads and settings.whisper_cpu_threads > 0:
-            extra["cpu_threads"] = settings.whisper_cpu_threads
-        _whisper_model = WhisperModel(
-            settings.whisper_model,
-            device=device,
-            compute_type=compute_type,
-            **extra,
-        )
-    return _whisper_model
+    try:
+        model_path = resolve_model(name)
+    except ModelIntegrityError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    # Auto-optimize defaults for speed if not explicitly set
+    device = settings.whisper_device or "auto"
+    compute_type = settings.whisper_compute_type or "auto"
+    # Prefer GPU when available
+    if device == "auto":
+        # ctranslate2 uses "cuda" for NVIDIA GPUs
+        device = "cuda" if os.environ.get("CUDA_VISIBLE_DEVICES", "") != "" else "cpu"
+    # Use int8 quantization on CPU for speed; float16 on GPU
+    if compute_type == "auto":
+        compute_type = "float16" if device == "cuda" else "int8"
+    extra: dict = {}
+    # Allow threading tuning for CPU
+    if settings.whisper_cpu_threads and settings.whisper_cpu_threads > 0:
+        extra["cpu_threads"] = settings.whisper_cpu_threads
+    return WhisperModel(
+        model_path,
+        device=device,
+        compute_type=compute_type,
+        # Parallel transcriptions share this one copy of the weights
+        num_workers=max(1, settings.model_server_concurrency),
+        **extra,
+    )
+
+
+model_registry = ModelRegistry(settings.whisper_model, _load_model, max_loaded=settings.whisper_max_loaded)
 
 
@@ -3,16 +3,26 @@
 Industry-standard FastAPI application with YouTube automation
 """
 
+import asyncio
+from typing import Optional
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 # Import routers
-from backend.routers import videos, captions, youtube, utils, video_management
+from backend.routers import videos, captions, youtube, utils, video_management, profiles
 from backend.app.routers import transcript as app_transcript, story as app_story
 from fastapi import Request
 from backend.app.services.llm import generate_chat_response
-from backend.app.services.whisper import get_whisper_model
+from backend.app.config import settings
+from backend.app.services.warmup import COMPONENTS, warm_up
+from backend.utils.executors import CPU, DISK, NETWORK, run_blocking, shutdown_executors
+from backend.utils.metrics import MetricsMiddleware, registry as metrics_registry
+from backend.utils.tracing import TracingMiddleware, exporter as trace_exporter
+from backend.utils.profiling import ProfilingMiddleware
+from backend.utils.loop_monitor import loop_monitor
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -21,6 +31,15 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Per-route latency histograms for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Sampled request traces (TRACE_SAMPLE_RATIO); added after metrics so the server span wraps it
+app.add_middleware(TracingMiddleware)
+
+# Admin-only ?profile=1 captures (PROFILE_ADMIN_TOKEN); wraps tracing and metrics so they are profiled too
+app.add_middleware(ProfilingMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -42,17 +61,53 @@ app.include_router(captions.router)  # Already has /api/captions prefix
 app.include_router(youtube.router)  # Already has /api/youtube prefix
 app.include_router(utils.router)  # Already has /api prefix
 app.include_router(video_management.router)  # Already has /video prefix
+app.include_router(profiles.router)  # Already has /api/admin/profiles prefix
 app.include_router(app_transcript.router, prefix="/api/transcript")
 app.include_router(app_story.router, prefix="/api")
 
-# Warm-up: initialize Whisper on startup to avoid first-request lag
+# Warm-up: with STARTUP_MODE=eager, initialize Whisper (in the shared model
+# server when running under gunicorn, so it loads once) and the heavy client
+# libraries on startup to avoid first-request lag. Runs in the background so
+# worker boot does not wait for the model. STARTUP_MODE=lazy skips this for
+# fast cold starts; POST /api/warmup does it on demand.
+_background_tasks = set()
+
+@app.on_event("startup")
+async def _start_warmup():
+    if settings.startup_mode != "eager":
+        return
+    # warm_up reports failures per component; health and /transcript/health report details
+    task = asyncio.get_running_loop().create_task(run_blocking(CPU, warm_up))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+@app.post("/api/warmup")
+async def warmup(components: Optional[str] = None):
+    """Load lazily imported dependencies now (comma-separated components, default all)"""
+    selected = [c.strip() for c in components.split(",") if c.strip()] if components else list(COMPONENTS)
+    results = await run_blocking(CPU, warm_up, selected)
+    return {"success": all(r["ok"] for r in results.values()), "components": results}
+
+# Report handlers that block the event loop (LOOP_BLOCK_WARN_MS, 0 disables)
+@app.on_event("startup")
+async def _start_loop_monitor():
+    loop_monitor.start(asyncio.get_running_loop())
+
+# Prometheus scrape target; merges every gunicorn worker when METRICS_DIR is set
 @app.on_event("startup")
-async def _warm_whisper_model():
-    try:
-        _ = get_whisper_model()
-    except Exception:
-        # Do not block app startup; health and /transcript/health will report details
-        pass
+async def _start_metrics_flusher():
+    metrics_registry.start_flusher()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body = await run_blocking(DISK, metrics_registry.render)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.on_event("shutdown")
+async def _stop_executors():
+    loop_monitor.stop()
+    shutdown_executors()
+    trace_exporter.shutdown()
 
 # Simple chat endpoint at /chat for the frontend
 @app.post("/chat")
@@ -90,7 +145,7 @@ async def chat(payload: dict):
         " respond with: 'This assistant is focused on YouTube automation and app features.'"
     )
     hint = (default_scope_hint + ("\n\nExtra context: " + user_hint if user_hint else ""))
-    reply = generate_chat_response(message, hint)
+    reply = await run_blocking(NETWORK, generate_chat_response, message, hint)
     return {"reply": reply}
 
 # Root endpoint - API info
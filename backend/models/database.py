@@ -4,12 +4,21 @@ Database models and operations for Video Caption Generator
 
 import os
 import json
+import tempfile
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from datetime import datetime
 
+from backend.utils.file_lock import file_lock
+from backend.utils.metrics import stage_timer
+
 class Database:
-    """Simple JSON-based database for storing caption data"""
+    """Simple JSON-based database for storing caption data
+
+    Every load-modify-save runs under ``file_lock`` so concurrent writers
+    (executor threads, other worker processes) never drop each other's
+    updates. Readers need no lock: saves swap the file in atomically.
+    """
     
     def __init__(self, db_path: str = None):
         self.db_path = db_path or "data/captions_database.json"
@@ -21,7 +30,9 @@ class Database:
         db_path.parent.mkdir(parents=True, exist_ok=True)
         
         if not db_path.exists():
-            self._create_empty_db()
+            with file_lock(self.db_path):
+                if not db_path.exists():
+                    self._create_empty_db()
     
     def _create_empty_db(self):
         """Create empty database structure"""
@@ -34,6 +45,7 @@ class Database:
         }
         self._save_db(empty_db)
     
+    @stage_timer("db_load")
     def _load_db(self) -> Dict[str, Any]:
         """Load database from file"""
         try:
@@ -43,10 +55,21 @@ class Database:
             self._create_empty_db()
             return self._load_db()
     
+    @stage_timer("db_save")
     def _save_db(self, data: Dict[str, Any]):
-        """Save database to file"""
-        with open(self.db_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """Save database to file (written to a temp file, then atomically swapped in)"""
+        db_dir = os.path.dirname(os.path.abspath(self.db_path))
+        fd, tmp_path = tempfile.mkstemp(dir=db_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.db_path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
     
     def get_caption(self, video_id: str) -> Optional[Dict[str, Any]]:
         """Get caption data for a video"""
@@ -56,28 +79,54 @@ class Database:
     def save_caption(self, video_id: str, caption_data: Dict[str, Any]) -> bool:
         """Save caption data for a video"""
         try:
-            db = self._load_db()
-            db["captions"][video_id] = {
-                **caption_data,
-                "updated_at": datetime.now().isoformat()
-            }
-            self._save_db(db)
+            with file_lock(self.db_path):
+                db = self._load_db()
+                db["captions"][video_id] = {
+                    **caption_data,
+                    "updated_at": datetime.now().isoformat()
+                }
+                self._save_db(db)
             return True
         except Exception:
             return False
     
+    def save_captions(self, captions: Dict[str, Dict[str, Any]]) -> int:
+        """Save many captions with a single load and a single write"""
+        if not captions:
+            return 0
+        with file_lock(self.db_path):
+            db = self._load_db()
+            updated_at = datetime.now().isoformat()
+            for video_id, caption_data in captions.items():
+                db["captions"][video_id] = {
+                    **caption_data,
+                    "updated_at": updated_at
+                }
+            self._save_db(db)
+        return len(captions)
+    
     def delete_caption(self, video_id: str) -> bool:
         """Delete caption data for a video"""
         try:
-            db = self._load_db()
-            if video_id in db["captions"]:
-                del db["captions"][video_id]
-                self._save_db(db)
-                return True
+            with file_lock(self.db_path):
+                db = self._load_db()
+                if video_id in db["captions"]:
+                    del db["captions"][video_id]
+                    self._save_db(db)
+                    return True
             return False
         except Exception:
             return False
     
+    def delete_captions(self, video_ids: List[str]) -> int:
+        """Delete many captions with a single load and a single write"""
+        with file_lock(self.db_path):
+            db = self._load_db()
+            removed = [video_id for video_id in video_ids if db["captions"].pop(video_id, None) is not None]
+            if removed:
+                self._save_db(db)
+        return len(removed)
+    
     def list_captions(self) -> Dict[str, Dict[str, Any]]:
         """List all captions"""
         db = self._load_db()
@@ -6,6 +6,9 @@ from dataclasses import dataclass
 from typing import Optional, List
 from pathlib import Path
 
+from backend.utils.slots import add_slots
+
+@add_slots
 @dataclass
 class VideoInfo:
     """Video metadata structure"""
@@ -13,10 +16,16 @@ class VideoInfo:
     description: str
     topic: str
     file_path: Optional[str] = None
-    duration: Optional[str] = None
+    duration: Optional[float] = None  # seconds, filled by ffprobe
     size: Optional[int] = None
     has_caption: bool = False
     caption_file_path: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+    bitrate: Optional[int] = None
+    keyframe_interval: Optional[float] = None
     
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization"""
@@ -28,7 +37,13 @@ class VideoInfo:
             "duration": self.duration,
             "size": self.size,
             "has_caption": self.has_caption,
-            "caption_file_path": self.caption_file_path
+            "caption_file_path": self.caption_file_path,
+            "width": self.width,
+            "height": self.height,
+            "video_codec": self.video_codec,
+            "audio_codec": self.audio_codec,
+            "bitrate": self.bitrate,
+            "keyframe_interval": self.keyframe_interval
         }
     
     @classmethod
@@ -36,6 +51,11 @@ class VideoInfo:
         """Create from dictionary"""
         return cls(**data)
 
+def create_video_id(video_info: VideoInfo) -> str:
+    """Database key for a video's caption"""
+    return f"{video_info.title}_{video_info.topic}".replace(" ", "_").lower()
+
+@add_slots
 @dataclass
 class CaptionTemplate:
     """Caption template structure"""
@@ -53,6 +73,7 @@ class CaptionTemplate:
             "hashtag_sets": self.hashtag_sets
         }
 
+@add_slots
 @dataclass
 class CaptionResult:
     """Result of caption generation"""
@@ -2,11 +2,13 @@
 Caption management router
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, Literal, Optional
 from backend.services.caption_service import CaptionService
 from backend.models.database import Database
+from backend.utils.executors import DISK, run_blocking
+from backend.utils.pagination import paginate, ndjson_response
 
 router = APIRouter(prefix="/api/captions", tags=["captions"])
 
@@ -26,7 +28,8 @@ class CaptionRequest(BaseModel):
 async def generate_captions(request: VideoRequest):
     """Generate captions for videos"""
     try:
-        results = caption_service.generate_captions_for_directory(
+        results = await run_blocking(
+            DISK, caption_service.generate_captions_for_directory,
             request.directory, request.template
         )
         return {
@@ -41,7 +44,7 @@ async def generate_captions(request: VideoRequest):
 async def regenerate_caption(request: CaptionRequest):
     """Regenerate caption for specific video"""
     try:
-        caption = caption_service.regenerate_caption(request.video_title, request.template)
+        caption = await run_blocking(DISK, caption_service.regenerate_caption, request.video_title, request.template)
         
         if caption:
             return {
@@ -57,7 +60,7 @@ async def regenerate_caption(request: CaptionRequest):
 async def delete_caption(request: CaptionRequest):
     """Delete caption for specific video"""
     try:
-        success = caption_service.delete_caption(request.video_title)
+        success = await run_blocking(DISK, caption_service.delete_caption, request.video_title)
         return {
             "success": success,
             "message": "Caption deleted" if success else "Caption not found"
@@ -66,13 +69,22 @@ async def delete_caption(request: CaptionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/list")
-async def list_captions():
+async def list_captions(limit: Optional[int] = Query(default=None, ge=1, description="Page size (omit for all captions)"),
+                        cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+                        format: Literal["json", "ndjson"] = Query(default="json")):
     """List all videos with captions"""
     try:
-        captions = caption_service.list_captioned_videos()
+        captions = await run_blocking(DISK, caption_service.list_captioned_videos)
+        page = paginate(captions, key=lambda video_id: video_id, cursor=cursor, limit=limit)
+        if format == "ndjson":
+            return ndjson_response(({"video_id": video_id} for video_id in page.items), page)
         return {
             "success": True,
-            "captions": captions
+            "captions": page.items,
+            "next_cursor": page.next_cursor,
+            "total": page.total
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,36 @@
+"""
+Admin routes for on-demand request profiles (backend/utils/profiling.py)
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from backend.utils import profiling
+from backend.utils.executors import DISK, run_blocking
+
+router = APIRouter(prefix="/api/admin/profiles", tags=["profiling"])
+
+def _require_admin(token: Optional[str]):
+    if not profiling.enabled():
+        raise HTTPException(status_code=404, detail="Profiling is disabled (PROFILE_ADMIN_TOKEN is not set)")
+    if not profiling.token_valid(token):
+        raise HTTPException(status_code=403, detail="Invalid or missing X-Profile-Token")
+
+@router.get("")
+async def list_profiles(x_profile_token: Optional[str] = Header(None)):
+    """Captured request profiles, newest first"""
+    _require_admin(x_profile_token)
+    profiles = await run_blocking(DISK, profiling.list_profiles)
+    return {"success": True, "profiles": profiles}
+
+@router.get("/{name}")
+async def get_profile_file(name: str, x_profile_token: Optional[str] = Header(None)):
+    """Download one capture file (.prof, .folded or .json)"""
+    _require_admin(x_profile_token)
+    path = await run_blocking(DISK, profiling.profile_file, name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "application/json" if name.endswith(".json") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=name)
@@ -4,26 +4,63 @@ Utility routes
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from backend.services.video_service import VideoService
+from backend.services.caption_gc import CaptionGarbageCollector
 from backend.models.database import Database
+from backend.utils.config import Config
+from backend.utils.executors import DISK, run_blocking
 
 router = APIRouter(prefix="/api", tags=["utils"])
 
 # Initialize services
 db = Database()
-video_service = VideoService(db)
+caption_gc = CaptionGarbageCollector(db)
 
 class CleanupRequest(BaseModel):
     directory: str = "."
+    dry_run: bool = False
+    background: bool = False
+    prune_db: bool = False  # also delete database captions whose video is gone (library root only)
+
+@router.on_event("startup")
+async def _schedule_caption_gc():
+    caption_gc.start_schedule(Config.GC_INTERVAL_SECONDS, Config.LIBRARY_ROOT, Config.GC_SCHEDULE_DRY_RUN,
+                              Config.GC_SCHEDULE_PRUNE_DB)
+
+@router.on_event("shutdown")
+async def _stop_caption_gc():
+    caption_gc.stop_schedule()
 
 @router.post("/cleanup")
 async def cleanup_orphaned(request: CleanupRequest):
-    """Clean up orphaned caption files"""
+    """Clean up orphaned caption files (and, with prune_db on the library root, stale database captions)"""
     try:
-        removed_count = video_service.cleanup_orphaned_captions(request.directory)
+        if request.background:
+            started = caption_gc.start_background(request.directory, request.dry_run, request.prune_db)
+            return {
+                "success": True,
+                "started": started,
+                "message": "Cleanup started" if started else "Cleanup already running"
+            }
+        report = await run_blocking(DISK, caption_gc.collect, request.directory, dry_run=request.dry_run,
+                                    prune_db=request.prune_db)
+        if report is None:
+            raise HTTPException(status_code=409, detail="Cleanup already running")
         return {
             "success": True,
-            "removed_count": removed_count
+            "removed_count": report.removed_sidecars,
+            "report": report.to_dict()
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cleanup/status")
+async def cleanup_status():
+    """Progress or result of the most recent cleanup run"""
+    report = caption_gc.last_report
+    return {
+        "success": True,
+        "running": caption_gc.running,
+        "report": report.to_dict() if report else None
+    }
@@ -3,9 +3,14 @@ Video management router
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Literal, Optional
 from backend.services.video_service import VideoService
 from backend.models.database import Database
+from backend.models.video_info import VideoInfo
+from backend.utils.executors import DISK, run_blocking
+from backend.utils.json_stream import iter_json_object
+from backend.utils.pagination import paginate, parse_fields, project, ndjson_response
 
 router = APIRouter(prefix="/api/videos", tags=["videos"])
 
@@ -14,26 +19,59 @@ db = Database()
 video_service = VideoService(db)
 
 @router.get("/")
-async def get_videos(directory: str = Query(default=".", description="Directory to scan for videos")):
+async def get_videos(directory: str = Query(default=".", description="Directory to scan for videos"),
+                     probe: bool = Query(default=False, description="Fill duration (seconds, float)/resolution/codecs via cached ffprobe"),
+                     limit: Optional[int] = Query(default=None, ge=1, description="Page size (omit for all videos)"),
+                     cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+                     fields: Optional[str] = Query(default=None, description="Comma-separated fields to return"),
+                     format: Literal["json", "ndjson"] = Query(default="json")):
     """Get all videos and their caption status"""
     try:
-        videos = video_service.scan_videos(directory)
-        return {
-            "success": True,
-            "videos": [video.to_dict() for video in videos],
-            "count": len(videos)
-        }
+        videos = await run_blocking(DISK, video_service.scan_videos, directory)
+        page = paginate(videos, key=lambda v: v.file_path or "", cursor=cursor, limit=limit)
+        if probe:
+            # Only the page being returned is probed, not the whole scan
+            await run_blocking(DISK, video_service.probe_videos, page.items)
+        selected = parse_fields(fields)
+        
+        def to_dict(video: VideoInfo) -> Dict[str, Any]:
+            return project(video.to_dict(), selected)
+        
+        if format == "ndjson":
+            return ndjson_response((to_dict(v) for v in page.items), page)
+        # Serialize record by record instead of building a dict per video up front
+        return StreamingResponse(
+            iter_json_object(
+                {"success": True, "next_cursor": page.next_cursor, "total": page.total},
+                "videos", page.items, to_dict, count_key="count"
+            ),
+            media_type="application/json"
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/status")
-async def get_video_status(directory: str = Query(default=".", description="Directory to scan for videos")):
+async def get_video_status(directory: str = Query(default=".", description="Directory to scan for videos"),
+                           limit: Optional[int] = Query(default=None, ge=1, description="Page size (omit for all videos)"),
+                           cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+                           fields: Optional[str] = Query(default=None, description="Comma-separated fields to return"),
+                           format: Literal["json", "ndjson"] = Query(default="json")):
     """Get detailed status of all videos"""
     try:
-        status = video_service.get_video_status(directory)
+        status = await run_blocking(DISK, video_service.get_video_status, directory)
+        page = paginate(list(status.items()), key=lambda item: item[0], cursor=cursor, limit=limit)
+        selected = parse_fields(fields)
+        if format == "ndjson":
+            return ndjson_response(({"title": title, **project(s, selected)} for title, s in page.items), page)
         return {
             "success": True,
-            "status": status
+            "status": {title: project(s, selected) for title, s in page.items},
+            "next_cursor": page.next_cursor,
+            "total": page.total
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -8,6 +8,7 @@ from typing import Dict, Any
 from backend.services.youtube_service import YouTubeService
 from backend.services.video_service import VideoService
 from backend.models.database import Database
+from backend.utils.executors import DISK, NETWORK, run_blocking
 
 router = APIRouter(prefix="/api/youtube", tags=["youtube"])
 
@@ -24,7 +25,8 @@ class YouTubeUploadRequest(BaseModel):
 async def youtube_auth_status():
     """Check YouTube authentication status"""
     try:
-        status = youtube_service.check_authentication_status()
+        # May refresh the OAuth token
+        status = await run_blocking(NETWORK, youtube_service.check_authentication_status)
         return {
             "success": True,
             "status": status
@@ -37,7 +39,7 @@ async def youtube_auth_initiate():
     """Initiate YouTube authentication flow"""
     try:
         # This will trigger the OAuth flow
-        youtube = youtube_service._authenticate_youtube()
+        youtube = await run_blocking(NETWORK, youtube_service._authenticate_youtube)
         return {
             "success": True,
             "message": "Authentication completed successfully"
@@ -50,19 +52,14 @@ async def youtube_upload(request: YouTubeUploadRequest):
     """Upload video to YouTube"""
     try:
         # Find video file
-        videos = video_service.scan_videos(".")
-        target_video = None
-        
-        for video in videos:
-            if video.title == request.video_title:
-                target_video = video
-                break
+        target_video = await run_blocking(DISK, video_service.find_video_by_title, request.video_title, ".")
         
         if not target_video or not target_video.file_path:
             raise HTTPException(status_code=404, detail="Video file not found")
         
         # Upload to YouTube
-        result = youtube_service.upload_video(
+        result = await run_blocking(
+            NETWORK, youtube_service.upload_video,
             target_video.file_path,
             target_video.to_dict(),
             request.caption
@@ -77,7 +74,7 @@ async def youtube_upload(request: YouTubeUploadRequest):
 async def youtube_uploads():
     """Get YouTube upload history"""
     try:
-        uploads = youtube_service.get_upload_history()
+        uploads = await run_blocking(DISK, youtube_service.get_upload_history)
         return {
             "success": True,
             "uploads": uploads
@@ -89,7 +86,7 @@ async def youtube_uploads():
 async def youtube_revoke_auth():
     """Revoke YouTube authentication"""
     try:
-        success = youtube_service.revoke_credentials()
+        success = await run_blocking(DISK, youtube_service.revoke_credentials)
         return {
             "success": success,
             "message": "Authentication revoked" if success else "Failed to revoke authentication"
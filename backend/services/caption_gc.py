@@ -0,0 +1,187 @@
+"""
+Background garbage collector for orphaned caption sidecars and database entries
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from backend.models.database import Database
+from backend.models.video_info import create_video_id
+from backend.services.fs_scanner import ScanResult
+from backend.services.video_service import VideoService
+from backend.utils.config import Config
+
+
+@dataclass
+class _Snapshot:
+    """What the previous run of one directory saw"""
+    scan: ScanResult
+    db_mtime_ns: Optional[int]
+    stale_db_entries: List[str]
+
+
+@dataclass
+class GCReport:
+    """Outcome of one collection run (updated live while it runs)"""
+    directory: str
+    dry_run: bool
+    prune_db: bool = False
+    started_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    finished_at: Optional[str] = None
+    orphaned_sidecars: List[str] = field(default_factory=list)
+    stale_db_entries: List[str] = field(default_factory=list)
+    db_checked: bool = False
+    removed_sidecars: int = 0
+    removed_db_entries: int = 0
+    directories_scanned: int = 0
+    directories_reused: int = 0
+    errors: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "directory": self.directory,
+            "dry_run": self.dry_run,
+            "prune_db": self.prune_db,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "orphaned_sidecars": self.orphaned_sidecars,
+            "stale_db_entries": self.stale_db_entries,
+            "db_checked": self.db_checked,
+            "removed_sidecars": self.removed_sidecars,
+            "removed_db_entries": self.removed_db_entries,
+            "directories_scanned": self.directories_scanned,
+            "directories_reused": self.directories_reused,
+            "errors": self.errors
+        }
+
+
+class CaptionGarbageCollector:
+    """Finds caption sidecars and database captions whose video no longer exists.
+
+    Candidates come from a single catalog scan (the same scan that refreshes
+    the video index), so no per-file existence probes are needed. Runs are
+    incremental: a directory whose mtime has not changed since the previous
+    run costs one stat and its earlier listing is reused, and the database
+    comparison is skipped when neither the tree nor the database file changed.
+    The first run after startup lists the whole tree. Deletions can be rate
+    limited so a large cleanup does not saturate a network volume.
+    Stale database captions are only reported unless ``prune_db`` is set, and
+    only one run (direct, background or scheduled) happens at a time.
+    """
+    
+    def __init__(self, database: Database):
+        self.db = database
+        self.video_service = VideoService(database)
+        self.last_report: Optional[GCReport] = None
+        self._running = threading.Lock()
+        self._snapshots: Dict[str, _Snapshot] = {}
+        self._scheduler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    @property
+    def running(self) -> bool:
+        return self._running.locked()
+    
+    def _covers_library(self, directory: str) -> bool:
+        # Database entries can only be judged stale against a scan of the whole library
+        return os.path.abspath(directory) == os.path.abspath(Config.LIBRARY_ROOT)
+    
+    def _db_mtime_ns(self) -> Optional[int]:
+        try:
+            return os.stat(self.db.db_path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def collect(self, directory: str = ".", dry_run: bool = True, max_deletes_per_second: float = 0,
+                prune_db: bool = False) -> Optional[GCReport]:
+        """Run one collection now; None if another run is in progress"""
+        if not self._running.acquire(blocking=False):
+            return None
+        try:
+            return self._collect(directory, dry_run, max_deletes_per_second, prune_db)
+        finally:
+            self._running.release()
+    
+    def _collect(self, directory: str, dry_run: bool, max_deletes_per_second: float,
+                 prune_db: bool) -> GCReport:
+        """One collection; with ``dry_run`` only report what would be removed"""
+        report = GCReport(directory=directory, dry_run=dry_run, prune_db=prune_db)
+        self.last_report = report
+        
+        key = os.path.abspath(directory)
+        previous = self._snapshots.get(key)
+        db_mtime_ns = self._db_mtime_ns()
+        videos, scan = self.video_service.scan_catalog(directory, previous=previous.scan if previous else None)
+        report.orphaned_sidecars = list(scan.orphaned_sidecars)
+        report.directories_scanned = len(scan.directories) - scan.reused_directories
+        report.directories_reused = scan.reused_directories
+        if self._covers_library(directory):
+            report.db_checked = True
+            if (previous is not None and report.directories_scanned == 0
+                    and db_mtime_ns is not None and previous.db_mtime_ns == db_mtime_ns):
+                report.stale_db_entries = list(previous.stale_db_entries)
+            else:
+                live_ids = {create_video_id(video) for video in videos}
+                report.stale_db_entries = sorted(set(self.db.list_captions()) - live_ids)
+        # Deletions below change the directory / database mtimes, so the next
+        # run re-checks whatever this one touched
+        self._snapshots[key] = _Snapshot(scan, db_mtime_ns, list(report.stale_db_entries))
+        
+        if not dry_run:
+            interval = 1.0 / max_deletes_per_second if max_deletes_per_second > 0 else 0
+            for caption_path in report.orphaned_sidecars:
+                try:
+                    os.remove(caption_path)
+                    report.removed_sidecars += 1
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    report.errors.append(f"{caption_path}: {e}")
+                if interval:
+                    time.sleep(interval)
+            if prune_db and report.stale_db_entries:
+                try:
+                    report.removed_db_entries = self.db.delete_captions(report.stale_db_entries)
+                except Exception as e:
+                    report.errors.append(f"database: {e}")
+        
+        report.finished_at = datetime.now().isoformat()
+        return report
+    
+    def start_background(self, directory: str = ".", dry_run: bool = True, prune_db: bool = False) -> bool:
+        """Run a rate-limited collection on a daemon thread; False if one is already running"""
+        if not self._running.acquire(blocking=False):
+            return False
+        
+        def _run():
+            try:
+                self._collect(directory, dry_run, Config.GC_MAX_DELETES_PER_SECOND, prune_db)
+            except Exception as e:
+                print(f"Caption GC failed: {e}")
+            finally:
+                self._running.release()
+        
+        threading.Thread(target=_run, name="caption-gc", daemon=True).start()
+        return True
+    
+    def start_schedule(self, interval_seconds: float, directory: str = ".", dry_run: bool = False,
+                       prune_db: bool = False):
+        """Collect every ``interval_seconds`` until stop_schedule() is called"""
+        if self._scheduler is not None or interval_seconds <= 0:
+            return
+        self._stop.clear()
+        
+        def _loop():
+            while not self._stop.wait(interval_seconds):
+                self.start_background(directory, dry_run, prune_db)
+        
+        self._scheduler = threading.Thread(target=_loop, name="caption-gc-schedule", daemon=True)
+        self._scheduler.start()
+    
+    def stop_schedule(self):
+        self._stop.set()
+        self._scheduler = None
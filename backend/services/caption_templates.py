@@ -0,0 +1,178 @@
+"""
+Precompiled caption template engine
+"""
+
+import random
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from backend.models.video_info import VideoInfo, CaptionTemplate, create_video_id
+
+CAPTION_TEMPLATES: Dict[str, CaptionTemplate] = {
+    "ai_tech": CaptionTemplate(
+        hook_patterns=[
+            "Can AI help {topic} make better decisions?",
+            "Stop scrolling—this will 10x your {topic} skills.",
+            "Everyone's missing this one step in {topic}.",
+            "From {problem} to {solution}: AI that actually works.",
+            "Make {complex_topic} simple in 60 seconds."
+        ],
+        value_patterns=[
+            "In this video, I break down {topic} and show you exactly how it works. You'll learn the framework, see real examples, and get actionable steps you can apply today.",
+            "I'll reveal the exact method I use to {action} without {common_problem}. It's fast, repeatable, and perfect for real-world use.",
+            "Learn how {topic} works from the ground up. I demo the pipeline, explain the key concepts, and give you a template to try it yourself.",
+            "This walkthrough covers {topic} step-by-step. No jargon—just what works and how to implement it in your own projects."
+        ],
+        cta_patterns=[
+            "👉 Follow for more AI/ML insights and practical breakdowns!",
+            "👉 Like, share, and follow for hands-on AI systems explained simply.",
+            "👉 Comment '{keyword}' if you want the code breakdown next!",
+            "👉 Save this post and share it with a teammate who needs it.",
+            "👉 Follow for weekly templates and quick wins."
+        ],
+        hashtag_sets=[
+            ["#AI", "#MachineLearning", "#DeepLearning", "#ComputerVision", "#DataScience", "#Innovation", "#TechForGood", "#FutureOfWork", "#AIProjects", "#ArtificialIntelligence", "#WatchTillEnd"],
+            ["#AI", "#MachineLearning", "#RealTimeAI", "#ComputerVision", "#DataScience", "#SafetyCritical", "#DeepLearning", "#AIProjects", "#Innovation", "#TechForGood", "#EdgeAI", "#WatchTillEnd"],
+            ["#AI", "#Technology", "#Innovation", "#Learning", "#DataScience", "#Tips", "#HowTo", "#Workflow", "#Automation", "#Efficiency", "#WatchTillEnd", "#Creators", "#BuildSmarter"]
+        ]
+    ),
+    "tutorial": CaptionTemplate(
+        hook_patterns=[
+            "Stop struggling with {topic}—here's the fix.",
+            "This {topic} trick will save you hours.",
+            "Why everyone gets {topic} wrong (and how to do it right).",
+            "The {topic} method that actually works."
+        ],
+        value_patterns=[
+            "I'll show you the exact steps to {action} without the common mistakes. You'll see the before/after and get a template you can use immediately.",
+            "In this tutorial, I break down {topic} from start to finish. No fluff—just the essential steps that get results.",
+            "Learn the {topic} framework that professionals use. I'll walk you through each step with real examples."
+        ],
+        cta_patterns=[
+            "👉 Follow for more practical tutorials like this!",
+            "👉 Save this and try it on your next project!",
+            "👉 Comment if you want more {topic} tips!"
+        ],
+        hashtag_sets=[
+            ["#Tutorial", "#HowTo", "#Learning", "#Tips", "#Productivity", "#Skills", "#Education", "#DIY", "#Guide", "#StepByStep", "#WatchTillEnd"]
+        ]
+    ),
+    "general": CaptionTemplate(
+        hook_patterns=[
+            "You need to see this {topic} breakthrough.",
+            "This changes everything about {topic}.",
+            "The {topic} secret nobody talks about.",
+            "Why {topic} is about to get way easier."
+        ],
+        value_patterns=[
+            "In this video, I share {topic} insights that will transform how you think about {related_topic}. You'll learn the key principles and see practical applications.",
+            "I break down {topic} in a way that makes complex concepts simple. Perfect for anyone looking to understand {related_topic} better.",
+            "This video covers {topic} from multiple angles. You'll get actionable insights and a fresh perspective on {related_topic}."
+        ],
+        cta_patterns=[
+            "👉 Follow for more insights like this!",
+            "👉 Share this with someone who needs to see it!",
+            "👉 Comment your thoughts below!"
+        ],
+        hashtag_sets=[
+            ["#Insights", "#Learning", "#Knowledge", "#Education", "#Tips", "#Innovation", "#Growth", "#Mindset", "#Success", "#Motivation", "#WatchTillEnd"]
+        ]
+    )
+}
+
+
+class _KeepMissing(dict):
+    """Leave unknown placeholders untouched, like the old str.replace loop did"""
+
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+class CompiledPattern:
+    """A template pattern prepared once for repeated rendering"""
+
+    __slots__ = ("source", "_static")
+
+    def __init__(self, source: str):
+        self.source = source
+        # Patterns without placeholders are returned as-is
+        self._static = "{" not in source
+
+    def render(self, context: Dict[str, str]) -> str:
+        if self._static:
+            return self.source
+        return self.source.format_map(context)
+
+
+class CompiledTemplate:
+    """All patterns of a CaptionTemplate, compiled and with hashtag lines pre-joined"""
+
+    __slots__ = ("hooks", "values", "ctas", "hashtag_lines")
+
+    def __init__(self, template: CaptionTemplate):
+        self.hooks = [CompiledPattern(p) for p in template.hook_patterns]
+        self.values = [CompiledPattern(p) for p in template.value_patterns]
+        self.ctas = [CompiledPattern(p) for p in template.cta_patterns]
+        self.hashtag_lines = [" ".join(tags) for tags in template.hashtag_sets]
+
+    def render(self, context: Dict[str, str], choice: Callable[[Sequence], object] = random.choice) -> str:
+        hook = choice(self.hooks).render(context)
+        value = choice(self.values).render(context)
+        cta = choice(self.ctas).render(context)
+        hashtags = choice(self.hashtag_lines)
+        return f"{hook}\n\n{value}\n\n{cta}\n\n{hashtags}"
+
+
+COMPILED_TEMPLATES: Dict[str, CompiledTemplate] = {
+    name: CompiledTemplate(template) for name, template in CAPTION_TEMPLATES.items()
+}
+
+_BASE_CONTEXT = {
+    "common_problem": "getting overwhelmed",
+    "problem": "confusion",
+    "solution": "clarity",
+    "keyword": "DEMO",
+}
+
+
+def build_context(video_info: VideoInfo) -> Dict[str, str]:
+    """Template variables for a video"""
+    topic = video_info.topic
+    context = _KeepMissing(_BASE_CONTEXT)
+    context["topic"] = topic
+    context["action"] = f"master {topic}"
+    context["complex_topic"] = topic
+    context["related_topic"] = topic
+    return context
+
+
+def video_rng(seed: Optional[int], video_id: str) -> random.Random:
+    """Per-video RNG so a seeded batch renders the same captions in any order"""
+    # String seeds are hashed with SHA-512, so this is stable across processes
+    return random.Random(f"{seed}:{video_id}")
+
+
+def render_caption(video_info: VideoInfo, template_type: str = "ai_tech",
+                   rng: Optional[random.Random] = None) -> str:
+    """Render one caption; uses the global random state when no rng is given"""
+    template = COMPILED_TEMPLATES[template_type]
+    return template.render(build_context(video_info), rng.choice if rng else random.choice)
+
+
+def render_captions(videos: Iterable[VideoInfo], template_type: str = "ai_tech",
+                    seed: Optional[int] = None,
+                    video_ids: Optional[Sequence[str]] = None) -> List[str]:
+    """Render captions for many videos in one call.
+
+    With a seed, every video gets its own RNG derived from (seed, video id), so
+    results are reproducible and independent of batch order and size.
+    """
+    template = COMPILED_TEMPLATES[template_type]
+    captions: List[str] = []
+    for idx, video in enumerate(videos):
+        if seed is None:
+            choice = random.choice
+        else:
+            video_id = video_ids[idx] if video_ids is not None else create_video_id(video)
+            choice = video_rng(seed, video_id).choice
+        captions.append(template.render(build_context(video), choice))
+    return captions
@@ -0,0 +1,158 @@
+"""
+Parallel filesystem scanner built on os.scandir
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.utils.config import Config
+from backend.utils.slots import add_slots
+
+
+@add_slots
+@dataclass
+class ScannedVideo:
+    """A video file found by the scanner, with its stat data and sidecar"""
+    path: str
+    name: str
+    stem: str
+    size: int
+    mtime: float
+    ctime: float
+    caption_path: Optional[str] = None
+
+
+@dataclass
+class DirSnapshot:
+    """One directory's listing, valid while its mtime is unchanged"""
+    mtime_ns: int
+    subdirs: List[str]
+    videos: List[ScannedVideo]
+    orphans: List[str]
+
+
+@dataclass
+class ScanResult:
+    """Videos and caption sidecars without a matching video"""
+    videos: List[ScannedVideo] = field(default_factory=list)
+    orphaned_sidecars: List[str] = field(default_factory=list)
+    # Per-directory listings, so a later scan can skip unchanged directories
+    directories: Dict[str, DirSnapshot] = field(default_factory=dict)
+    started_ns: int = 0
+    reused_directories: int = 0
+
+
+# A directory modified this close to the previous scan may have changed after
+# it was listed within the same mtime tick, so it is listed again
+_MTIME_SLACK_NS = 2_000_000_000
+
+
+def _scan_directory(path: str, video_exts: frozenset, sidecar_exts: Tuple[str, ...]):
+    """List one directory once and resolve sidecars against that listing"""
+    subdirs: List[str] = []
+    videos: List[os.DirEntry] = []
+    sidecars: List[os.DirEntry] = []
+    names = set()
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                names.add(entry.name)
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext in video_exts:
+                    videos.append(entry)
+                elif ext in sidecar_exts:
+                    sidecars.append(entry)
+    except OSError:
+        return subdirs, [], []
+
+    found: List[ScannedVideo] = []
+    for entry in videos:
+        stem = os.path.splitext(entry.name)[0]
+        caption_path = next(
+            (os.path.join(path, stem + ext) for ext in sidecar_exts if stem + ext in names),
+            None,
+        )
+        try:
+            st = entry.stat()  # cached by DirEntry; free on Windows
+        except OSError:
+            continue
+        found.append(ScannedVideo(
+            path=entry.path,
+            name=entry.name,
+            stem=stem,
+            size=st.st_size,
+            mtime=st.st_mtime,
+            ctime=st.st_ctime,
+            caption_path=caption_path,
+        ))
+
+    orphans = [
+        entry.path for entry in sidecars
+        if not any(os.path.splitext(entry.name)[0] + ext in names for ext in video_exts)
+    ]
+    return subdirs, found, orphans
+
+
+def _scan_or_reuse(path: str, video_exts: frozenset, sidecar_exts: Tuple[str, ...],
+                   previous: Optional[ScanResult]) -> Tuple[DirSnapshot, bool]:
+    """Reuse the previous listing of ``path`` if the directory is unchanged, else list it"""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    old = previous.directories.get(path) if previous is not None else None
+    if (old is not None and mtime_ns and old.mtime_ns == mtime_ns
+            and mtime_ns < previous.started_ns - _MTIME_SLACK_NS):
+        return old, True
+    subdirs, videos, orphans = _scan_directory(path, video_exts, sidecar_exts)
+    return DirSnapshot(mtime_ns, subdirs, videos, orphans), False
+
+
+def scan_tree(root: str, video_exts: Iterable[str], sidecar_exts: Iterable[str],
+              max_workers: Optional[int] = None, previous: Optional[ScanResult] = None) -> ScanResult:
+    """Walk ``root`` with one scandir per directory, fanning subtrees out to threads.
+
+    With ``previous`` (an earlier scan of the same root and extensions),
+    directories whose mtime has not changed since are taken from it after a
+    single stat instead of being listed again. Adding, removing or renaming a
+    file changes its directory's mtime; changing a file's contents does not,
+    so reused entries keep their old size/mtime.
+
+    Results are sorted by path so output does not depend on thread timing.
+    """
+    result = ScanResult(started_ns=time.time_ns())
+    if not os.path.isdir(root):
+        return result
+    video_exts = frozenset(video_exts)
+    # Fixed preference order when several sidecars exist for one video
+    sidecar_exts = tuple(sorted(sidecar_exts))
+    workers = max_workers or Config.SCAN_WORKERS
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_scan_or_reuse, root, video_exts, sidecar_exts, previous): root}
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for fut in done:
+                path = pending.pop(fut)
+                snapshot, reused = fut.result()
+                result.directories[path] = snapshot
+                result.reused_directories += reused
+                result.videos.extend(snapshot.videos)
+                result.orphaned_sidecars.extend(snapshot.orphans)
+                for subdir in snapshot.subdirs:
+                    pending[pool.submit(_scan_or_reuse, subdir, video_exts, sidecar_exts, previous)] = subdir
+
+    result.videos.sort(key=lambda v: v.path)
+    result.orphaned_sidecars.sort()
+    return result
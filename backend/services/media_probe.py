@@ -0,0 +1,186 @@
+"""
+Batched ffprobe metadata extraction with a (path, size, mtime) keyed cache
+
+The cache keeps one entry per file (a new size or mtime replaces the old
+entry) and at most ``MEDIA_PROBE_CACHE_MAX`` entries, evicting the least
+recently used ones first.
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.utils.config import Config
+from backend.utils.tracing import run_subprocess
+
+# Metadata fields copied onto VideoInfo
+PROBE_FIELDS = ("duration", "width", "height", "video_codec", "audio_codec", "bitrate", "keyframe_interval")
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    number = _to_float(value)
+    return int(number) if number is not None else None
+
+
+def _keyframe_interval(path: str) -> Optional[float]:
+    """Mean spacing of video keyframes over the first 30 seconds (packet flags only, no decode)"""
+    cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "v:0", "-read_intervals", "%+30",
+        "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", path,
+    ]
+    result = run_subprocess(cmd, capture_output=True, text=True, timeout=Config.PROBE_TIMEOUT)
+    times: List[float] = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags:
+            value = _to_float(pts)
+            if value is not None:
+                times.append(value)
+    if len(times) < 2:
+        return None
+    return round((times[-1] - times[0]) / (len(times) - 1), 3)
+
+
+def probe_file(path: str) -> Dict[str, Any]:
+    """Run ffprobe on one file and return normalised metadata"""
+    cmd = ["ffprobe", "-v", "error", "-print_format", "json", "-show_format", "-show_streams", path]
+    result = run_subprocess(cmd, capture_output=True, text=True, timeout=Config.PROBE_TIMEOUT)
+    if result.returncode != 0:
+        return {}
+    data = json.loads(result.stdout or "{}")
+    fmt = data.get("format", {})
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), {})
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), {})
+    meta = {
+        "duration": _to_float(fmt.get("duration") or video.get("duration")),
+        "width": _to_int(video.get("width")),
+        "height": _to_int(video.get("height")),
+        "video_codec": video.get("codec_name"),
+        "audio_codec": audio.get("codec_name"),
+        "bitrate": _to_int(fmt.get("bit_rate")),
+        "keyframe_interval": None,
+    }
+    if video and Config.PROBE_KEYFRAMES:
+        meta["keyframe_interval"] = _keyframe_interval(path)
+    return meta
+
+
+class MediaProbe:
+    """Probes media files in parallel batches and remembers the results on disk"""
+    
+    def __init__(self, cache_path: str = None, max_entries: int = None):
+        self.cache_path = cache_path or Config.MEDIA_PROBE_CACHE
+        self.max_entries = max_entries or Config.MEDIA_PROBE_CACHE_MAX
+        self._cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._keys_by_path: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.available = True
+    
+    @staticmethod
+    def _key(path: str, size: int, mtime: float) -> str:
+        return f"{os.path.abspath(path)}|{size}|{mtime}"
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._cache is None:
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    saved = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                saved = {}
+            # Insertion order is recency order; later keys for a path win
+            self._cache, self._keys_by_path = {}, {}
+            for key, meta in saved.items():
+                self._store(key, meta)
+        return self._cache
+    
+    def _store(self, key: str, meta: Dict[str, Any]):
+        """Insert as most recently used, replacing the file's older entry and evicting past the cap"""
+        path = key.rsplit('|', 2)[0]
+        old_key = self._keys_by_path.get(path)
+        if old_key is not None and old_key != key:
+            self._cache.pop(old_key, None)
+        self._cache.pop(key, None)
+        self._cache[key] = meta
+        self._keys_by_path[path] = key
+        while len(self._cache) > self.max_entries:
+            oldest = next(iter(self._cache))
+            del self._cache[oldest]
+            self._keys_by_path.pop(oldest.rsplit('|', 2)[0], None)
+    
+    def _save(self):
+        Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.cache_path)), suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._cache, f)
+        os.replace(tmp_path, self.cache_path)
+    
+    def _probe(self, path: str) -> Optional[Dict[str, Any]]:
+        if not self.available:
+            return None
+        try:
+            return probe_file(path)
+        except FileNotFoundError:
+            # ffprobe is not installed; stop trying for the life of the process
+            self.available = False
+            return None
+        except (subprocess.TimeoutExpired, json.JSONDecodeError, OSError):
+            return {}
+    
+    def probe_many(self, files: Iterable[Tuple[str, int, float]],
+                   limit: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Metadata for (path, size, mtime) triples; cached entries cost nothing.
+
+        At most ``limit`` uncached files are probed per call so one request
+        cannot trigger a probe storm; the rest fill in on later calls.
+        """
+        limit = Config.PROBE_MAX_PER_CALL if limit is None else limit
+        results: Dict[str, Dict[str, Any]] = {}
+        missing: List[Tuple[str, str]] = []
+        with self._lock:
+            cache = self._load()
+            for path, size, mtime in files:
+                key = self._key(path, size, mtime)
+                if key in cache:
+                    results[path] = cache[key]
+                    self._store(key, cache[key])
+                elif len(missing) < limit:
+                    missing.append((path, key))
+        if not missing or not self.available:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=Config.PROBE_WORKERS) as pool:
+            probed = list(pool.map(self._probe, [path for path, _ in missing]))
+        
+        with self._lock:
+            cache = self._load()
+            changed = False
+            for (path, key), meta in zip(missing, probed):
+                if meta is None:
+                    continue
+                self._store(key, meta)
+                results[path] = meta
+                changed = True
+            if not changed:
+                return results
+            try:
+                self._save()
+            except OSError as e:
+                print(f"Error saving probe cache: {e}")
+        return results
+
+
+# One cache per process, shared by all VideoService instances
+media_probe = MediaProbe()
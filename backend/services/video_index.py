@@ -0,0 +1,100 @@
+"""
+Secondary index of scanned videos by title and caption id
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from backend.models.video_info import VideoInfo, create_video_id
+from backend.utils.config import Config
+
+
+class _RootIndex:
+    """Lookup tables for one scanned directory"""
+
+    def __init__(self, videos: List[VideoInfo]):
+        self.built_at = time.monotonic()
+        self.videos = videos
+        self.by_title: Dict[str, List[VideoInfo]] = {}
+        self.by_id: Dict[str, List[VideoInfo]] = {}
+        for video in videos:
+            self.by_title.setdefault(video.title, []).append(video)
+            self.by_id.setdefault(create_video_id(video), []).append(video)
+
+
+class VideoIndex:
+    """Title and video-id lookups kept up to date by every directory scan.
+
+    Lookups are dictionary hits plus one existence check on the returned file.
+    A stale hit (file gone) or a miss on an index older than
+    ``Config.VIDEO_INDEX_MAX_AGE`` seconds triggers one rescan through the
+    supplied callback; misses on a fresh index are answered without scanning.
+    Routes that add or remove video files call ``invalidate_path`` so a fresh
+    index never hides them.
+    """
+
+    def __init__(self):
+        self._roots: Dict[str, _RootIndex] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(directory: str) -> str:
+        return os.path.abspath(directory)
+
+    def update(self, directory: str, videos: List[VideoInfo]):
+        """Replace the index for a directory with fresh scan results"""
+        root = _RootIndex(videos)
+        with self._lock:
+            self._roots[self._key(directory)] = root
+
+    def invalidate(self, directory: Optional[str] = None):
+        """Drop one directory's index, or all of them"""
+        with self._lock:
+            if directory is None:
+                self._roots.clear()
+            else:
+                self._roots.pop(self._key(directory), None)
+
+    def invalidate_path(self, path: str):
+        """Drop the index of every scanned directory containing ``path``"""
+        target = self._key(path)
+        with self._lock:
+            for key in [k for k in self._roots if target == k or target.startswith(k.rstrip(os.sep) + os.sep)]:
+                del self._roots[key]
+
+    def videos(self, directory: str) -> Optional[List[VideoInfo]]:
+        """Last scan result for a directory, if indexed"""
+        root = self._roots.get(self._key(directory))
+        return root.videos if root else None
+
+    def _lookup(self, table: str, key: str, directory: str,
+                rescan: Callable[[str], List[VideoInfo]]) -> Optional[VideoInfo]:
+        root = self._roots.get(self._key(directory))
+        fresh = root is not None and (time.monotonic() - root.built_at) < Config.VIDEO_INDEX_MAX_AGE
+        if root is not None:
+            for video in getattr(root, table).get(key, ()):
+                if video.file_path and os.path.exists(video.file_path):
+                    return video
+                fresh = False  # a listed file vanished; the index is out of date
+            if fresh:
+                return None
+        rescan(directory)  # scan_videos refreshes this index
+        root = self._roots.get(self._key(directory))
+        if root is None:
+            return None
+        matches = getattr(root, table).get(key)
+        return matches[0] if matches else None
+
+    def find_by_title(self, title: str, directory: str,
+                      rescan: Callable[[str], List[VideoInfo]]) -> Optional[VideoInfo]:
+        return self._lookup("by_title", title, directory, rescan)
+
+    def find_by_video_id(self, video_id: str, directory: str,
+                         rescan: Callable[[str], List[VideoInfo]]) -> Optional[VideoInfo]:
+        return self._lookup("by_id", video_id, directory, rescan)
+
+
+# Shared across service instances so every scan keeps the same index warm
+video_index = VideoIndex()
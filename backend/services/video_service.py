@@ -3,13 +3,17 @@ Video management service
 """
 
 import os
-import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
 from backend.models.database import Database
-from backend.models.video_info import VideoInfo
+from backend.models.video_info import VideoInfo, create_video_id
+from backend.services.fs_scanner import ScanResult, ScannedVideo, scan_tree
+from backend.services.media_probe import PROBE_FIELDS, media_probe
+from backend.services.video_index import video_index
 from backend.utils.config import Config
+from backend.utils.metrics import stage_timer
+from backend.utils.topics import classify_video_topic
 
 class VideoService:
     """Service for managing video files"""
@@ -19,103 +23,102 @@ class VideoService:
         self.supported_formats = Config.SUPPORTED_VIDEO_FORMATS
         self.caption_extensions = Config.CAPTION_EXTENSIONS
     
-    def scan_videos(self, directory: str = ".") -> List[VideoInfo]:
-        """Scan directory for video files and extract metadata"""
-        videos = []
-        video_directory = Path(directory)
+    def scan_videos(self, directory: str = ".", probe: bool = False) -> List[VideoInfo]:
+        """Scan directory for video files and extract metadata
+
+        With ``probe``, duration/resolution/codec fields are filled from ffprobe
+        (cached by path, size and mtime).
+        """
+        videos, _ = self.scan_catalog(directory, probe=probe)
+        return videos
+    
+    @stage_timer("scan_videos")
+    def scan_catalog(self, directory: str = ".", probe: bool = False,
+                     previous: Optional[ScanResult] = None) -> Tuple[List[VideoInfo], ScanResult]:
+        """Scan once and return both video information and the raw scan (incl. orphaned sidecars)
+
+        ``previous`` is an earlier result of this method for the same
+        directory; unchanged subdirectories are reused from it (see scan_tree).
+        """
+        videos: List[VideoInfo] = []
+        if not Path(directory).exists():
+            return videos, ScanResult()
         
-        if not video_directory.exists():
-            return videos
+        scan = scan_tree(directory, self.supported_formats, self.caption_extensions, previous=previous)
+        scanned_ok: List[ScannedVideo] = []
+        for scanned in scan.videos:
+            video_info = self._video_info_from_scan(scanned)
+            if video_info:
+                videos.append(video_info)
+                scanned_ok.append(scanned)
         
-        for file_path in video_directory.rglob("*"):
-            if file_path.suffix.lower() in self.supported_formats:
-                video_info = self._extract_video_info(file_path)
-                if video_info:
-                    videos.append(video_info)
+        if probe:
+            self._apply_probe_metadata(videos, [(s.path, s.size, s.mtime) for s in scanned_ok])
         
+        video_index.update(directory, videos)
+        return videos, scan
+    
+    def probe_videos(self, videos: List[VideoInfo]) -> List[VideoInfo]:
+        """Fill media metadata for just these videos, e.g. one page of a scan"""
+        probed: List[VideoInfo] = []
+        files: List[Tuple[str, int, float]] = []
+        for video in videos:
+            try:
+                st = os.stat(video.file_path)
+            except (OSError, TypeError):
+                continue
+            probed.append(video)
+            files.append((video.file_path, st.st_size, st.st_mtime))
+        self._apply_probe_metadata(probed, files)
         return videos
     
-    def _extract_video_info(self, file_path: Path) -> Optional[VideoInfo]:
-        """Extract video information from file"""
+    def _apply_probe_metadata(self, videos: List[VideoInfo], files: List[Tuple[str, int, float]]):
+        """Copy cached/probed media metadata onto VideoInfo objects from (path, size, mtime) triples"""
+        metadata = media_probe.probe_many(files)
+        for video, (path, _, _) in zip(videos, files):
+            meta = metadata.get(path)
+            if meta:
+                for field_name in PROBE_FIELDS:
+                    setattr(video, field_name, meta.get(field_name))
+    
+    def find_video_by_title(self, title: str, directory: str = ".") -> Optional[VideoInfo]:
+        """Find a video by title through the shared index"""
+        return video_index.find_by_title(title, directory, self.scan_videos)
+    
+    def find_video_by_id(self, video_id: str, directory: str = ".") -> Optional[VideoInfo]:
+        """Find a video by its caption database id through the shared index"""
+        return video_index.find_by_video_id(video_id, directory, self.scan_videos)
+    
+    def _video_info_from_scan(self, scanned: ScannedVideo) -> Optional[VideoInfo]:
+        """Build video information from scanner output (no extra filesystem calls)"""
         try:
-            # Get basic file info
-            title = file_path.stem
-            description = f"Video file: {file_path.name}"
-            
-            # Try to extract topic from filename
-            topic = self._extract_topic_from_filename(title)
-            
-            # Check if video already has caption files
-            has_caption, caption_file_path = self._check_caption_file(file_path)
-            
-            # Get file size
-            file_size = file_path.stat().st_size if file_path.exists() else None
-            
             return VideoInfo(
-                title=title,
-                description=description,
-                topic=topic,
-                file_path=str(file_path),
-                size=file_size,
-                has_caption=has_caption,
-                caption_file_path=caption_file_path
+                title=scanned.stem,
+                description=f"Video file: {scanned.name}",
+                topic=self._extract_topic_from_filename(scanned.stem),
+                file_path=str(Path(scanned.path)),
+                size=scanned.size,
+                has_caption=scanned.caption_path is not None,
+                caption_file_path=str(Path(scanned.caption_path)) if scanned.caption_path else None
             )
         except Exception as e:
-            print(f"Error processing {file_path}: {e}")
+            print(f"Error processing {scanned.path}: {e}")
             return None
     
     def _extract_topic_from_filename(self, filename: str) -> str:
         """Extract topic from filename using common patterns"""
-        # Clean filename
-        clean_name = re.sub(r'[_-]', ' ', filename)
-        clean_name = re.sub(r'\d+', '', clean_name)  # Remove numbers
-        clean_name = clean_name.strip()
-        
-        # Topic mapping based on keywords
-        topic_keywords = {
-            'ai': 'artificial intelligence',
-            'ml': 'machine learning',
-            'pilot': 'pilot decision-making',
-            'tutorial': 'tutorial',
-            'guide': 'guide',
-            'tips': 'tips and tricks',
-            'review': 'product review',
-            'demo': 'demonstration',
-            'coding': 'programming',
-            'tech': 'technology',
-            'data': 'data science',
-            'vision': 'computer vision',
-            'deep': 'deep learning',
-            'neural': 'neural networks'
-        }
-        
-        # Find matching keywords
-        for keyword, topic in topic_keywords.items():
-            if keyword.lower() in clean_name.lower():
-                return topic
-        
-        # Default topic
-        return clean_name.lower() or "general content"
-    
-    def _check_caption_file(self, video_path: Path) -> tuple[bool, Optional[str]]:
-        """Check if video already has caption files"""
-        base_name = video_path.stem
-        
-        for ext in self.caption_extensions:
-            caption_file = video_path.parent / f"{base_name}{ext}"
-            if caption_file.exists():
-                return True, str(caption_file)
-        
-        return False, None
+        return classify_video_topic(filename)
     
     def get_video_status(self, directory: str = ".") -> Dict[str, Dict]:
         """Get detailed status of all videos"""
         videos = self.scan_videos(directory)
+        # One database load for the whole scan instead of one per video
+        caption_ids = set(self.db.list_captions())
         status = {}
         
         for video in videos:
             has_file_caption = video.has_caption
-            has_db_caption = self._check_db_caption(video)
+            has_db_caption = create_video_id(video) in caption_ids
             
             status[video.title] = {
                 "file_path": video.file_path,
@@ -129,36 +132,17 @@ class VideoService:
         
         return status
     
-    def _check_db_caption(self, video: VideoInfo) -> bool:
-        """Check if video has caption in database"""
-        from backend.services.caption_service import CaptionService
-        caption_service = CaptionService(self.db)
-        video_id = caption_service._create_video_id(video)
-        return self.db.has_caption(video_id)
-    
     def cleanup_orphaned_captions(self, directory: str = ".") -> int:
         """Remove caption files that don't have corresponding videos"""
-        video_directory = Path(directory)
+        scan = scan_tree(directory, self.supported_formats, self.caption_extensions)
         removed_count = 0
         
-        for file_path in video_directory.rglob("*"):
-            if file_path.suffix.lower() in self.caption_extensions:
-                # Check if corresponding video exists
-                base_name = file_path.stem
-                video_exists = False
-                
-                for ext in self.supported_formats:
-                    video_file = file_path.parent / f"{base_name}{ext}"
-                    if video_file.exists():
-                        video_exists = True
-                        break
-                
-                if not video_exists:
-                    try:
-                        file_path.unlink()
-                        removed_count += 1
-                    except Exception as e:
-                        print(f"Error removing {file_path}: {e}")
+        for caption_path in scan.orphaned_sidecars:
+            try:
+                os.remove(caption_path)
+                removed_count += 1
+            except Exception as e:
+                print(f"Error removing {caption_path}: {e}")
         
         return removed_count
     
@@ -5,20 +5,19 @@ YouTube integration service for video uploads
 import os
 import json
 import pickle
+import tempfile
 from typing import Optional, Dict, Any
 from pathlib import Path
 from datetime import datetime, timedelta
 
-import google_auth_httplib2
-import google_auth_oauthlib
-import googleapiclient.discovery
-import googleapiclient.errors
-import googleapiclient.http
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request as GoogleAuthRequest
+# The Google client libraries are imported inside the methods that use them;
+# googleapiclient and oauthlib are slow to import and most requests never
+# touch YouTube
 
 from backend.models.database import Database
 from backend.utils.config import Config
+from backend.utils.file_lock import file_lock
+from backend.utils.metrics import stage_timer
 
 class YouTubeService:
     """Service for YouTube video uploads with OAuth2 authentication"""
@@ -40,6 +39,11 @@ class YouTubeService:
     
     def _authenticate_youtube(self):
         """Authenticate with YouTube API using the working method"""
+        import googleapiclient.discovery
+        from google.auth.transport.requests import Request as GoogleAuthRequest
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         # Set insecure transport for local development
         os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
 
@@ -65,7 +69,7 @@ class YouTubeService:
             # Fresh auth flow
             if not os.path.exists(self.credentials_file):
                 raise FileNotFoundError(f"Credentials file {self.credentials_file} not found")
-            flow = google_auth_oauthlib.flow.InstalledAppFlow.from_client_secrets_file(
+            flow = InstalledAppFlow.from_client_secrets_file(
                 self.credentials_file, self.SCOPES
             )
             creds = flow.run_local_server(port=0)
@@ -160,8 +164,12 @@ Generated by Video Caption Generator
         unique_tags = list(dict.fromkeys(base_tags))[:15]
         return unique_tags
     
+    @stage_timer("youtube_upload")
     def upload_video(self, video_path: str, video_info: Dict[str, Any], caption: str) -> Dict[str, Any]:
         """Upload video to YouTube with generated title and description"""
+        import googleapiclient.errors
+        import googleapiclient.http
+
         try:
             # Get authenticated service
             youtube = self._authenticate_youtube()
@@ -251,16 +259,29 @@ Generated by Video Caption Generator
         # Save to database (you might want to extend your database schema)
         # For now, we'll save to a separate uploads file
         uploads_file = "data/youtube_uploads.json"
-        uploads = []
+        os.makedirs(os.path.dirname(uploads_file), exist_ok=True)
         
-        if os.path.exists(uploads_file):
-            with open(uploads_file, 'r', encoding='utf-8') as f:
-                uploads = json.load(f)
-        
-        uploads.append(upload_data)
-        
-        with open(uploads_file, 'w', encoding='utf-8') as f:
-            json.dump(uploads, f, indent=2, ensure_ascii=False)
+        # Locked so concurrent uploads don't drop each other's records, and
+        # swapped in atomically so readers never see a half-written file
+        with file_lock(uploads_file):
+            uploads = []
+            if os.path.exists(uploads_file):
+                with open(uploads_file, 'r', encoding='utf-8') as f:
+                    uploads = json.load(f)
+            
+            uploads.append(upload_data)
+            
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(uploads_file)), suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(uploads, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, uploads_file)
+            except Exception:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
     
     def get_upload_history(self) -> list:
         """Get history of uploaded videos"""
@@ -283,6 +304,9 @@ Generated by Video Caption Generator
             # Check if token file exists and is valid
             if os.path.exists(self.token_file):
                 try:
+                    from google.auth.transport.requests import Request as GoogleAuthRequest
+                    from google.oauth2.credentials import Credentials
+
                     creds = Credentials.from_authorized_user_file(self.token_file, scopes=self.SCOPES)
                     if creds and creds.valid:
                         return {
@@ -0,0 +1,106 @@
+"""
+Static check for blocking calls made directly inside ``async def`` handlers
+
+Run with ``python -m backend.utils.blocking_lint [paths...]``; exits non-zero
+when a coroutine calls a known blocking function without handing it to
+``run_blocking`` (backend.utils.executors). Nested ``def`` functions are not
+checked, since they are what gets passed to the executors.
+"""
+
+import ast
+import sys
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# Fully qualified calls that block
+BLOCKING_CALLS = {
+    "open", "time.sleep",
+    "subprocess.run", "subprocess.call", "subprocess.check_call", "subprocess.check_output", "subprocess.Popen",
+    "shutil.copyfileobj", "shutil.copy", "shutil.copy2", "shutil.move", "shutil.rmtree",
+    "os.remove", "os.unlink", "os.listdir", "os.scandir", "os.walk", "os.makedirs", "os.path.exists",
+    "os.path.isdir", "os.path.isfile", "os.stat",
+    "json.load", "json.dump",
+}
+
+# Method / function names that do file, subprocess, model or network work in this codebase
+BLOCKING_NAMES = {
+    # filesystem (pathlib)
+    "rglob", "glob", "iterdir", "exists", "is_dir", "is_file", "stat", "unlink", "mkdir",
+    "read_text", "read_bytes", "write_text", "write_bytes", "resolve",
+    # services
+    "scan_videos", "scan_catalog", "get_video_status", "cleanup_orphaned_captions", "collect",
+    "generate_captions_for_directory", "regenerate_caption", "delete_caption", "list_captioned_videos",
+    "upload_video", "get_upload_history", "check_authentication_status", "revoke_credentials",
+    "_authenticate_youtube",
+    "transcribe", "transcribe_media", "submit_clip", "get_whisper_model", "warm_transcriber", "warm_up", "whisper_models", "switch_whisper_model", "extract_document_text", "iter_subtitle_segments",
+    "trim_clips", "save_video_to_dated_folder", "spool_upload", "save_upload_to_temp",
+    "generate_story_with_gemini", "generate_chat_response", "generate_caption_and_title",
+    "run_subprocess",
+}
+
+
+def _call_name(node: ast.Call) -> Tuple[Optional[str], Optional[str]]:
+    """(dotted name if resolvable, final attribute/function name)"""
+    parts: List[str] = []
+    func = node.func
+    while isinstance(func, ast.Attribute):
+        parts.append(func.attr)
+        func = func.value
+    if isinstance(func, ast.Name):
+        parts.append(func.id)
+        return ".".join(reversed(parts)), parts[0]
+    return None, parts[0] if parts else None
+
+
+class _AsyncBodyVisitor(ast.NodeVisitor):
+    def __init__(self):
+        self.findings: List[Tuple[int, str]] = []
+
+    def visit_FunctionDef(self, node):  # nested sync helpers are executor targets
+        return
+
+    visit_Lambda = visit_FunctionDef
+
+    def visit_AsyncFunctionDef(self, node):
+        return  # nested coroutines are checked on their own
+
+    def visit_Call(self, node: ast.Call):
+        dotted, last = _call_name(node)
+        if dotted == "run_blocking" or last == "run_blocking":
+            # The callable is passed by reference; its arguments are evaluated
+            # on the loop but are plain values
+            for arg in node.args[2:]:
+                self.visit(arg)
+            return
+        if dotted in BLOCKING_CALLS or last in BLOCKING_NAMES:
+            self.findings.append((node.lineno, dotted or last or "?"))
+        self.generic_visit(node)
+
+
+def check_source(source: str, filename: str = "<source>") -> Iterator[Tuple[str, int, str, str]]:
+    """Yield (filename, line, coroutine, call) for every blocking call on the loop"""
+    tree = ast.parse(source, filename)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.AsyncFunctionDef):
+            visitor = _AsyncBodyVisitor()
+            for stmt in node.body:
+                visitor.visit(stmt)
+            for line, call in visitor.findings:
+                yield filename, line, node.name, call
+
+
+def main(argv: List[str]) -> int:
+    roots = [Path(p) for p in (argv or ["backend"])]
+    files = [f for root in roots for f in ([root] if root.is_file() else sorted(root.rglob("*.py")))]
+    count = 0
+    for path in files:
+        for filename, line, coroutine, call in check_source(path.read_text(encoding="utf-8"), str(path)):
+            print(f"{filename}:{line}: {call}() blocks the event loop in async def {coroutine}")
+            count += 1
+    if count:
+        print(f"{count} blocking call(s) found; wrap them with run_blocking(...)")
+    return 1 if count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -21,10 +21,25 @@ class Config:
     # Video settings
     SUPPORTED_VIDEO_FORMATS = {'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm'}
     CAPTION_EXTENSIONS = {'.txt', '.caption', '.srt', '.vtt'}
+    SCAN_WORKERS = int(os.environ.get('SCAN_WORKERS') or 8)
+    PROBE_WORKERS = int(os.environ.get('PROBE_WORKERS') or 4)
+    PROBE_TIMEOUT = float(os.environ.get('PROBE_TIMEOUT') or 15)  # seconds per ffprobe call
+    PROBE_MAX_PER_CALL = int(os.environ.get('PROBE_MAX_PER_CALL') or 200)
+    PROBE_KEYFRAMES = os.environ.get('PROBE_KEYFRAMES', 'True').lower() == 'true'
+    MEDIA_PROBE_CACHE = os.environ.get('MEDIA_PROBE_CACHE') or 'data/media_probe_cache.json'
+    MEDIA_PROBE_CACHE_MAX = int(os.environ.get('MEDIA_PROBE_CACHE_MAX') or 20000)  # entries
+    LIBRARY_ROOT = os.environ.get('LIBRARY_ROOT') or '.'
+    GC_INTERVAL_SECONDS = float(os.environ.get('GC_INTERVAL_SECONDS') or 0)  # 0 disables scheduled runs
+    GC_SCHEDULE_DRY_RUN = os.environ.get('GC_SCHEDULE_DRY_RUN', 'False').lower() == 'true'
+    GC_SCHEDULE_PRUNE_DB = os.environ.get('GC_SCHEDULE_PRUNE_DB', 'False').lower() == 'true'
+    GC_MAX_DELETES_PER_SECOND = float(os.environ.get('GC_MAX_DELETES_PER_SECOND') or 50)
+    PAGE_MAX_LIMIT = int(os.environ.get('PAGE_MAX_LIMIT') or 1000)
+    VIDEO_INDEX_MAX_AGE = float(os.environ.get('VIDEO_INDEX_MAX_AGE') or 30)  # seconds
     
     # Caption settings
     DEFAULT_TEMPLATE = 'ai_tech'
     AVAILABLE_TEMPLATES = ['ai_tech', 'tutorial', 'general']
+    CAPTION_WRITE_WORKERS = int(os.environ.get('CAPTION_WRITE_WORKERS') or 8)
     
     # File paths
     BASE_DIR = Path(__file__).parent.parent.parent
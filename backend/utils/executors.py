@@ -0,0 +1,124 @@
+"""
+Dedicated executors for blocking work
+
+Route handlers are ``async def`` and share one event loop, so anything that
+blocks (ffmpeg, Whisper, Gemini/YouTube HTTP calls, JSON database and
+filesystem I/O) must run elsewhere. Work is split by kind so a burst of one
+kind (e.g. several trims) cannot starve another (e.g. health checks or
+database reads):
+
+    cpu         model inference and document parsing
+    subprocess  ffmpeg / ffprobe invocations
+    network     Gemini, YouTube and OAuth round trips
+    disk        filesystem scans, uploads and the JSON database
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from backend.utils.profiling import attach_thread
+
+CPU = "cpu"
+SUBPROCESS = "subprocess"
+NETWORK = "network"
+DISK = "disk"
+
+T = TypeVar("T")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+# Pool sizes per kind. CPU work mostly runs in native code that releases the
+# GIL (CTranslate2), so threads are enough; pure-Python parsing fans out to
+# its own process pool (see backend.app.services.extraction).
+POOL_SIZES: Dict[str, int] = {
+    CPU: _env_int("EXEC_CPU_WORKERS", max(1, os.cpu_count() or 1)),
+    SUBPROCESS: _env_int("EXEC_SUBPROCESS_WORKERS", 4),
+    NETWORK: _env_int("EXEC_NETWORK_WORKERS", 16),
+    DISK: _env_int("EXEC_DISK_WORKERS", 8),
+}
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+# Submitted-but-unfinished and currently-running task counts per kind
+_pending: Dict[str, int] = {kind: 0 for kind in POOL_SIZES}
+_active: Dict[str, int] = {kind: 0 for kind in POOL_SIZES}
+
+
+def get_executor(kind: str) -> ThreadPoolExecutor:
+    if kind not in POOL_SIZES:
+        raise ValueError(f"Unknown executor kind: {kind}")
+    with _lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=POOL_SIZES[kind], thread_name_prefix=f"exec-{kind}")
+            _executors[kind] = executor
+        return executor
+
+
+def _tracked(kind: str, fn: Callable[..., T]) -> Callable[..., T]:
+    @functools.wraps(fn)
+    def _run(*args: Any, **kwargs: Any) -> T:
+        with _lock:
+            _active[kind] += 1
+        try:
+            # Joins an on-demand request profile when one is active (backend.utils.profiling)
+            with attach_thread():
+                return fn(*args, **kwargs)
+        finally:
+            with _lock:
+                _active[kind] -= 1
+                _pending[kind] -= 1
+    return _run
+
+
+def _release_if_cancelled(kind: str, future: Future) -> None:
+    # A task cancelled before a worker picked it up never reaches _tracked
+    if future.cancelled():
+        with _lock:
+            _pending[kind] -= 1
+
+
+async def run_blocking(kind: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``fn(*args, **kwargs)`` on the executor for ``kind`` and await the result.
+
+    Context variables (request ids, trace spans) are carried into the worker thread.
+    """
+    ctx = contextvars.copy_context()
+    executor = get_executor(kind)
+    with _lock:
+        _pending[kind] += 1
+    future = executor.submit(ctx.run, _tracked(kind, fn), *args, **kwargs)
+    future.add_done_callback(functools.partial(_release_if_cancelled, kind))
+    return await asyncio.wrap_future(future)
+
+
+def executor_stats() -> Dict[str, Dict[str, int]]:
+    """Pool size, running and queued task counts per kind"""
+    with _lock:
+        return {
+            kind: {
+                "workers": POOL_SIZES[kind],
+                "active": _active[kind],
+                "queued": max(0, _pending[kind] - _active[kind]),
+            }
+            for kind in POOL_SIZES
+        }
+
+
+def shutdown_executors(wait: bool = False) -> None:
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,47 @@
+"""
+Exclusive locks around read-modify-write cycles on shared JSON files
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialised
+    fcntl = None
+
+_locks: Dict[str, threading.RLock] = {}
+_locks_guard = threading.Lock()
+_local = threading.local()
+
+
+@contextmanager
+def file_lock(path: str):
+    """Hold ``path`` exclusively across threads and processes until the block exits.
+
+    Threads wait on a per-path lock; the holder then takes an ``fcntl`` lock
+    on ``<path>.lock`` so executor threads in other gunicorn workers wait as
+    well. The data file itself is never locked, so it can still be swapped in
+    with ``os.replace``. Re-entrant within a thread.
+    """
+    key = os.path.abspath(path)
+    with _locks_guard:
+        lock = _locks.setdefault(key, threading.RLock())
+    with lock:
+        held = getattr(_local, "held", None)
+        if held is None:
+            held = _local.held = set()
+        if key in held:
+            yield
+            return
+        with open(key + ".lock", "a") as sidecar:
+            if fcntl is not None:
+                fcntl.flock(sidecar.fileno(), fcntl.LOCK_EX)
+            held.add(key)
+            try:
+                yield
+            finally:
+                held.discard(key)
+                # Closing the sidecar releases the fcntl lock
@@ -0,0 +1,41 @@
+"""
+Streaming JSON serialization for large list responses
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+_encoder = json.JSONEncoder(ensure_ascii=False)
+
+# Records per yielded chunk: large enough to keep syscall overhead low,
+# small enough that memory stays flat regardless of library size
+CHUNK_RECORDS = 256
+
+
+def iter_json_object(head: Dict[str, Any], array_key: str, records: Iterable[Any],
+                     to_dict: Callable[[Any], Dict[str, Any]],
+                     count_key: Optional[str] = None) -> Iterator[bytes]:
+    """Yield ``{**head, array_key: [...], count_key: n}`` as UTF-8 chunks.
+
+    Records are encoded one at a time, so no list of per-record dicts is
+    ever built; the count is written after the array once it is known.
+    """
+    prefix = _encoder.encode(head)[:-1]
+    sep = ", " if head else ""
+    yield f"{prefix}{sep}{_encoder.encode(array_key)}: [".encode("utf-8")
+
+    count = 0
+    buffer = []
+    for record in records:
+        buffer.append(_encoder.encode(to_dict(record)))
+        count += 1
+        if len(buffer) >= CHUNK_RECORDS:
+            yield (("" if count == len(buffer) else ", ") + ", ".join(buffer)).encode("utf-8")
+            buffer = []
+    if buffer:
+        yield (("" if count == len(buffer) else ", ") + ", ".join(buffer)).encode("utf-8")
+
+    tail = "]"
+    if count_key:
+        tail += f", {_encoder.encode(count_key)}: {count}"
+    yield (tail + "}").encode("utf-8")
@@ -0,0 +1,58 @@
+"""
+Event-loop watchdog that reports blocking calls made on the loop thread
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+
+class LoopBlockMonitor:
+    """Pings the event loop from a side thread and prints the loop thread's
+    stack whenever a ping is not answered within ``threshold_ms``."""
+
+    def __init__(self, threshold_ms: float, interval_ms: float = 100):
+        self.threshold = threshold_ms / 1000.0
+        self.interval = interval_ms / 1000.0
+        self.blocked_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Call from a coroutine running on ``loop`` (e.g. a startup hook)"""
+        if self._thread is not None or self.threshold <= 0:
+            return
+        loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, args=(loop, loop_thread_id), name="loop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> None:
+        while not self._stop.is_set():
+            answered = threading.Event()
+            started = time.monotonic()
+            try:
+                loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                return  # loop closed
+            if not answered.wait(self.threshold):
+                self.blocked_count += 1
+                frame = sys._current_frames().get(loop_thread_id)
+                stack = "".join(traceback.format_stack(frame)[-10:]) if frame else "<unavailable>\n"
+                print(f"Event loop blocked for more than {self.threshold * 1000:.0f}ms:\n{stack}", end="")
+                answered.wait()
+                print(f"Event loop unblocked after {(time.monotonic() - started) * 1000:.0f}ms")
+            self._stop.wait(self.interval)
+
+
+loop_monitor = LoopBlockMonitor(float(os.environ.get("LOOP_BLOCK_WARN_MS") or 500))
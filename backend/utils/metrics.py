@@ -0,0 +1,365 @@
+"""
+Prometheus-style metrics: request and stage latency histograms plus gauges
+
+Standard library only; ``render()`` produces the Prometheus text exposition
+format served at ``GET /metrics``:
+
+    http_request_duration_seconds{method,route,status}   every request (MetricsMiddleware)
+    app_stage_duration_seconds{stage,outcome}            ffmpeg, Whisper, Gemini, YouTube, disk, JSON database
+    app_stage_in_flight{stage}                           e.g. ffmpeg_trim = trim calls in progress
+    app_subprocess_in_flight{executable}                 child processes running (tracing.run_subprocess)
+    app_executor_active / app_executor_queued{kind}      backend.utils.executors pools
+    app_queue_depth{queue}                               other in-process queues (clip batcher)
+
+Stages are timed with ``stage_timer``, as a decorator or a ``with`` block;
+each timed stage is also a tracing span (backend.utils.tracing).
+
+Under gunicorn every worker has its own registry. With ``METRICS_DIR`` set
+(gunicorn.conf.py does), each process writes a snapshot there every
+``METRICS_FLUSH_SECONDS`` and on every scrape. ``/metrics`` then merges all
+snapshots: counters and histograms are summed, including those of workers
+that have since exited, so they stay monotonic across restarts. Gauges only
+come from processes that are still alive.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.utils import tracing
+
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+# Seconds; covers health checks up to long transcriptions and uploads
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+Labels = Tuple[str, ...]
+
+
+class _Metric:
+    """One metric family; values keyed by label values in ``labelnames`` order"""
+
+    def __init__(self, name: str, kind: str, help_text: str, labelnames: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) if kind == HISTOGRAM else ()
+        self.values: Dict[Labels, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self.values[self._key(labels)] = float(value)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            samples = [[list(key), json.loads(json.dumps(value))] for key, value in self.values.items()]
+        return {"kind": self.kind, "help": self.help, "labelnames": list(self.labelnames),
+                "buckets": list(self.buckets), "samples": samples}
+
+
+class MetricsRegistry:
+    def __init__(self, directory: Optional[str] = None, flush_seconds: float = 10.0):
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+
+    def _get(self, name: str, kind: str, help_text: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = _Metric(name, kind, help_text, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> _Metric:
+        return self._get(name, COUNTER, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> _Metric:
+        return self._get(name, GAUGE, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> _Metric:
+        return self._get(name, HISTOGRAM, help_text, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], None]) -> None:
+        """``collector()`` runs before every snapshot, to refresh gauges read from elsewhere"""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    # -- multi-process ---------------------------------------------------
+
+    def start_flusher(self) -> None:
+        """Publish this process's snapshot periodically (no-op without METRICS_DIR)"""
+        if not self.directory or self._flusher is not None:
+            return
+        self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            try:
+                self.publish()
+            except OSError as e:
+                print(f"Could not write metrics snapshot: {e}")
+            time.sleep(self.flush_seconds)
+
+    def publish(self) -> Dict[str, Dict[str, object]]:
+        snapshot = self.snapshot()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, os.path.join(self.directory, f"{os.getpid()}.json"))
+        return snapshot
+
+    def collect(self) -> Dict[str, Dict[str, object]]:
+        """This process's snapshot merged with the other processes' latest ones"""
+        own = self.publish()
+        if not self.directory:
+            return own
+        snapshots = [own]
+        for filename in os.listdir(self.directory):
+            pid, ext = os.path.splitext(filename)
+            if ext != ".json" or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if not _alive(int(pid)):
+                snapshot = {name: family for name, family in snapshot.items() if family["kind"] != GAUGE}
+            snapshots.append(snapshot)
+        return _merge(snapshots)
+
+    def render(self) -> str:
+        return render(self.collect())
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge(snapshots: Iterable[Dict[str, Dict[str, object]]]) -> Dict[str, Dict[str, object]]:
+    merged: Dict[str, Dict[str, object]] = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            target = merged.setdefault(name, {**family, "samples": {}})
+            if target["kind"] != family["kind"] or target["buckets"] != family["buckets"]:
+                continue  # changed definition across a deploy; keep the first seen
+            for labels, value in family["samples"]:
+                key = tuple(labels)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = json.loads(json.dumps(value))
+                elif family["kind"] == HISTOGRAM:
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+                    current[2] += value[2]
+                else:
+                    target["samples"][key] = current + value
+    for family in merged.values():
+        family["samples"] = [[list(key), value] for key, value in family["samples"].items()]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render(snapshot: Dict[str, Dict[str, object]]) -> str:
+    """Prometheus text exposition format (version 0.0.4)"""
+    lines: List[str] = []
+    for name in sorted(snapshot):
+        family = snapshot[name]
+        names = family["labelnames"]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        for labels, value in sorted(family["samples"], key=lambda sample: sample[0]):
+            if family["kind"] != HISTOGRAM:
+                lines.append(f"{name}{_labels(names, labels)} {_number(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(family["buckets"], counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{name}_bucket{_labels(names, labels, le)} {cumulative}")
+            inf = 'le="+Inf"'
+            lines.append(f"{name}_bucket{_labels(names, labels, inf)} {count}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(names, labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(os.environ.get("METRICS_DIR") or None,
+                           float(os.environ.get("METRICS_FLUSH_SECONDS") or 10))
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+STAGE_DURATION = registry.histogram(
+    "app_stage_duration_seconds", "Time spent in a pipeline stage", ("stage", "outcome")
+)
+STAGE_IN_FLIGHT = registry.gauge("app_stage_in_flight", "Pipeline stages currently running", ("stage",))
+EXECUTOR_ACTIVE = registry.gauge("app_executor_active", "Tasks running on a blocking-work executor", ("kind",))
+EXECUTOR_QUEUED = registry.gauge("app_executor_queued", "Tasks waiting for a blocking-work executor", ("kind",))
+EXECUTOR_WORKERS = registry.gauge("app_executor_workers", "Threads in a blocking-work executor", ("kind",))
+QUEUE_DEPTH = registry.gauge("app_queue_depth", "Items waiting in an in-process queue", ("queue",))
+SUBPROCESS_IN_FLIGHT = registry.gauge(
+    "app_subprocess_in_flight", "Child processes (ffmpeg, ffprobe) currently running", ("executable",)
+)
+
+
+class stage_timer(contextlib.ContextDecorator):
+    """Record the duration of a pipeline stage (``with stage_timer("db_load"):`` or ``@stage_timer("db_load")``)"""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        # One decorator instance serves every call, so start times are kept per thread
+        self._local = threading.local()
+
+    def __enter__(self):
+        STAGE_IN_FLIGHT.inc(stage=self.stage)
+        self._stack().append((time.perf_counter(), tracing.start_span(self.stage)))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        started, span = self._stack().pop()
+        tracing.end_span(span, exc)
+        STAGE_IN_FLIGHT.dec(stage=self.stage)
+        STAGE_DURATION.observe(time.perf_counter() - started, stage=self.stage,
+                               outcome="error" if exc_type is not None else "ok")
+        return False
+
+    def _stack(self) -> List[Tuple[float, tracing.Handle]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+def _collect_executor_stats() -> None:
+    from backend.utils.executors import executor_stats
+
+    for kind, stats in executor_stats().items():
+        EXECUTOR_ACTIVE.set(stats["active"], kind=kind)
+        EXECUTOR_QUEUED.set(stats["queued"], kind=kind)
+        EXECUTOR_WORKERS.set(stats["workers"], kind=kind)
+
+
+registry.register_collector(_collect_executor_stats)
+
+
+def _collect_subprocess_stats() -> None:
+    for executable, running in tracing.subprocess_stats().items():
+        SUBPROCESS_IN_FLIGHT.set(running, executable=executable)
+
+
+registry.register_collector(_collect_subprocess_stats)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by its route template.
+
+    Paths that match no route are reported as ``<unmatched>`` so random URLs
+    cannot create unbounded label values.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_DURATION.observe(time.perf_counter() - started, method=scope.get("method", ""),
+                                     route=route_template(scope), status=str(status["code"]))
+
+
+def route_template(scope) -> str:
+    """Route path template for an ASGI scope that has been through the router"""
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    from starlette.routing import Match
+
+    app = scope.get("app")
+    for candidate in getattr(app, "routes", ()):
+        match, _ = candidate.matches(scope)
+        if match == Match.FULL:
+            return getattr(candidate, "path", "<unmatched>")
+    return "<unmatched>"
@@ -0,0 +1,80 @@
+"""
+Cursor pagination, field selection and NDJSON streaming for list endpoints
+"""
+
+import base64
+import json
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.utils.config import Config
+
+
+@dataclass
+class Page:
+    """One page of a keyed, sorted result set"""
+    items: List[Any]
+    next_cursor: Optional[str]
+    total: int
+
+
+def encode_cursor(key: str) -> str:
+    """Opaque cursor pointing just after ``key``"""
+    return base64.urlsafe_b64encode(json.dumps({"after": key}).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["after"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(items: Sequence[Any], key: Callable[[Any], str],
+             cursor: Optional[str] = None, limit: Optional[int] = None) -> Page:
+    """Slice ``items`` (sorted by ``key``) after the cursor position.
+
+    Cursors carry the last key rather than an offset, so pages stay stable
+    when videos are added or removed between requests. Without a limit and
+    a cursor the full result set is returned, as before pagination existed.
+    """
+    if limit is None and cursor is None:
+        return Page(items=list(items), next_cursor=None, total=len(items))
+    ordered = sorted(items, key=key)
+    keys = [key(item) for item in ordered]
+    start = bisect_right(keys, decode_cursor(cursor)) if cursor else 0
+    limit = min(limit or Config.PAGE_MAX_LIMIT, Config.PAGE_MAX_LIMIT)
+    end = start + limit
+    page = ordered[start:end]
+    next_cursor = encode_cursor(keys[end - 1]) if end < len(ordered) and page else None
+    return Page(items=page, next_cursor=next_cursor, total=len(ordered))
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """'title,size' -> ['title', 'size']; None/empty selects everything"""
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(",") if f.strip()] or None
+
+
+def project(record: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    if fields is None:
+        return record
+    return {name: record.get(name) for name in fields}
+
+
+def _iter_ndjson(records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    for record in records:
+        yield (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def ndjson_response(records: Iterable[Dict[str, Any]], page: Page) -> StreamingResponse:
+    """Stream one JSON record per line; paging info travels in headers"""
+    headers = {"X-Total-Count": str(page.total)}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return StreamingResponse(_iter_ndjson(records), media_type="application/x-ndjson", headers=headers)
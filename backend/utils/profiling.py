@@ -0,0 +1,302 @@
+"""
+On-demand profiling of a single request
+
+Admin-only: with ``PROFILE_ADMIN_TOKEN`` set, a request carrying
+``?profile=1`` (or ``X-Profile: 1``) plus ``X-Profile-Token: <token>`` is
+profiled end to end, and the response gets an ``X-Profile-Id`` header. Without
+the token setting the flag is ignored. The capture covers the event-loop
+thread and every executor thread that runs work for the request, because
+``run_blocking`` carries the request's context into them. It records:
+
+    <id>.prof     cProfile stats (python -m pstats, snakeviz, flameprof)
+    <id>.folded   stacks sampled every PROFILE_SAMPLE_MS, in collapsed format
+                  (flamegraph.pl, speedscope, inferno)
+    <id>.json     request, timings and the top functions by cumulative and own time
+
+Files go to ``PROFILE_DIR`` (default data/profiles), keeping the newest
+``PROFILE_KEEP`` captures; /api/admin/profiles lists and serves them.
+
+One request is profiled at a time per process; a second one runs normally,
+with ``X-Profile-Id: busy``. Loop-thread samples include whatever else the
+loop ran during the request. Work in the model server process or the clip
+batcher thread is not captured.
+"""
+
+import contextlib
+import cProfile
+import hmac
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+ADMIN_TOKEN = os.environ.get("PROFILE_ADMIN_TOKEN") or ""
+PROFILE_DIR = os.environ.get("PROFILE_DIR") or "data/profiles"
+SAMPLE_INTERVAL = float(os.environ.get("PROFILE_SAMPLE_MS") or 5) / 1000.0
+KEEP = int(os.environ.get("PROFILE_KEEP") or 50)
+
+_active: ContextVar[Optional["ProfileSession"]] = ContextVar("profile_session", default=None)
+_busy = threading.Lock()
+_NULL = contextlib.nullcontext()
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def enabled() -> bool:
+    return bool(ADMIN_TOKEN)
+
+
+def token_valid(token: Optional[str]) -> bool:
+    return enabled() and token is not None and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename.replace("\\", "/")
+    short = "/".join(path.rsplit("/", 2)[-2:])
+    return f"{code.co_name} ({short}:{code.co_firstlineno})".replace(";", ",")
+
+
+class ProfileSession:
+    """Profilers and stack samples for one request across the threads it uses"""
+
+    def __init__(self, method: str, path: str):
+        now = datetime.now(timezone.utc)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-")[:60] or "root"
+        self.id = f"{now.strftime('%Y%m%dT%H%M%S')}_{method.lower()}_{slug}_{uuid.uuid4().hex[:6]}"
+        self.method = method
+        self.path = path
+        self.started_at = now.isoformat(timespec="milliseconds")
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.status: Optional[int] = None
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._threads: Dict[int, str] = {}
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._local = threading.local()
+
+    # -- capture ---------------------------------------------------------
+
+    def start(self) -> None:
+        self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = dict(self._threads)
+            for ident, name in threads.items():
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.samples[name + ";" + ";".join(reversed(stack))] += 1
+                self.sample_count += 1
+
+    @contextlib.contextmanager
+    def attach(self) -> Any:
+        """Profile the calling thread until the block exits"""
+        if getattr(self._local, "attached", False) or self._stop.is_set():
+            yield  # nested run_blocking, or the request already finished
+            return
+        ident = threading.get_ident()
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            profile = None  # another profiler owns this thread (or the process, on 3.12+)
+        self._local.attached = True
+        with self._lock:
+            self._threads[ident] = threading.current_thread().name
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            self._local.attached = False
+            with self._lock:
+                self._threads.pop(ident, None)
+                if profile is not None:
+                    self._profiles.append(profile)
+
+    def finish(self, status: Optional[int]) -> None:
+        self.duration = time.perf_counter() - self.started
+        self.status = status
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(1.0)
+
+    # -- output ----------------------------------------------------------
+
+    def _stats(self) -> Optional[pstats.Stats]:
+        stats = None
+        for profile in self._profiles:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profile, stream=io.StringIO())
+                else:
+                    stats.add(profile)
+            except TypeError:
+                continue  # a profiler that recorded no calls
+        return stats
+
+    def save(self, directory: str = PROFILE_DIR) -> Dict[str, Any]:
+        """Write the .prof/.folded/.json files and prune old captures"""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, self.id)
+        stats = self._stats()
+        top_cumulative: List[Dict[str, Any]] = []
+        top_own: List[Dict[str, Any]] = []
+        if stats is not None:
+            stats.dump_stats(base + ".prof")
+            rows = [
+                {"function": f"{func} ({'/'.join(filename.replace(chr(92), '/').rsplit('/', 2)[-2:])}:{line})",
+                 "calls": nc, "own_s": round(tt, 6), "cumulative_s": round(ct, 6)}
+                for (filename, line, func), (_cc, nc, tt, ct, _callers) in stats.stats.items()
+            ]
+            top_cumulative = sorted(rows, key=lambda r: r["cumulative_s"], reverse=True)[:25]
+            top_own = sorted(rows, key=lambda r: r["own_s"], reverse=True)[:25]
+        with open(base + ".folded", "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        summary = {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 1),
+            "samples": self.sample_count,
+            "sample_interval_ms": SAMPLE_INTERVAL * 1000,
+            "files": [os.path.basename(base) + ext for ext in (".prof", ".folded", ".json")
+                      if ext != ".prof" or stats is not None],
+            "top_cumulative": top_cumulative,
+            "top_own": top_own,
+        }
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        prune(directory, KEEP)
+        return summary
+
+
+def attach_thread():
+    """Context manager joining the calling thread to the current request's profile, if any"""
+    session = _active.get()
+    return session.attach() if session is not None else _NULL
+
+
+def prune(directory: str, keep: int) -> None:
+    summaries = sorted(f for f in os.listdir(directory) if f.endswith(".json"))
+    for name in summaries[:max(0, len(summaries) - keep)]:
+        stem = name[:-len(".json")]
+        for ext in (".json", ".prof", ".folded"):
+            try:
+                os.remove(os.path.join(directory, stem + ext))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles(directory: str = PROFILE_DIR) -> List[Dict[str, Any]]:
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        summary.pop("top_cumulative", None)
+        summary.pop("top_own", None)
+        profiles.append(summary)
+    return profiles
+
+
+def profile_file(name: str, directory: str = PROFILE_DIR) -> Optional[str]:
+    """Path of a capture file by name; None for unknown or unsafe names"""
+    if not _SAFE_NAME.match(name) or not name.endswith((".prof", ".folded", ".json")):
+        return None
+    path = os.path.join(directory, name)
+    return path if os.path.isfile(path) else None
+
+
+def _requested(scope) -> bool:
+    headers = dict(scope.get("headers") or [])
+    if headers.get(b"x-profile", b"").strip() in (b"1", b"true"):
+        return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get("profile", [""])[-1] in ("1", "true")
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests flagged with ?profile=1 / X-Profile by an admin"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not enabled() or not _requested(scope):
+            await self.app(scope, receive, send)
+            return
+        token = dict(scope.get("headers") or []).get(b"x-profile-token", b"").decode("latin-1")
+        if not token_valid(token):
+            body = b'{"detail":"A valid X-Profile-Token header is required to profile a request"}'
+            await send({"type": "http.response.start", "status": 403,
+                        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+            await send({"type": "http.response.body", "body": body})
+            return
+        if not _busy.acquire(blocking=False):
+            await self.app(scope, receive, _with_header(send, b"busy"))
+            return
+
+        session = ProfileSession(scope.get("method", ""), scope.get("path", ""))
+        status: Dict[str, Optional[int]] = {"code": None}
+        profile_header = session.id.encode("latin-1")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await _with_header(send, profile_header)(message)
+
+        token_ = _active.set(session)
+        session.start()
+        try:
+            with session.attach():
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            _active.reset(token_)
+            session.finish(status["code"])
+            _busy.release()
+            from backend.utils.executors import DISK, run_blocking
+
+            try:
+                await run_blocking(DISK, session.save)
+            except OSError as e:
+                print(f"Could not save profile {session.id}: {e}")
+
+
+def _with_header(send, value: bytes):
+    async def wrapper(message):
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": list(message.get("headers") or []) + [(b"x-profile-id", value)]}
+        await send(message)
+    return wrapper
@@ -0,0 +1,22 @@
+"""
+__slots__ support for dataclasses on Python 3.9
+"""
+
+from dataclasses import fields
+
+
+def add_slots(cls):
+    """Rebuild a dataclass with __slots__, like dataclass(slots=True) on 3.10+.
+
+    Instances drop their per-object __dict__, which roughly halves the memory
+    of small records such as VideoInfo when a scan holds 100k of them.
+    """
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names
+    for name in field_names:
+        # Defaults live in the generated __init__; class attributes would clash with slots
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
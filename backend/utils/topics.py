@@ -0,0 +1,127 @@
+"""
+Shared filename topic classifier
+
+All keywords of a vocabulary are compiled into one Aho-Corasick automaton, so a
+filename is scanned once no matter how many keywords there are, and results
+are memoized per filename for full-library rescans.
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton reporting which keywords occur as substrings"""
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                state = nxt
+            self._out[state].add(index)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find_all(self, text: str) -> Set[int]:
+        """Indices of every keyword occurring in ``text``"""
+        found: Set[int] = set()
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+    def first(self, text: str) -> Optional[int]:
+        """Lowest keyword index occurring in ``text`` (keyword list order = priority)"""
+        found = self.find_all(text)
+        return min(found) if found else None
+
+
+# Video library topics, in priority order (first matching keyword wins)
+VIDEO_TOPIC_KEYWORDS: Dict[str, str] = {
+    'ai': 'artificial intelligence',
+    'ml': 'machine learning',
+    'pilot': 'pilot decision-making',
+    'tutorial': 'tutorial',
+    'guide': 'guide',
+    'tips': 'tips and tricks',
+    'review': 'product review',
+    'demo': 'demonstration',
+    'coding': 'programming',
+    'tech': 'technology',
+    'data': 'data science',
+    'vision': 'computer vision',
+    'deep': 'deep learning',
+    'neural': 'neural networks'
+}
+
+# Caption/title context buckets; every bucket with a matching keyword is reported
+FILENAME_BUCKETS: Dict[str, List[str]] = {
+    "tutorial": ["tutorial", "howto", "guide", "learn", "education", "teaching"],
+    "story": ["story", "narrative", "journey", "experience"],
+    "funny": ["funny", "humor", "comedy", "laugh", "joke", "hilarious"],
+    "inspiration": ["inspiration", "motivation", "success", "achievement", "goal"],
+    "review": ["review", "analysis", "opinion", "thoughts", "feedback"],
+    "tech": ["tech", "technology", "gadget", "app", "software"],
+    "business": ["business", "entrepreneur", "startup", "money"],
+    "fitness": ["fitness", "workout", "exercise", "health", "training"],
+}
+
+_video_matcher = KeywordMatcher([k.lower() for k in VIDEO_TOPIC_KEYWORDS])
+_video_topics = list(VIDEO_TOPIC_KEYWORDS.values())
+
+_bucket_labels = list(FILENAME_BUCKETS)
+_bucket_keywords: List[Tuple[str, int]] = [
+    (keyword, label_index)
+    for label_index, label in enumerate(_bucket_labels)
+    for keyword in FILENAME_BUCKETS[label]
+]
+_bucket_matcher = KeywordMatcher([keyword for keyword, _ in _bucket_keywords])
+
+_SEPARATORS = re.compile(r'[_-]')
+_DIGITS = re.compile(r'\d+')
+
+
+@lru_cache(maxsize=65536)
+def classify_video_topic(filename: str) -> str:
+    """Topic for a video file stem; falls back to the cleaned name"""
+    clean_name = _DIGITS.sub('', _SEPARATORS.sub(' ', filename)).strip().lower()
+    match = _video_matcher.first(clean_name)
+    if match is not None:
+        return _video_topics[match]
+    return clean_name or "general content"
+
+
+@lru_cache(maxsize=65536)
+def filename_buckets(name: str) -> Tuple[str, ...]:
+    """Context labels for a filename, in bucket order, at most five"""
+    labels = {_bucket_keywords[i][1] for i in _bucket_matcher.find_all(name.lower())}
+    return tuple(_bucket_labels[i] for i in sorted(labels))[:5]
@@ -0,0 +1,386 @@
+"""
+Request tracing: spans across HTTP requests, ffmpeg, Whisper, Gemini and file I/O
+
+Spans follow the OpenTelemetry data model and are exported as OTLP/JSON
+(``ExportTraceServiceRequest``), so any OpenTelemetry collector or backend
+can read them. Standard library only:
+
+    TRACE_OTLP_ENDPOINT   POST batches to an OTLP/HTTP collector, e.g. http://localhost:4318/v1/traces
+    TRACE_FILE            otherwise append one export request per line (default data/traces.jsonl)
+
+Where spans come from:
+    TracingMiddleware     one server span per HTTP request; honours and returns W3C ``traceparent``
+    stage_timer           every timed stage in backend.utils.metrics is also a span
+    run_subprocess        one span per ffmpeg / ffprobe invocation
+
+The current span lives in a context variable. ``run_blocking`` copies the
+context into executor threads, and the model server continues the caller's
+trace through the ``traceparent`` it is passed.
+
+Sampling is decided once per trace, at its root. ``TRACE_SAMPLE_RATIO``
+(default 0.01) of traces are recorded and exported; for the rest, every span
+call returns immediately. ``TRACE_SLOW_MS`` > 0 additionally records every
+trace in memory and exports any whose root took at least that long. Spans
+are cheap, but serialization is not, and it happens on a background thread
+either way. ``TRACE_SAMPLE_RATIO=0`` with ``TRACE_SLOW_MS=0`` disables tracing.
+"""
+
+import contextlib
+import json
+import os
+import queue
+import random
+import subprocess
+import threading
+import time
+import urllib.request
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SAMPLE_RATIO = float(os.environ.get("TRACE_SAMPLE_RATIO") or 0.01)
+SLOW_MS = float(os.environ.get("TRACE_SLOW_MS") or 0)
+TRACE_FILE = os.environ.get("TRACE_FILE") or "data/traces.jsonl"
+OTLP_ENDPOINT = os.environ.get("TRACE_OTLP_ENDPOINT") or ""
+SERVICE_NAME = os.environ.get("TRACE_SERVICE_NAME") or "video-caption-generator"
+
+# OTLP span kinds and status codes
+INTERNAL = 1
+SERVER = 2
+CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_NOT_RECORDING = object()  # context marker: inside a trace that was not sampled
+_current: ContextVar[Any] = ContextVar("trace_span", default=None)
+_rng = random.Random()
+
+
+class _Trace:
+    __slots__ = ("trace_id", "sampled", "spans")
+
+    def __init__(self, trace_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans: List["Span"] = []
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "error", "is_root")
+
+    def __init__(self, trace: _Trace, name: str, kind: int, parent_id: str, attributes: Optional[Dict[str, Any]], is_root: bool):
+        self.trace = trace
+        self.span_id = "%016x" % _rng.getrandbits(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = dict(attributes) if attributes else {}
+        self.error: Optional[str] = None
+        self.is_root = is_root
+        trace.spans.append(self)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace.trace_id}-{self.span_id}-{'01' if self.trace.sampled else '00'}"
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": STATUS_ERROR, "message": self.error} if self.error is not None else {"code": STATUS_OK},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+Handle = Optional[Tuple[Optional[Span], Token]]
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """(trace id, parent span id, sampled) from a W3C traceparent header"""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        if int(parts[1], 16) == 0 or int(parts[2], 16) == 0:
+            return None
+        sampled = bool(int(parts[3][:2], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1].lower(), parts[2].lower(), sampled
+
+
+def enabled() -> bool:
+    return SAMPLE_RATIO > 0 or SLOW_MS > 0
+
+
+def start_span(name: str, kind: int = INTERNAL, attributes: Optional[Dict[str, Any]] = None,
+               remote_parent: Optional[Tuple[str, str, bool]] = None) -> Handle:
+    """Open a span as a child of the current one (or a new trace); pair with ``end_span``"""
+    parent = _current.get()
+    if parent is _NOT_RECORDING:
+        return None
+    if isinstance(parent, Span):
+        span = Span(parent.trace, name, kind, parent.span_id, attributes, is_root=False)
+        return span, _current.set(span)
+    if not enabled():
+        return None
+    # New local root: sample once for the whole trace
+    if remote_parent is not None:
+        trace_id, parent_id, sampled = remote_parent
+    else:
+        trace_id, parent_id, sampled = "%032x" % _rng.getrandbits(128), "", _rng.random() < SAMPLE_RATIO
+    if not sampled and SLOW_MS <= 0:
+        return None, _current.set(_NOT_RECORDING)
+    span = Span(_Trace(trace_id, sampled), name, kind, parent_id, attributes, is_root=True)
+    return span, _current.set(span)
+
+
+def end_span(handle: Handle, error: Optional[BaseException] = None) -> None:
+    if handle is None:
+        return
+    span, token = handle
+    try:
+        _current.reset(token)
+    except ValueError:
+        pass  # ended from another context; the span is still recorded
+    if span is None:
+        return
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"[:500]
+    if span.is_root:
+        slow = SLOW_MS > 0 and (span.end_ns - span.start_ns) >= SLOW_MS * 1_000_000
+        if span.trace.sampled or slow:
+            exporter.submit([s for s in span.trace.spans if s.end_ns])
+
+
+def current_span() -> Optional[Span]:
+    span = _current.get()
+    return span if isinstance(span, Span) else None
+
+
+def set_attribute(key: str, value: Any) -> None:
+    span = current_span()
+    if span is not None:
+        span.set_attribute(key, value)
+
+
+def current_traceparent() -> Optional[str]:
+    """traceparent to hand to another process, or None outside any trace"""
+    span = _current.get()
+    if isinstance(span, Span):
+        return span.traceparent
+    if span is _NOT_RECORDING:
+        return "00-%032x-%016x-00" % (_rng.getrandbits(128), _rng.getrandbits(64))
+    return None
+
+
+@contextlib.contextmanager
+def span(name: str, kind: int = INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+    handle = start_span(name, kind, attributes)
+    try:
+        yield handle[0] if handle else None
+    except BaseException as e:
+        end_span(handle, e)
+        raise
+    end_span(handle)
+
+
+@contextlib.contextmanager
+def continue_trace(traceparent: Optional[str], name: str) -> Iterator[Optional[Span]]:
+    """Root span in this process joined to the caller's trace (model server side)"""
+    handle = start_span(name, SERVER, remote_parent=parse_traceparent(traceparent))
+    try:
+        yield handle[0] if handle else None
+    except BaseException as e:
+        end_span(handle, e)
+        raise
+    end_span(handle)
+
+
+# Child processes currently running through run_subprocess, by executable
+# (exported as app_subprocess_in_flight by backend.utils.metrics)
+_subprocess_in_flight: Dict[str, int] = {}
+_subprocess_lock = threading.Lock()
+
+
+def subprocess_stats() -> Dict[str, int]:
+    with _subprocess_lock:
+        return dict(_subprocess_in_flight)
+
+
+def run_subprocess(cmd, **kwargs) -> subprocess.CompletedProcess:
+    """``subprocess.run`` with a span carrying the command line and exit code"""
+    argv = cmd.split() if isinstance(cmd, str) else [str(a) for a in cmd]
+    executable = os.path.basename(argv[0]) if argv else "?"
+    with _subprocess_lock:
+        _subprocess_in_flight[executable] = _subprocess_in_flight.get(executable, 0) + 1
+    try:
+        return _run_traced(cmd, argv, executable, kwargs)
+    finally:
+        with _subprocess_lock:
+            _subprocess_in_flight[executable] -= 1
+
+
+def _run_traced(cmd, argv: List[str], executable: str, kwargs: Dict[str, Any]) -> subprocess.CompletedProcess:
+    handle = start_span(f"subprocess {executable}", CLIENT, {
+        "process.executable.name": executable,
+        "process.command_line": " ".join(argv)[:512],
+    })
+    try:
+        result = subprocess.run(cmd, **kwargs)
+    except BaseException as e:
+        end_span(handle, e)
+        raise
+    if handle and handle[0] is not None:
+        handle[0].set_attribute("process.exit_code", result.returncode)
+    end_span(handle, RuntimeError(f"exit code {result.returncode}") if result.returncode else None)
+    return result
+
+
+class _Exporter:
+    """Background thread that serializes finished traces and writes or posts them"""
+
+    def __init__(self, max_queued: int = 1000):
+        self.dropped = 0
+        self.exported = 0
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize=max_queued)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, spans: List[Span]) -> None:
+        if not spans:
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 100:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            done = None in batch
+            traces = [spans for spans in batch if spans is not None]
+            if traces:
+                try:
+                    self._export(traces)
+                    self.exported += len(traces)
+                except Exception as e:
+                    self.dropped += len(traces)
+                    print(f"Trace export failed: {e}")
+            if done:
+                return
+
+    def _export(self, traces: List[List[Span]]) -> None:
+        def request(spans: List[Span]) -> Dict[str, Any]:
+            return {"resourceSpans": [{
+                "resource": {"attributes": [_attribute("service.name", SERVICE_NAME), _attribute("process.pid", os.getpid())]},
+                "scopeSpans": [{"scope": {"name": "backend.utils.tracing"}, "spans": [s.to_otlp() for s in spans]}],
+            }]}
+
+        if OTLP_ENDPOINT:
+            body = json.dumps(request([s for spans in traces for s in spans])).encode("utf-8")
+            req = urllib.request.Request(OTLP_ENDPOINT, data=body, headers={"Content-Type": "application/json"})
+            with urllib.request.urlopen(req, timeout=5) as resp:
+                resp.read()
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(TRACE_FILE)), exist_ok=True)
+        with open(TRACE_FILE, "a", encoding="utf-8") as f:
+            for spans in traces:
+                f.write(json.dumps(request(spans), separators=(",", ":")) + "\n")
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """Flush queued traces (called on app shutdown)"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+
+exporter = _Exporter()
+
+
+class TracingMiddleware:
+    """ASGI middleware opening the server span for every HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not enabled():
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        remote = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        method = scope.get("method", "")
+        handle = start_span(f"{method} {scope.get('path', '')}", SERVER, {
+            "http.request.method": method,
+            "url.path": scope.get("path", ""),
+        }, remote_parent=remote)
+        span_ = handle[0] if handle else None
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and span_ is not None:
+                span_.set_attribute("http.response.status_code", message["status"])
+                message = {**message, "headers": list(message.get("headers") or []) + [
+                    (b"traceparent", span_.traceparent.encode("latin-1"))
+                ]}
+            await send(message)
+
+        error: Optional[BaseException] = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if span_ is not None:
+                from backend.utils.metrics import route_template
+
+                route = route_template(scope)
+                span_.set_attribute("http.route", route)
+                span_.name = f"{method} {route}"
+                if error is None and span_.attributes.get("http.response.status_code", 200) >= 500:
+                    span_.error = f"HTTP {span_.attributes['http.response.status_code']}"
+            end_span(handle, error)
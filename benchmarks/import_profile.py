@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of the API entry point
+
+Runs ``python -X importtime -c "import backend.main"`` in a fresh interpreter
+and reports the total import time and the slowest top-level packages. With
+--baseline, exits non-zero when the total regresses by more than --tolerance
+percent or when a package listed in --forbid shows up (e.g. heavy libraries
+that should only load on first use):
+
+    python benchmarks/import_profile.py --out benchmarks/import_profile.json
+    python benchmarks/import_profile.py --baseline benchmarks/import_profile.json \\
+        --forbid faster_whisper,googleapiclient,google.generativeai,pypdf,docx,pptx,bs4
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+def profile_imports(module: str, python: str = sys.executable) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every import made by ``import module``"""
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-5:]
+        raise SystemExit(f"import {module} failed:\n" + "\n".join(tail))
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def summarize(rows: List[Tuple[str, int, int]], top: int) -> Dict[str, object]:
+    # Self time rolled up by top-level package, so a package's cost is
+    # attributed to it no matter which module imported it first
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    total_us = sum(self_us for _, self_us, _ in rows)
+    slowest = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "modules": len(rows),
+        "packages_ms": {name: round(us / 1000, 1) for name, us in slowest},
+        "imported": sorted({name for name, _, _ in rows}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=3, help="take the fastest of N runs")
+    parser.add_argument("--out", help="write the report as JSON")
+    parser.add_argument("--baseline", help="previous report to compare against")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="allowed regression in percent")
+    parser.add_argument("--forbid", default="", help="comma-separated modules that must not be imported")
+    args = parser.parse_args()
+
+    report = min(
+        (summarize(profile_imports(args.module), args.top) for _ in range(max(1, args.runs))),
+        key=lambda r: r["total_ms"],
+    )
+    print(f"import {args.module}: {report['total_ms']}ms across {report['modules']} modules")
+    for name, ms in report["packages_ms"].items():
+        print(f"  {ms:>9.1f}ms  {name}")
+
+    failures = []
+    imported = set(report["imported"])
+    for name in filter(None, (n.strip() for n in args.forbid.split(","))):
+        if name in imported:
+            failures.append(f"{name} is imported at startup")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        limit = baseline["total_ms"] * (1 + args.tolerance / 100)
+        print(f"baseline: {baseline['total_ms']}ms (limit {limit:.1f}ms)")
+        if report["total_ms"] > limit:
+            failures.append(f"import time {report['total_ms']}ms exceeds {limit:.1f}ms")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the media pipeline
+
+Generates its own inputs (ffmpeg ``lavfi`` test sources, a synthetic PDF and a
+synthetic ``storage/`` tree) under --workdir, then measures:
+
+    ingest        spool_upload throughput (MB/s)
+    trim          ms per clip, stream copy vs re-encode (video_trim.trim_command)
+    transcribe    real-time factor per profile (whisper_transcribe; lower is faster)
+    documents     PDF text extraction pages/s (extract_paged_text)
+    clips_by_date both /clips-by-date implementations against --tree-files clips
+
+Each run is appended to --history with the commit it ran on. The run is
+compared with the previous one from the same host and sizes, and regressions
+beyond --tolerance percent are flagged (--check makes them fatal):
+
+    python benchmarks/media_pipeline.py
+    python benchmarks/media_pipeline.py --skip transcribe --tree-files 10000 --check
+
+Generated inputs are reused between runs; delete --workdir to rebuild them.
+Pass --speech with a real recording for meaningful transcription numbers:
+tones are mostly skipped by VAD and make the RTF look better than it is.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STAGES = ("ingest", "trim", "transcribe", "documents", "clips_by_date")
+SPEECH_TEXT = (
+    "This is a synthetic benchmark recording. The quick brown fox jumps over the lazy dog. "
+    "We are measuring how fast the pipeline turns short clips into captions and titles."
+)
+
+
+def _ffmpeg(*args: str) -> None:
+    subprocess.run(["ffmpeg", "-nostdin", "-v", "error", "-y", *args], check=True)
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> List[float]:
+    times = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def make_video(path: str, seconds: int) -> None:
+    """720p test pattern with a tone; a keyframe every 2 s so stream copy has cut points"""
+    if os.path.exists(path):
+        return
+    _ffmpeg(
+        "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate=30:duration={seconds}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=48000:duration={seconds}",
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", "60", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest", path,
+    )
+
+
+def make_speech(path: str, seconds: int, source: Optional[str]) -> bool:
+    """16 kHz mono WAV of ``seconds``; True when it contains speech rather than a tone"""
+    if source:
+        _ffmpeg("-stream_loop", "-1", "-i", source, "-t", str(seconds), "-ac", "1", "-ar", "16000", path)
+        return True
+    if os.path.exists(path):
+        return os.path.exists(path + ".speech")
+    text_path = path + ".txt"
+    with open(text_path, "w", encoding="utf-8") as f:
+        f.write(" ".join([SPEECH_TEXT] * (seconds // 10 + 1)))  # ~10 s of speech per copy
+    try:
+        # flite is only present in ffmpeg builds with --enable-libflite
+        _ffmpeg("-f", "lavfi", "-i", f"flite=textfile={text_path}", "-t", str(seconds), "-ac", "1", "-ar", "16000", path)
+        open(path + ".speech", "w").close()
+        return True
+    except subprocess.CalledProcessError:
+        _ffmpeg("-f", "lavfi", "-i", f"sine=frequency=300:sample_rate=16000:duration={seconds}",
+                "-ac", "1", path)
+        return False
+
+
+def make_pdf(path: str, pages: int) -> None:
+    """Uncompressed PDF with a few lines of Helvetica text per page"""
+    if os.path.exists(path):
+        return
+    objects: List[bytes] = [b"", b""]  # 1: catalog, 2: page tree, filled in below
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")  # 3
+    kids = []
+    for number in range(1, pages + 1):
+        lines = [f"Page {number} of the synthetic benchmark document."] + [SPEECH_TEXT[i:i + 80] for i in range(0, len(SPEECH_TEXT), 80)]
+        text = "".join(f"({line}) Tj T* " for line in lines)
+        stream = f"BT /F1 11 Tf 14 TL 72 720 Td {text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % content_id
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def make_storage_tree(root: str, files: int) -> None:
+    """storage/YYYY/MM/DD/{clips,original} spread over two years of days"""
+    marker = os.path.join(root, ".tree-files")
+    if os.path.exists(marker):
+        with open(marker) as f:
+            if int(f.read().strip() or 0) == files:
+                return
+    shutil.rmtree(os.path.join(root, "storage"), ignore_errors=True)
+    days = [(year, month, day) for year in (2024, 2025) for month in range(1, 13) for day in range(1, 29)]
+    per_day = max(1, files // len(days))
+    created = 0
+    for year, month, day in days:
+        base = os.path.join(root, "storage", f"{year}", f"{month:02d}", f"{day:02d}")
+        clips_dir = os.path.join(base, "clips")
+        os.makedirs(clips_dir, exist_ok=True)
+        os.makedirs(os.path.join(base, "original"), exist_ok=True)
+        for index in range(min(per_day, files - created)):
+            open(os.path.join(clips_dir, f"clip_{index:05d}.mp4"), "wb").close()
+            created += 1
+        if created >= files:
+            break
+    with open(marker, "w") as f:
+        f.write(str(files))
+
+
+def bench_ingest(workdir: str, size_mb: int, repeat: int) -> Dict[str, float]:
+    from backend.app.services.upload_ingest import MEDIA, spool_upload
+
+    blob = os.path.join(workdir, f"ingest_{size_mb}mb.mp4")
+    if not os.path.exists(blob) or os.path.getsize(blob) != size_mb * 1024 * 1024:
+        with open(blob, "wb") as f:
+            f.write(b"\x00\x00\x00\x18ftypmp42")  # sniffs as media
+            chunk = os.urandom(1024 * 1024)
+            for _ in range(size_mb):
+                f.write(chunk)
+            f.truncate(size_mb * 1024 * 1024)
+
+    def run():
+        with open(blob, "rb") as f:
+            # spool_upload only needs UploadFile's filename / file / size
+            spooled = spool_upload(types.SimpleNamespace(filename="bench.mp4", file=f, size=None), kind=MEDIA)
+        os.remove(spooled.path)
+
+    best = min(_timed(run, repeat))
+    return {"mb_per_s": round(size_mb / best, 1)}
+
+
+def bench_trim(video: str, seconds: int, clips: int, clip_seconds: float, workdir: str, repeat: int) -> Dict[str, float]:
+    from backend.app.services.video_trim import trim_command
+
+    out_dir = os.path.join(workdir, "clips")
+    os.makedirs(out_dir, exist_ok=True)
+    step = max(clip_seconds, (seconds - clip_seconds) / max(1, clips))
+    spans = [(round(i * step + 0.7, 2), round(i * step + 0.7 + clip_seconds, 2)) for i in range(clips)]
+    spans = [(start, end) for start, end in spans if end <= seconds]
+    results = {}
+    for mode, copy in (("copy", True), ("reencode", False)):
+        def run():
+            for index, (start, end) in enumerate(spans):
+                out_path = os.path.join(out_dir, f"{mode}_{index}.mp4")
+                subprocess.run(trim_command(video, start, end, out_path, copy=copy), capture_output=True, check=True)
+
+        best = min(_timed(run, repeat))
+        results[f"{mode}_ms_per_clip"] = round(best / len(spans) * 1000, 1)
+    return results
+
+
+def bench_transcribe(audio: str, seconds: int, profiles: List[str], repeat: int) -> Dict[str, float]:
+    from backend.app.services.transcription import whisper_transcribe
+
+    results = {}
+    for profile in profiles:
+        whisper_transcribe(audio, profile)  # load this profile's model outside the timing
+        best = min(_timed(lambda: whisper_transcribe(audio, profile), repeat))
+        results[f"{profile}_rtf"] = round(best / seconds, 4)
+    return results
+
+
+def bench_documents(pdf: str, pages: int, repeat: int) -> Dict[str, float]:
+    from backend.app.services.extraction import PDF, extract_paged_text
+
+    extract_paged_text(pdf, PDF)  # start the process pool outside the timing
+    best = min(_timed(lambda: extract_paged_text(pdf, PDF), repeat))
+    return {"pages_per_s": round(pages / best, 1)}
+
+
+def bench_clips_by_date(workdir: str, repeat: int) -> Dict[str, float]:
+    # Both implementations resolve storage/ relative to the working directory
+    from backend.app.routers.video import _group_clips_by_date
+    from backend.routers.video_management import _clips_by_date
+
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        return {
+            "app_ms": round(statistics.median(_timed(_group_clips_by_date, repeat)) * 1000, 1),
+            "legacy_ms": round(statistics.median(_timed(_clips_by_date, repeat)) * 1000, 1),
+        }
+    finally:
+        os.chdir(previous)
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_s")
+
+
+def compare(previous: Dict[str, float], current: Dict[str, float], tolerance: float) -> List[str]:
+    regressions = []
+    for metric, value in sorted(current.items()):
+        before = previous.get(metric)
+        if not before:
+            print(f"  {metric:<36} {value:>10}")
+            continue
+        change = (value - before) / before * 100
+        worse = -change if _higher_is_better(metric) else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        print(f"  {metric:<36} {value:>10}  ({change:+.1f}% vs {before}){flag}")
+        if flag:
+            regressions.append(f"{metric} {before} -> {value}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "yta-media-bench"))
+    parser.add_argument("--history", default=os.path.join(ROOT, "benchmarks", "history.json"))
+    parser.add_argument("--skip", default="", help=f"comma-separated stages to skip: {', '.join(STAGES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best or median is kept)")
+    parser.add_argument("--video-seconds", type=int, default=120)
+    parser.add_argument("--clips", type=int, default=5)
+    parser.add_argument("--clip-seconds", type=float, default=15.0)
+    parser.add_argument("--audio-seconds", type=int, default=60)
+    parser.add_argument("--speech", help="real recording to loop for the transcription stage")
+    parser.add_argument("--profiles", default="draft,balanced,final")
+    parser.add_argument("--ingest-mb", type=int, default=256)
+    parser.add_argument("--pdf-pages", type=int, default=200)
+    parser.add_argument("--tree-files", type=int, default=100_000)
+    parser.add_argument("--tolerance", type=float, default=15.0, help="allowed regression in percent")
+    parser.add_argument("--check", action="store_true", help="exit non-zero on a regression")
+    args = parser.parse_args()
+
+    skip = {s.strip() for s in args.skip.split(",") if s.strip()}
+    unknown = skip - set(STAGES)
+    if unknown:
+        raise SystemExit(f"Unknown stages: {', '.join(sorted(unknown))}")
+    if not shutil.which("ffmpeg") and not {"trim", "transcribe"} <= skip:
+        raise SystemExit("ffmpeg is required to generate media; install it or pass --skip trim,transcribe")
+    os.makedirs(args.workdir, exist_ok=True)
+
+    metrics: Dict[str, float] = {}
+    notes: List[str] = []
+
+    def record(stage: str, values: Dict[str, float]) -> None:
+        metrics.update({f"{stage}.{name}": value for name, value in values.items()})
+
+    if "ingest" not in skip:
+        record("ingest", bench_ingest(args.workdir, args.ingest_mb, args.repeat))
+    if "trim" not in skip:
+        video = os.path.join(args.workdir, f"source_{args.video_seconds}s.mp4")
+        make_video(video, args.video_seconds)
+        record("trim", bench_trim(video, args.video_seconds, args.clips, args.clip_seconds, args.workdir, args.repeat))
+    if "transcribe" not in skip:
+        audio = os.path.join(args.workdir, f"speech_{args.audio_seconds}s.wav")
+        if not make_speech(audio, args.audio_seconds, args.speech):
+            notes.append("transcription ran on a tone (no --speech and no flite); RTF is optimistic")
+        profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+        record("transcribe", bench_transcribe(audio, args.audio_seconds, profiles, args.repeat))
+    if "documents" not in skip:
+        pdf = os.path.join(args.workdir, f"document_{args.pdf_pages}p.pdf")
+        make_pdf(pdf, args.pdf_pages)
+        record("documents", bench_documents(pdf, args.pdf_pages, args.repeat))
+    if "clips_by_date" not in skip:
+        make_storage_tree(args.workdir, args.tree_files)
+        record("clips_by_date", bench_clips_by_date(args.workdir, args.repeat))
+
+    run = {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "sizes": {
+            "video_seconds": args.video_seconds, "clips": args.clips, "clip_seconds": args.clip_seconds,
+            "audio_seconds": args.audio_seconds, "speech": bool(args.speech), "ingest_mb": args.ingest_mb,
+            "pdf_pages": args.pdf_pages, "tree_files": args.tree_files,
+        },
+        "metrics": metrics,
+        "notes": notes,
+    }
+
+    history: List[Dict] = []
+    if os.path.exists(args.history):
+        with open(args.history, encoding="utf-8") as f:
+            history = json.load(f)
+    # Only runs with the same inputs on the same machine are comparable
+    previous = next(
+        (r for r in reversed(history) if r.get("host") == run["host"] and r.get("sizes") == run["sizes"]),
+        None,
+    )
+    print(f"commit {run['commit'] or '?'}{' (dirty)' if run['dirty'] else ''}"
+          + (f", compared with {previous['commit']} from {previous['timestamp']}" if previous else ""))
+    regressions = compare(previous["metrics"] if previous else {}, metrics, args.tolerance)
+    for note in notes:
+        print(f"note: {note}")
+
+    history.append(run)
+    with open(args.history, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+        f.write("\n")
+    for regression in regressions:
+        print(f"FAIL: {regression}")
+    sys.exit(1 if regressions and args.check else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the serving profile (gunicorn.conf.py)
+
+Drives a running server with a weighted mix of requests and reports
+throughput, latency percentiles and the resident memory of the server
+processes, so worker counts and timeouts can be checked against the memory
+budget before deploying:
+
+    WEB_CONCURRENCY=2 gunicorn -c gunicorn.conf.py backend.main:app &
+    python benchmarks/serving_load.py --url http://localhost:5000 \\
+        --mix health=2,videos=6,transcribe=1 --media sample.mp3 --duration 60
+
+Repeat with different WEB_CONCURRENCY / MODEL_SERVER settings and compare
+p95 latency and peak RSS. Standard library only.
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import urllib.request
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def _multipart(path: str) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    with open(path, "rb") as f:
+        payload = f.read()
+    name = os.path.basename(path)
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{name}\"\r\n"
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def _build_requests(base: str, media: Optional[str]) -> Dict[str, Callable[[], urllib.request.Request]]:
+    upload = _multipart(media) if media else None
+
+    def get(path: str):
+        return lambda: urllib.request.Request(base + path)
+
+    def transcribe():
+        body, content_type = upload
+        return urllib.request.Request(
+            base + "/api/transcript/upload", data=body, headers={"Content-Type": content_type}
+        )
+
+    requests = {
+        "health": get("/api/health"),
+        "videos": get("/api/videos/?limit=50&probe=false"),
+        "status": get("/api/videos/status?limit=50"),
+        "clips": get("/video/clips-by-date"),
+    }
+    if upload:
+        requests["transcribe"] = transcribe
+    return requests
+
+
+def _rss_mb(match: str) -> float:
+    """Total RSS of processes whose command line contains ``match`` (Linux)"""
+    total_kb = 0
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                if match.encode() not in f.read():
+                    continue
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run(url: str, mix: Dict[str, int], concurrency: int, duration: float, media: Optional[str],
+        timeout: float, proc_match: str) -> Dict[str, object]:
+    builders = _build_requests(url.rstrip("/"), media)
+    unknown = set(mix) - set(builders)
+    if unknown:
+        raise SystemExit(f"Unknown or unavailable request kinds: {', '.join(sorted(unknown))}")
+    kinds = [k for k, weight in mix.items() for _ in range(weight)]
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    peak_rss = [0.0]
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            kind = rng.choice(kinds)
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(builders[kind](), timeout=timeout) as resp:
+                    resp.read()
+                    ok = resp.status < 400
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    latencies[kind].append(elapsed)
+                else:
+                    errors[kind] += 1
+
+    def sample_memory():
+        while time.monotonic() < deadline:
+            peak_rss[0] = max(peak_rss[0], _rss_mb(proc_match))
+            time.sleep(1.0)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    threads.append(threading.Thread(target=sample_memory, daemon=True))
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads[:-1]:
+        t.join()
+    wall = time.monotonic() - started
+
+    report = {
+        "url": url,
+        "concurrency": concurrency,
+        "duration_s": round(wall, 2),
+        "peak_rss_mb": round(peak_rss[0], 1),
+        "endpoints": {},
+    }
+    for kind in mix:
+        samples = latencies.get(kind, [])
+        report["endpoints"][kind] = {
+            "ok": len(samples),
+            "errors": errors.get(kind, 0),
+            "rps": round(len(samples) / wall, 2),
+            "p50_ms": round(_percentile(samples, 50) * 1000, 1),
+            "p95_ms": round(_percentile(samples, 95) * 1000, 1),
+            "p99_ms": round(_percentile(samples, 99) * 1000, 1),
+        }
+    return report
+
+
+def _parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--mix", default="health=2,videos=6,status=1,clips=1",
+                        help="weighted request kinds: health, videos, status, clips, transcribe")
+    parser.add_argument("--media", help="audio/video file uploaded by the transcribe kind")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--timeout", type=float, default=300.0, help="per-request timeout in seconds")
+    parser.add_argument("--proc-match", default="gunicorn",
+                        help="substring of the server processes' command line for RSS sampling")
+    parser.add_argument("--out", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    report = run(args.url, _parse_mix(args.mix), args.concurrency, args.duration, args.media,
+                 args.timeout, args.proc_match)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks and a lost-update load test for the JSON database and scan paths
+
+asv-style: every benchmark runs against generated fixtures at each --sizes
+entry count. Each one is timed as --repeat samples of an auto-calibrated
+number of calls, and the median and minimum time per call are reported:
+
+    database.get_caption / has_caption / save_caption   captions_database.json
+    video_service.scan_videos / get_video_status        a tree of N videos
+    caption_service.generate_captions_for_directory     a quarter of them uncaptioned
+
+The load test runs concurrent writers (threads and processes, like executor
+threads inside several gunicorn workers). They write distinct keys to
+captions_database.json through Database.save_caption, and to
+youtube_uploads.json through YouTubeService._save_upload_info. Every key
+missing afterwards is a lost update (a read-modify-write that raced another
+writer):
+
+    python benchmarks/storage_paths.py --sizes 100,10000 --out benchmarks/storage_paths.json
+    python benchmarks/storage_paths.py --baseline benchmarks/storage_paths.json --check
+    python benchmarks/storage_paths.py --only load --writers 16 --check
+
+Fixtures are cached in --workdir; delete it to rebuild them.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.models.database import Database  # noqa: E402
+from backend.models.video_info import VideoInfo, create_video_id  # noqa: E402
+from backend.services.caption_service import CaptionService  # noqa: E402
+from backend.services.video_service import VideoService  # noqa: E402
+from backend.utils.topics import classify_video_topic  # noqa: E402
+
+PER_DIRECTORY = 1000
+TITLES = ("ai tools explained", "python tutorial", "morning vlog", "coding tips", "chatgpt workflow")
+
+
+class Fixture:
+    """A generated video tree plus a caption database for ``size`` videos.
+
+    Video ``i`` has a ``.caption`` sidecar when ``i % 2 == 1`` and a database
+    entry when ``i % 4 in (0, 1)``; ``i % 4 == 2`` is fully uncaptioned.
+    """
+
+    def __init__(self, workdir: str, size: int):
+        self.size = size
+        self.root = os.path.join(workdir, f"n{size}")
+        self.videos_dir = os.path.join(self.root, "videos")
+        self.db_path = os.path.join(self.root, "captions_database.json")
+        self.pristine_db = os.path.join(self.root, "captions_database.pristine.json")
+        self.stems = [f"{TITLES[i % len(TITLES)]} {i:06d}" for i in range(size)]
+        self.ids = [
+            create_video_id(VideoInfo(title=stem, description="", topic=classify_video_topic(stem)))
+            for stem in self.stems
+        ]
+        if not os.path.exists(os.path.join(self.root, ".complete")):
+            self._build()
+        self.reset()
+        self.db = Database(self.db_path)
+        self.rng = random.Random(size)
+
+    def _path(self, i: int, ext: str) -> str:
+        return os.path.join(self.videos_dir, f"batch_{i // PER_DIRECTORY:04d}", self.stems[i] + ext)
+
+    def _build(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+        captions = {}
+        for i in range(self.size):
+            os.makedirs(os.path.dirname(self._path(i, ".mp4")), exist_ok=True)
+            open(self._path(i, ".mp4"), "wb").close()
+            if i % 2 == 1:
+                with open(self._path(i, ".caption"), "w", encoding="utf-8") as f:
+                    f.write(f"Caption for {self.stems[i]}")
+            if i % 4 in (0, 1):
+                captions[self.ids[i]] = {
+                    "title": self.stems[i],
+                    "caption": f"Caption for {self.stems[i]} #ai #tech",
+                    "template_type": "ai_tech",
+                    "generated_at": "2025-01-01T00:00:00",
+                    "updated_at": "2025-01-01T00:00:00",
+                }
+        with open(self.pristine_db, "w", encoding="utf-8") as f:
+            json.dump({"captions": captions, "metadata": {"version": "1.0.0"}}, f, indent=2, ensure_ascii=False)
+        open(os.path.join(self.root, ".complete"), "w").close()
+
+    def reset(self) -> None:
+        """Undo what the benchmarks write: new database entries and generated sidecars"""
+        shutil.copyfile(self.pristine_db, self.db_path)
+        for i in range(2, self.size, 4):
+            try:
+                os.remove(self._path(i, ".caption"))
+            except FileNotFoundError:
+                pass
+
+    def random_id(self) -> str:
+        return self.ids[self.rng.randrange(self.size)]
+
+
+def time_get_caption(fx: Fixture) -> None:
+    fx.db.get_caption(fx.random_id())
+
+
+def time_has_caption(fx: Fixture) -> None:
+    fx.db.has_caption(fx.random_id())
+
+
+def time_save_caption(fx: Fixture) -> None:
+    fx.db.save_caption(fx.random_id(), {"title": "bench", "caption": "updated", "template_type": "ai_tech"})
+
+
+def time_scan_videos(fx: Fixture) -> None:
+    VideoService(fx.db).scan_videos(fx.videos_dir)
+
+
+def time_get_video_status(fx: Fixture) -> None:
+    VideoService(fx.db).get_video_status(fx.videos_dir)
+
+
+def time_generate_captions_for_directory(fx: Fixture) -> None:
+    CaptionService(fx.db).generate_captions_for_directory(fx.videos_dir)
+
+
+# (name, benchmark, resets the fixture before every call)
+BENCHMARKS: List[Tuple[str, Callable[[Fixture], None], bool]] = [
+    ("database.get_caption", time_get_caption, False),
+    ("database.has_caption", time_has_caption, False),
+    ("database.save_caption", time_save_caption, False),
+    ("video_service.scan_videos", time_scan_videos, False),
+    ("video_service.get_video_status", time_get_video_status, False),
+    ("caption_service.generate_captions_for_directory", time_generate_captions_for_directory, True),
+]
+
+
+def measure(fx: Fixture, bench: Callable[[Fixture], None], per_call_setup: bool,
+            repeat: int, min_time: float) -> Dict[str, float]:
+    """Median / min seconds per call over ``repeat`` samples of ``number`` calls each"""
+    fx.reset()
+    started = time.perf_counter()
+    bench(fx)  # warm-up, also sizes ``number``
+    first = time.perf_counter() - started
+    number = 1 if per_call_setup else max(1, min(10_000, math.ceil(min_time / max(first, 1e-9))))
+    samples = []
+    for _ in range(max(1, repeat)):
+        if per_call_setup:
+            fx.reset()
+        started = time.perf_counter()
+        for _ in range(number):
+            bench(fx)
+        samples.append((time.perf_counter() - started) / number)
+    fx.reset()
+    return {"median_ms": round(statistics.median(samples) * 1000, 3),
+            "min_ms": round(min(samples) * 1000, 3), "number": number}
+
+
+def _captions_writer(db_path: str, writer: int, count: int) -> int:
+    db = Database(db_path)
+    failures = 0
+    for j in range(count):
+        if not db.save_caption(f"writer{writer}_{j}", {"title": f"w{writer} {j}", "caption": "load test"}):
+            failures += 1
+    return failures
+
+
+def _uploads_writer(root: str, writer: int, count: int) -> int:
+    from backend.services.youtube_service import YouTubeService
+
+    os.chdir(root)  # the uploads file path is relative (data/youtube_uploads.json)
+    service = YouTubeService(Database(os.path.join(root, "data", "captions_database.json")))
+    failures = 0
+    for j in range(count):
+        try:
+            service._save_upload_info({"title": f"w{writer} {j}", "topic": "load"}, f"writer{writer}_{j}",
+                                      f"https://youtu.be/writer{writer}_{j}", f"w{writer} {j}")
+        except Exception:
+            failures += 1
+    return failures
+
+
+def load_test(workdir: str, target: str, mode: str, writers: int, per_writer: int) -> Dict[str, object]:
+    root = tempfile.mkdtemp(prefix=f"{target}-{mode}-", dir=workdir)
+    os.makedirs(os.path.join(root, "data"), exist_ok=True)
+    if target == "captions_database.json":
+        path = os.path.join(root, "data", target)
+        Database(path)
+        job, first_arg = _captions_writer, path
+    else:
+        path = os.path.join(root, "data", "youtube_uploads.json")
+        job, first_arg = _uploads_writer, root
+
+    pool_cls = ThreadPoolExecutor if mode == "thread" else ProcessPoolExecutor
+    previous = os.getcwd()
+    started = time.perf_counter()
+    try:
+        with pool_cls(max_workers=writers) as pool:
+            failures = sum(pool.map(job, [first_arg] * writers, range(writers), [per_writer] * writers))
+    finally:
+        os.chdir(previous)
+    elapsed = time.perf_counter() - started
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        written = data["captions"] if target == "captions_database.json" else {u["video_id"] for u in data}
+        found, corrupt = len(written), False
+    except (OSError, ValueError, KeyError, TypeError):
+        found, corrupt = 0, True
+    shutil.rmtree(root, ignore_errors=True)
+    expected = writers * per_writer
+    return {
+        "target": target, "mode": mode, "writers": writers, "expected": expected, "found": found,
+        "lost": expected - found, "failed_writes": failures, "corrupt": corrupt,
+        "writes_per_s": round(expected / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "yta-storage-bench"))
+    parser.add_argument("--sizes", default="100,10000,100000")
+    parser.add_argument("--only", default="", help="comma-separated benchmark name prefixes, or 'load'")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per sample when calibrating")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--per-writer", type=int, default=50)
+    parser.add_argument("--out", help="write the report as JSON")
+    parser.add_argument("--baseline", help="previous report to compare medians against")
+    parser.add_argument("--tolerance", type=float, default=25.0, help="allowed regression in percent")
+    parser.add_argument("--check", action="store_true", help="exit non-zero on regressions or lost updates")
+    args = parser.parse_args()
+
+    only = [o.strip() for o in args.only.split(",") if o.strip()]
+    selected = [b for b in BENCHMARKS if not only or any(b[0].startswith(o) for o in only)]
+    run_load = not only or "load" in only
+    os.makedirs(args.workdir, exist_ok=True)
+    report: Dict[str, object] = {"benchmarks": {}, "load": []}
+    failures: List[str] = []
+
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()] if selected else []:
+        fx = Fixture(args.workdir, size)
+        for name, bench, per_call_setup in selected:
+            result = measure(fx, bench, per_call_setup, args.repeat, args.min_time)
+            key = f"{name}[{size}]"
+            report["benchmarks"][key] = result
+            print(f"{key:<60} {result['median_ms']:>12.3f}ms  (min {result['min_ms']:.3f}ms, x{result['number']})")
+
+    if run_load:
+        for target in ("captions_database.json", "youtube_uploads.json"):
+            for mode in ("thread", "process"):
+                result = load_test(args.workdir, target, mode, args.writers, args.per_writer)
+                report["load"].append(result)
+                print(f"load {target} {mode:>7}: {result['found']}/{result['expected']} kept, "
+                      f"{result['lost']} lost, {result['failed_writes']} failed writes"
+                      f"{', file corrupt' if result['corrupt'] else ''} ({result['writes_per_s']} writes/s)")
+                if result["lost"] or result["failed_writes"] or result["corrupt"]:
+                    failures.append(f"{target} ({mode}): {result['lost']} lost updates, "
+                                    f"{result['failed_writes']} failed writes")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("benchmarks", {})
+        for key, result in report["benchmarks"].items():
+            before = baseline.get(key, {}).get("median_ms")
+            if before and result["median_ms"] > before * (1 + args.tolerance / 100):
+                failures.append(f"{key} {before}ms -> {result['median_ms']}ms")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures and args.check else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,69 @@
 """
 Gunicorn configuration for Video Caption Generator
-Industry-standard production configuration
+Production serving profile: uvicorn (ASGI) workers plus one shared model process
+
+Run with: gunicorn -c gunicorn.conf.py backend.main:app
+
+Sizing
+------
+Web workers are async: blocking work already runs on per-kind thread pools
+(backend/utils/executors.py), so a worker spends most of its time waiting on
+ffmpeg, Gemini or the model server. Extra workers mainly buy isolation and
+JSON/upload parsing throughput, while each one costs its own Python heap.
+Whisper lives once in the model server (backend/app/services/model_server.py),
+loaded on first use, so worker count is bounded by memory rather than CPUs:
+
+    workers = (MEMORY_BUDGET_MB - MODEL_SERVER_MB) // WEB_WORKER_MB
+              clamped to [1, 2 * cpus]
+
+WEB_CONCURRENCY overrides the result. Validate a change with
+benchmarks/serving_load.py before rolling it out.
 """
 
 import multiprocessing
 import os
+import shutil
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
 
 # Server socket
 bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
 backlog = 2048
 
+# Memory budget (MB) for the whole machine/VM and per-process estimates.
+# distil-small.en int8 resident in the model server is ~500-600MB; an idle
+# FastAPI worker with the service modules imported is ~120-160MB.
+MEMORY_BUDGET_MB = _env_int("MEMORY_BUDGET_MB", 1024)
+MODEL_SERVER_MB = _env_int("MODEL_SERVER_MB", 600)
+WEB_WORKER_MB = _env_int("WEB_WORKER_MB", 160)
+MODEL_SERVER = os.environ.get("MODEL_SERVER", "1") != "0"
+MODEL_SERVER_BIND = os.environ.get("MODEL_SERVER_BIND", "127.0.0.1:50055")
+# Workers and the model server publish metric snapshots here; /metrics merges them
+METRICS_DIR = os.environ.get("METRICS_DIR", "/tmp/video-caption-metrics")
+
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
-worker_connections = 1000
-timeout = 30
-keepalive = 2
+_cpus = multiprocessing.cpu_count()
+if MODEL_SERVER:
+    _by_memory = (MEMORY_BUDGET_MB - MODEL_SERVER_MB) // max(1, WEB_WORKER_MB)
+else:
+    # Every worker loads its own model
+    _by_memory = MEMORY_BUDGET_MB // max(1, WEB_WORKER_MB + MODEL_SERVER_MB)
+workers = _env_int("WEB_CONCURRENCY", max(1, min(_by_memory, 2 * _cpus)))
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = 5
+
+# Uvicorn workers heartbeat from the event loop, which no longer runs
+# transcription or ffmpeg; the timeout only has to cover loop stalls and
+# boot. Uploads of up to UPLOAD_MAX_MEDIA_MB stream for minutes, so let
+# in-flight requests finish on reload/shutdown.
+timeout = _env_int("GUNICORN_TIMEOUT", 120)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 90)
 
 # Restart workers after this many requests, to help prevent memory leaks
 max_requests = 1000
@@ -41,13 +89,30 @@ tmp_upload_dir = None
 # keyfile = "/path/to/keyfile"
 # certfile = "/path/to/certfile"
 
-# Preload app for better performance
-preload_app = True
+# Do not preload: the app's import-time singletons (thread pools, JSON
+# database handles) must be created per worker, after fork
+preload_app = False
+
+
+_model_manager = None
+
+
+def on_starting(server):
+    """Start the shared model process before any worker forks."""
+    global _model_manager
+    # Start every deploy from empty counters; set before anything forks
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.environ["METRICS_DIR"] = METRICS_DIR
+    if not MODEL_SERVER:
+        return
+    from backend.app.services.model_server import start_model_server
+
+    _model_manager = start_model_server(MODEL_SERVER_BIND)
+    server.log.info(
+        "Model server on %s; %d web workers (budget %dMB)", MODEL_SERVER_BIND, workers, MEMORY_BUDGET_MB
+    )
 
-# Worker timeout for graceful shutdown
-graceful_timeout = 30
 
-# Environment variables
-raw_env = [
-    'FLASK_ENV=production',
-]
+def on_exit(server):
+    if _model_manager is not None:
+        _model_manager.shutdown()